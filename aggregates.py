@@ -0,0 +1,269 @@
+import logging
+import time
+from collections import Counter, defaultdict
+import pandas as pd
+from config import DB_NAME
+from db_connection import get_connection
+from query_cache import bump_data_version
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Number of equally wide sentiment buckets over [-1, 1]
+SENTIMENT_BUCKETS = 20
+
+# Columns of narratives that feed the rollup tables
+ROLLUP_COLUMNS = ["tweet_id", "created_at", "keywords", "sentiment", "toxicity_score", "danger_score"]
+
+def create_rollup_tables(conn):
+    """Creates the materialized per-day rollup tables."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS daily_keyword_counts
+                    (day TEXT, keyword TEXT, count INTEGER NOT NULL DEFAULT 0,
+                     PRIMARY KEY (day, keyword))''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS daily_sentiment_buckets
+                    (day TEXT, bucket INTEGER, count INTEGER NOT NULL DEFAULT 0,
+                     PRIMARY KEY (day, bucket))''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS daily_stats
+                    (day TEXT PRIMARY KEY, tweet_count INTEGER NOT NULL DEFAULT 0,
+                     sentiment_sum REAL NOT NULL DEFAULT 0, sentiment_count INTEGER NOT NULL DEFAULT 0,
+                     toxicity_sum REAL NOT NULL DEFAULT 0, toxicity_count INTEGER NOT NULL DEFAULT 0,
+                     danger_sum REAL NOT NULL DEFAULT 0, danger_count INTEGER NOT NULL DEFAULT 0)''')
+
+def _day(created_at):
+    return time.strftime("%Y-%m-%d", time.gmtime(created_at))
+
+def _bucket(sentiment):
+    position = int((sentiment + 1.0) / 2.0 * SENTIMENT_BUCKETS)
+    return min(max(position, 0), SENTIMENT_BUCKETS - 1)
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and value == value
+
+def fetch_rollup_rows(conn, tweet_ids, columns=()):
+    """
+    Reads the rollup-relevant columns of already stored tweets.
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+        tweet_ids (list): Tweet IDs to look up.
+        columns (Iterable[str]): Further narratives columns to read.
+
+    Returns:
+        dict: tweet_id -> row dict with the ROLLUP_COLUMNS and the given columns.
+    """
+    rows = {}
+    columns = ROLLUP_COLUMNS + [col for col in columns if col not in ROLLUP_COLUMNS]
+    column_list = ", ".join(f'"{col}"' for col in columns)
+    ids = list(tweet_ids)
+    # Stay well below SQLite's host parameter limit
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(f"SELECT {column_list} FROM narratives WHERE tweet_id IN ({placeholders})", chunk)
+        for values in cursor.fetchall():
+            rows[values[0]] = dict(zip(columns, values))
+    return rows
+
+def update_rollups(conn, added, removed=()):
+    """
+    Applies the contribution of inserted rows (and withdraws that of replaced rows).
+
+    Must be called inside the same transaction as the write to narratives so the
+    rollups never drift from the raw data.
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+        added (Iterable[dict]): Rows that were inserted or are the new version of updated rows.
+        removed (Iterable[dict]): Previous versions of updated rows.
+    """
+    removed = list(removed)
+    keyword_counts = Counter()
+    sentiment_counts = Counter()
+    stats = defaultdict(lambda: [0, 0.0, 0, 0.0, 0, 0.0, 0])
+
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            if row.get("created_at") is None:
+                continue
+            day = _day(row["created_at"])
+            day_stats = stats[day]
+            day_stats[0] += sign
+            for keyword in str(row.get("keywords") or "").split(","):
+                if keyword.strip():
+                    keyword_counts[(day, keyword.strip())] += sign
+            for offset, column in ((1, "sentiment"), (3, "toxicity_score"), (5, "danger_score")):
+                value = row.get(column)
+                if _is_number(value):
+                    day_stats[offset] += sign * value
+                    day_stats[offset + 1] += sign
+            if _is_number(row.get("sentiment")):
+                sentiment_counts[(day, _bucket(row["sentiment"]))] += sign
+
+    conn.executemany('''INSERT INTO daily_keyword_counts (day, keyword, count) VALUES (?, ?, ?)
+                        ON CONFLICT(day, keyword) DO UPDATE SET count = count + excluded.count''',
+                     [(day, keyword, count) for (day, keyword), count in keyword_counts.items() if count])
+    conn.executemany('''INSERT INTO daily_sentiment_buckets (day, bucket, count) VALUES (?, ?, ?)
+                        ON CONFLICT(day, bucket) DO UPDATE SET count = count + excluded.count''',
+                     [(day, bucket, count) for (day, bucket), count in sentiment_counts.items() if count])
+    conn.executemany('''INSERT INTO daily_stats (day, tweet_count, sentiment_sum, sentiment_count,
+                                                 toxicity_sum, toxicity_count, danger_sum, danger_count)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(day) DO UPDATE SET
+                            tweet_count = tweet_count + excluded.tweet_count,
+                            sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+                            sentiment_count = sentiment_count + excluded.sentiment_count,
+                            toxicity_sum = toxicity_sum + excluded.toxicity_sum,
+                            toxicity_count = toxicity_count + excluded.toxicity_count,
+                            danger_sum = danger_sum + excluded.danger_sum,
+                            danger_count = danger_count + excluded.danger_count''',
+                     [(day, *values) for day, values in stats.items()])
+    if removed:
+        # Updated rows may have moved to another day, keyword or bucket
+        conn.execute("DELETE FROM daily_keyword_counts WHERE count = 0")
+        conn.execute("DELETE FROM daily_sentiment_buckets WHERE count = 0")
+        conn.execute("DELETE FROM daily_stats WHERE tweet_count = 0")
+
+def rebuild_rollups(conn, batch_size=5000):
+    """
+    Recomputes all rollup tables from the raw narratives, one rowid range at a time.
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+        batch_size (int): Rows read per batch.
+    """
+    create_rollup_tables(conn)
+    for table in ("daily_keyword_counts", "daily_sentiment_buckets", "daily_stats"):
+        conn.execute(f"DELETE FROM {table}")
+    column_list = ", ".join(ROLLUP_COLUMNS)
+    max_rowid = conn.execute("SELECT MAX(rowid) FROM narratives").fetchone()[0] or 0
+    for start in range(0, max_rowid + 1, batch_size):
+        cursor = conn.execute(f"SELECT {column_list} FROM narratives WHERE rowid >= ? AND rowid < ?",
+                              (start, start + batch_size))
+        update_rollups(conn, [dict(zip(ROLLUP_COLUMNS, values)) for values in cursor.fetchall()])
+    conn.commit()
+    logging.info("Aggregattabellen neu aufgebaut.")
+
+def backfill(db_name=DB_NAME):
+    """Rebuilds the rollup tables of an existing database."""
+    # Imported here because migrations.py itself depends on this module
+    from migrations import migrate
+    migrate(db_name)
+    conn = get_connection(db_name)
+    rebuild_rollups(conn)
+    with conn:
+        bump_data_version(conn)
+
+def toxicity_escalation(conn, rows):
+    """
+    Computes daily mean toxicity and its escalation for a batch against the persisted history.
+
+    The per-day toxicity sums and counts in daily_stats are combined with the batch, so
+    each day's mean and its rise over the previous day with data are the same regardless
+    of how the tweets were split into batches. Costs O(batch) plus a range read of daily_stats.
+
+    Args:
+        conn (sqlite3.Connection): Open (read-only) connection.
+        rows (list[dict]): Batch rows with 'tweet_id', 'created_at' (epoch) and 'toxicity_score'.
+
+    Returns:
+        list: (daily_toxicity, escalation) per row; rows without a date get their own
+            toxicity and no escalation.
+    """
+    batch = defaultdict(lambda: [0.0, 0])
+    # Tweets that are already stored are part of daily_stats and must not count twice
+    stored = fetch_rollup_rows(conn, [row["tweet_id"] for row in rows if row.get("tweet_id") is not None])
+    for row in rows:
+        if row.get("created_at") is None or not _is_number(row.get("toxicity_score")) or row.get("tweet_id") in stored:
+            continue
+        day_batch = batch[_day(row["created_at"])]
+        day_batch[0] += row["toxicity_score"]
+        day_batch[1] += 1
+
+    totals = {}
+    days = [_day(row["created_at"]) for row in rows if row.get("created_at") is not None]
+    if days:
+        first_day, last_day = min(days), max(days)
+        previous = conn.execute('''SELECT MAX(day) FROM daily_stats
+                                   WHERE day < ? AND toxicity_count > 0''', (first_day,)).fetchone()[0]
+        cursor = conn.execute('''SELECT day, toxicity_sum, toxicity_count FROM daily_stats
+                                 WHERE day >= ? AND day <= ? AND toxicity_count > 0''',
+                              (previous or first_day, last_day))
+        totals = {day: [total, count] for day, total, count in cursor.fetchall()}
+        for day, (total, count) in batch.items():
+            day_totals = totals.setdefault(day, [0.0, 0])
+            day_totals[0] += total
+            day_totals[1] += count
+
+    escalation = {}
+    previous_mean = None
+    for day in sorted(totals):
+        mean = totals[day][0] / totals[day][1]
+        escalation[day] = (mean, mean - previous_mean if previous_mean is not None else 0.0)
+        previous_mean = mean
+
+    results = []
+    for row in rows:
+        day = _day(row["created_at"]) if row.get("created_at") is not None else None
+        if day in escalation:
+            results.append(escalation[day])
+        else:
+            toxicity = row.get("toxicity_score")
+            results.append((toxicity if _is_number(toxicity) else 0.0, 0.0))
+    return results
+
+def keyword_time_series(conn):
+    """
+    Loads the per-day keyword counts as a day x keyword table for plotting.
+
+    Args:
+        conn (sqlite3.Connection): Open (read-only) connection.
+
+    Returns:
+        pd.DataFrame: Tweet counts indexed by date with one column per keyword.
+    """
+    df = pd.read_sql_query("SELECT day, keyword, count FROM daily_keyword_counts WHERE count > 0", conn)
+    if df.empty:
+        return df
+    df['day'] = pd.to_datetime(df['day'], utc=True)
+    return df.pivot_table(index='day', columns='keyword', values='count', aggfunc='sum', fill_value=0)
+
+def sentiment_histogram(conn):
+    """
+    Loads the sentiment histogram summed over all days.
+
+    Args:
+        conn (sqlite3.Connection): Open (read-only) connection.
+
+    Returns:
+        pd.DataFrame: Columns 'sentiment' (bucket centre) and 'count'.
+    """
+    df = pd.read_sql_query("""SELECT bucket, SUM(count) AS count FROM daily_sentiment_buckets
+                              GROUP BY bucket HAVING SUM(count) > 0 ORDER BY bucket""", conn)
+    width = 2.0 / SENTIMENT_BUCKETS
+    df['sentiment'] = -1.0 + (df['bucket'] + 0.5) * width
+    return df[['sentiment', 'count']]
+
+def daily_means(conn):
+    """
+    Loads per-day tweet counts and mean sentiment, toxicity and danger score.
+
+    Args:
+        conn (sqlite3.Connection): Open (read-only) connection.
+
+    Returns:
+        pd.DataFrame: One row per day.
+    """
+    return pd.read_sql_query("""SELECT day, tweet_count,
+                                       sentiment_sum / NULLIF(sentiment_count, 0) AS sentiment,
+                                       toxicity_sum / NULLIF(toxicity_count, 0) AS toxicity,
+                                       danger_sum / NULLIF(danger_count, 0) AS danger_score
+                                FROM daily_stats WHERE tweet_count > 0 ORDER BY day""", conn)
+
+if __name__ == "__main__":
+    backfill()
+    print("Aggregattabellen neu aufgebaut.")
@@ -1,16 +1,22 @@
 import os
+import time
+import sqlite3
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import joblib
 import pandas as pd
-import re
-from transformers import pipeline, BertTokenizer
-from bertopic import BERTopic
-from sklearn.feature_extraction.text import CountVectorizer
-import sqlite3
-from config import DB_NAME
+from config import (DB_NAME, NARRATIVE_CLASSIFIER, NARRATIVE_WORKERS, NARRATIVE_WORKER_THREADS, NARRATIVE_WORKER_CHUNK,
+                    TOPIC_REFIT_OUTLIER_RATE, TOPIC_STATS_BATCHES, TOPIC_MIN_FIT_DOCS)
+from db_connection import read_connection
+from migrations import to_epoch
+from aggregates import toxicity_escalation
+from inference_cache import get_inference_cache, pipeline_identity
+from model_registry import model_registry
+from text_preprocessing import truncate_texts
+from keyword_matcher import get_matcher
 import logging
-import nltk
-from nltk.corpus import stopwords
 
 # Logging configuration
 logging.basicConfig(
@@ -20,17 +26,38 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-# Download and load German stop words
-nltk.download('stopwords', quiet=True)  # Download stopwords quietly to avoid cluttering logs
-german_stop_words = stopwords.words('german')
+_german_stop_words = None
+
+def get_german_stop_words():
+    """Downloads (once) and returns the NLTK German stop words; only needed when fitting a new topic model."""
+    global _german_stop_words
+    if _german_stop_words is None:
+        import nltk
+        from nltk.corpus import stopwords
+        nltk.download('stopwords', quiet=True)  # Download stopwords quietly to avoid cluttering logs
+        _german_stop_words = stopwords.words('german')
+    return _german_stop_words
 
 # Function to load the latest topic model
 def load_latest_topic_model():
-    """Loads the latest BERTopic model from the models/ directory."""
+    """Loads the latest BERTopic model: the version published by TopicModeler, else the newest models/BERTopic_<date>.pkl."""
     model_dir = "models"
     if not os.path.exists(model_dir):
         logging.warning("Model directory does not exist.")
         return None
+
+    # Versions written by the scheduled retraining (see topic_modeler.py)
+    latest_version_file = os.path.join(model_dir, "latest_version.txt")
+    if os.path.exists(latest_version_file):
+        with open(latest_version_file) as f:
+            version = f.read().strip()
+        model_path = os.path.join(model_dir, "versions", f"model_{version}.pkl")
+        try:
+            topic_model = joblib.load(model_path)
+            logging.info(f"Latest model loaded: {model_path}")
+            return topic_model
+        except Exception as e:
+            logging.error(f"Error loading topic model version {version}: {e}")
     
     # Find all BERTopic model files
     model_files = [f for f in os.listdir(model_dir) if f.startswith("BERTopic_") and f.endswith(".pkl")]
@@ -53,28 +80,78 @@ def load_latest_topic_model():
 # Define toxic keywords
 TOXIC_KEYWORDS = ["hass", "gewalt", "rassist", "feind"]
 
+# Candidate labels for zero-shot narrative classification
+NARRATIVE_LABELS = ["positive", "negative", "neutral"]
+
+# Analyzer of a worker process, created once by _init_worker
+_worker_analyzer = None
+
+def _init_worker(backend, classifier_mode, threads):
+    """Limits the threads of a worker process and loads its models once."""
+    global _worker_analyzer
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    from inference_backend import set_default_threads
+    set_default_threads(threads)
+    _worker_analyzer = NarrativeAnalyzer(backend=backend, classifier_mode=classifier_mode, workers=0,
+                                         load_topic_model=False)
+
+def _annotate_chunk(texts, tweet_ids, classifier_mode):
+    """Runs annotate_texts in a worker process; returns plain lists to keep the transfer small."""
+    df = pd.DataFrame({'text': texts})
+    if tweet_ids is not None:
+        df['tweet_id'] = tweet_ids
+    df = _worker_analyzer.annotate_texts(df, classifier_mode=classifier_mode)
+    return df['text'].tolist(), df['sentiment'].tolist(), df['narrative_type'].tolist()
+
 class NarrativeAnalyzer:
-    def __init__(self):
+    def __init__(self, backend=None, classifier_mode=NARRATIVE_CLASSIFIER, workers=NARRATIVE_WORKERS,
+                 worker_threads=NARRATIVE_WORKER_THREADS, load_topic_model=True):
+        """
+        Args:
+            backend (str, optional): Inference backend ('torch', 'onnx' or 'auto'); None uses INFERENCE_BACKEND.
+            classifier_mode (str): Default narrative classifier, 'zero-shot' or 'prototype'.
+            workers (int): Worker processes for sentiment analysis and classification of large
+                batches; 0 or 1 runs everything in the calling process.
+            worker_threads (int): Threads per worker process; 0 divides the CPU cores among the workers.
+            load_topic_model (bool): Load the latest BERTopic model (not needed in worker processes).
+        """
+        self.backend = backend
+        self.classifier_mode = classifier_mode
+        self.workers = workers
+        self.worker_threads = worker_threads or max(1, (os.cpu_count() or 1) // max(workers, 1))
+        self._pool = None
+        # Per-batch (texts, outliers, unassigned) of the current topic model
+        self._topic_batches = deque(maxlen=TOPIC_STATS_BATCHES)
+        self._refit_warned = False
         self.sentiment_analyzer = None
         self.classifier = None
-        self.topic_model = load_latest_topic_model()  # Load the latest model
-        self.tokenizer = BertTokenizer.from_pretrained("bert-base-multilingual-cased")
+        self.prototype_classifier = None
+        self.sentiment_cache = None
+        self.classifier_cache = None
+        self.topic_model = load_latest_topic_model() if load_topic_model else None  # Load the latest model
         self._load_models()
 
     def _load_models(self):
         """Loads AI models for sentiment analysis, classification, and topic modeling."""
         try:
             logging.info("Loading AI models...")
-            self.sentiment_analyzer = pipeline(
+            # Shared instances from the model registry (ml_components uses the same sentiment model)
+            self.sentiment_analyzer = model_registry.handle(
                 "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english",
-                device=0  # Use GPU if available
-            )
-            self.classifier = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=0
+                "distilbert-base-uncased-finetuned-sst-2-english",
+                backend=self.backend  # GPU if available, else ONNX on CPU
             )
+            # Results are memoized per normalized text, so reposts skip inference
+            with self.sentiment_analyzer as pipe:
+                self.sentiment_cache = get_inference_cache(
+                    *pipeline_identity(pipe, "distilbert-base-uncased-finetuned-sst-2-english"))
+            # The classifier of the other mode is loaded on first use
+            if self.classifier_mode == "prototype":
+                self._load_prototype_classifier()
+            else:
+                self._load_zero_shot_classifier()
             # Topic model is loaded via load_latest_topic_model()
             if self.topic_model is None:
                 logging.warning("No topic model available. Clustering will be skipped.")
@@ -83,50 +160,166 @@ class NarrativeAnalyzer:
             logging.error(f"Error loading models: {e}")
             raise
 
+    def _load_zero_shot_classifier(self):
+        """Loads the zero-shot BART classifier and its result cache."""
+        self.classifier = model_registry.handle(
+            "zero-shot-classification",
+            "facebook/bart-large-mnli",
+            backend=self.backend
+        )
+        with self.classifier as pipe:
+            classifier_name, classifier_version = pipeline_identity(pipe, "facebook/bart-large-mnli")
+        self.classifier_cache = get_inference_cache(
+            f"{classifier_name}|{','.join(NARRATIVE_LABELS)}", classifier_version)
+
+    def _load_prototype_classifier(self):
+        """Loads the embedding-prototype classifier (shares the topic modeler's embedding model)."""
+        from prototype_classifier import PrototypeClassifier
+        self.prototype_classifier = PrototypeClassifier()
+
     def truncate_text(self, text, max_tokens=510):
-        """Truncates text to the maximum token length using BERT tokenizer."""
-        tokens = self.tokenizer.tokenize(text)
-        if len(tokens) > max_tokens:
-            tokens = tokens[:max_tokens]
-        return self.tokenizer.convert_tokens_to_string(tokens)
-
-    def cluster_narratives(self, df: pd.DataFrame):
-        """Clusters narratives using BERTopic."""
-        if len(df) < 5:
+        """Truncates text to the maximum token length, keeping the original characters."""
+        return truncate_texts([text], max_tokens=max_tokens)[0]
+
+    @property
+    def topic_model(self):
+        return self._topic_model
+
+    @topic_model.setter
+    def topic_model(self, model):
+        # Outlier statistics always refer to the model currently in use
+        self._topic_model = model
+        if hasattr(self, "_topic_batches"):
+            self._topic_batches.clear()
+            self._refit_warned = False
+
+    def cluster_narratives(self, df: pd.DataFrame, refit=False):
+        """
+        Assigns topics with BERTopic.
+
+        Batches are only transformed against the current model, so topic ids stay stable across
+        batches. The model is refitted by the scheduled update_topic_model job, on demand with
+        ``refit=True``, or once when no model exists yet (then published as the latest version).
+        Fitting needs at least TOPIC_MIN_FIT_DOCS texts; without a model, smaller batches are
+        left unassigned (topic -1) and the model is returned as None.
+
+        Args:
+            df (pd.DataFrame): Tweets with a 'text' column.
+            refit (bool): Fit the model on this batch instead of only assigning topics.
+        """
+        texts = df['text'].tolist()
+        too_small = len(df) < TOPIC_MIN_FIT_DOCS
+        if self.topic_model is not None and (not refit or too_small):
+            if refit:
+                logging.warning(f"Only {len(df)} texts, at least {TOPIC_MIN_FIT_DOCS} are needed to refit; "
+                                f"assigning topics with the current model.")
+            try:
+                topics, _ = self.topic_model.transform(texts)
+                df['topic'] = topics
+                self._record_topics(df['topic'])
+                return df, self.topic_model
+            except Exception as e:
+                logging.error(f"Error during topic assignment: {e}")
+                df['topic'] = -1
+                self._record_topics(df['topic'], unassigned=len(df))
+                return df, None
+
+        if too_small:
+            # A few live tweets give UMAP/HDBSCAN nothing to cluster; the scheduled job fits once enough are stored
+            logging.info(f"No topic model yet and only {len(df)} texts (at least {TOPIC_MIN_FIT_DOCS} needed), "
+                         f"topics left unassigned.")
             df['topic'] = -1
+            self._record_topics(df['topic'], unassigned=len(df))
             return df, None
         try:
-            logging.info("Starting narrative clustering...")
-            texts = df['text'].tolist()
-            if self.topic_model is None:
+            logging.info("Fitting topic model..." if self.topic_model is not None else "Fitting initial topic model...")
+            topic_model = self.topic_model
+            if topic_model is None:
+                from bertopic import BERTopic
+                from sklearn.feature_extraction.text import CountVectorizer
+                from topic_modeler import RegistryEmbedder
                 # Use CountVectorizer with German stop words
-                vectorizer = CountVectorizer(stop_words=german_stop_words)
-                self.topic_model = BERTopic(
+                vectorizer = CountVectorizer(stop_words=get_german_stop_words())
+                topic_model = BERTopic(
+                    # Borrows the shared embedding model instead of keeping its own copy
+                    embedding_model=RegistryEmbedder(),
                     vectorizer_model=vectorizer,
                     language="multilingual",
                     verbose=True
                 )
-            topics, _ = self.topic_model.fit_transform(texts)
+            topics, _ = topic_model.fit_transform(texts)
+            from topic_modeler import publish_model
+            publish_model(topic_model)
+            self.topic_model = topic_model
             df['topic'] = topics
+            self._record_topics(df['topic'])
             logging.info("Clustering completed.")
             return df, self.topic_model
         except Exception as e:
             logging.error(f"Error during clustering: {e}")
             df['topic'] = -1
+            self._record_topics(df['topic'], unassigned=len(df))
             return df, None
 
-    def classify_narratives(self, df: pd.DataFrame):
-        """Classify narratives into positive, negative, or neutral."""
-        if self.classifier is None:
-            logging.error("Classifier not loaded.")
-            df['narrative_type'] = "unknown"
-            return df
+    def _record_topics(self, topics, unassigned=0):
+        """Adds a batch to the outlier statistics and warns once when a refit is due."""
+        topics = pd.Series(topics)
+        if topics.empty:
+            return
+        self._topic_batches.append((len(topics), int((topics == -1).sum()) - unassigned, unassigned))
+        stats = self.topic_stats()
+        logging.info(f"Topic assignment: outlier rate {stats['outlier_rate']:.1%}, "
+                     f"unassigned rate {stats['unassigned_rate']:.1%} over {stats['texts']} texts")
+        if stats['refit_due'] and not self._refit_warned:
+            self._refit_warned = True
+            logging.warning(f"{stats['outlier_rate'] + stats['unassigned_rate']:.1%} of the last {stats['texts']} "
+                            f"texts got no topic, refitting the topic model is recommended.")
+
+    def topic_stats(self):
+        """
+        Returns the outlier and unassigned rates of the last TOPIC_STATS_BATCHES batches.
+
+        Outliers are texts the model assigned to topic -1; unassigned texts got no topic at all
+        (no model yet or the assignment failed).
+
+        Returns:
+            dict: batches, texts, outlier_rate, unassigned_rate and refit_due.
+        """
+        batches = list(self._topic_batches)
+        texts = sum(batch[0] for batch in batches)
+        outlier_rate = sum(batch[1] for batch in batches) / texts if texts else 0.0
+        unassigned_rate = sum(batch[2] for batch in batches) / texts if texts else 0.0
+        return {
+            "batches": len(batches),
+            "texts": texts,
+            "outlier_rate": outlier_rate,
+            "unassigned_rate": unassigned_rate,
+            # A handful of live tweets says little about the model
+            "refit_due": texts >= 100 and outlier_rate + unassigned_rate > TOPIC_REFIT_OUTLIER_RATE,
+        }
+
+    def classify_narratives(self, df: pd.DataFrame, mode=None):
+        """
+        Classify narratives into positive, negative, or neutral.
+
+        Args:
+            df (pd.DataFrame): Tweets with a 'text' column.
+            mode (str, optional): 'zero-shot' (BART-MNLI) or 'prototype' (embedding prototypes,
+                much faster on CPU); None uses the analyzer's default mode.
+        """
+        mode = mode or self.classifier_mode
         try:
-            logging.info("Starting narrative classification...")
+            logging.info(f"Starting narrative classification ({mode})...")
             texts = df['text'].tolist()
-            labels = ["positive", "negative", "neutral"]
-            results = self.classifier(texts, candidate_labels=labels, batch_size=8)
-            df['narrative_type'] = [result['labels'][0] for result in results]
+            if mode == "prototype":
+                if self.prototype_classifier is None:
+                    self._load_prototype_classifier()
+                tweet_ids = df['tweet_id'].tolist() if 'tweet_id' in df else None
+                df['narrative_type'] = self.prototype_classifier.classify(texts, tweet_ids=tweet_ids)
+            else:
+                if self.classifier is None:
+                    self._load_zero_shot_classifier()
+                df['narrative_type'] = self.classifier_cache.map(texts, self._classify_batch)
             logging.info("Classification completed.")
             return df
         except Exception as e:
@@ -134,43 +327,152 @@ class NarrativeAnalyzer:
             df['narrative_type'] = "unknown"
             return df
 
+    def _classify_batch(self, texts):
+        """Runs the zero-shot classifier and returns the top label per text."""
+        results = self.classifier(texts, candidate_labels=NARRATIVE_LABELS, batch_size=8)
+        if isinstance(results, dict):
+            # A single input yields a single result instead of a list
+            results = [results]
+        return [result['labels'][0] for result in results]
+
     def calculate_toxicity(self, text: str) -> float:
         """Calculate toxicity score based on toxic keywords."""
-        text_lower = text.lower()
-        toxic_count = sum(1 for word in TOXIC_KEYWORDS if re.search(r'\b' + re.escape(word) + r'\b', text_lower))
-        return min(toxic_count / len(text.split()) if text.split() else 0.0, 1.0)
+        return self.calculate_toxicity_batch([text])[0]
+
+    def calculate_toxicity_batch(self, texts) -> list:
+        """Calculate keyword toxicity scores for many texts with the compiled keyword matcher."""
+        texts = list(texts)
+        matches, _ = get_matcher(TOXIC_KEYWORDS).match_batch(texts)
+        scores = []
+        for text, found in zip(texts, matches):
+            word_count = len(text.split()) if isinstance(text, str) else 0
+            scores.append(min(len(found) / word_count if word_count else 0.0, 1.0))
+        return scores
 
     def calculate_danger_score(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate danger score based on toxicity and escalation."""
+        """
+        Calculate danger score based on toxicity and escalation.
+
+        Daily toxicity and its escalation over the previous day are computed against the
+        per-day state persisted in daily_stats, so small live batches are scored against
+        earlier days instead of only against themselves.
+        """
         df['date'] = pd.to_datetime(df['date'], errors='coerce')
         df = df.sort_values('date')
-        df['toxicity'] = df['text'].apply(self.calculate_toxicity)
-        df['daily_toxicity'] = df.groupby(df['date'].dt.date)['toxicity'].transform('mean')
-        df['escalation'] = df['daily_toxicity'].diff().fillna(0)
+        df['toxicity'] = self.calculate_toxicity_batch(df['text'])
+        tweet_ids = df['tweet_id'].astype(str).tolist() if 'tweet_id' in df else [None] * len(df)
+        rows = [{"tweet_id": tweet_id, "created_at": to_epoch(date), "toxicity_score": toxicity}
+                for tweet_id, date, toxicity in zip(tweet_ids, df['date'], df['toxicity'])]
+        try:
+            with read_connection(DB_NAME) as conn:
+                daily = toxicity_escalation(conn, rows)
+            df['daily_toxicity'] = [mean for mean, _ in daily]
+            df['escalation'] = [escalation for _, escalation in daily]
+        except sqlite3.OperationalError as e:
+            # Database not created or migrated yet: escalation within the batch only
+            logging.warning(f"No persisted daily toxicity available ({e}), using the current batch only.")
+            days = df['date'].dt.date
+            daily_means = df.groupby(days)['toxicity'].mean()
+            df['daily_toxicity'] = days.map(daily_means).fillna(df['toxicity'])
+            df['escalation'] = days.map(daily_means.diff().fillna(0)).fillna(0)
         df['danger_score'] = df['toxicity'] + df['escalation'].clip(lower=0)
         return df
 
-    def process_narratives(self, df: pd.DataFrame):
-        """Process narratives through sentiment, clustering, classification, and danger scoring."""
-        try:
-            # Truncate texts to avoid token length issues
-            df['text'] = df['text'].apply(lambda x: self.truncate_text(x, max_tokens=510))
+    def annotate_texts(self, df: pd.DataFrame, classifier_mode=None):
+        """
+        Truncates the texts and adds sentiment and narrative type; every row is handled independently.
 
-            # Batch sentiment analysis
-            logging.info("Starting sentiment analysis...")
-            texts = df['text'].tolist()
-            sentiments = self.sentiment_analyzer(texts, batch_size=8)
-            df['sentiment'] = [
-                sent['score'] if sent['label'] == 'POSITIVE' else -sent['score']
-                for sent in sentiments
-            ]
+        Args:
+            df (pd.DataFrame): Tweets with a 'text' column.
+            classifier_mode (str, optional): Narrative classifier ('zero-shot' or 'prototype').
+        """
+        # Truncate texts to avoid token length issues
+        df['text'] = truncate_texts(df['text'], max_tokens=510)
+
+        # Batch sentiment analysis
+        logging.info("Starting sentiment analysis...")
+        texts = df['text'].tolist()
+        df['sentiment'] = self.sentiment_cache.map(texts, lambda batch: [
+            sent['score'] if sent['label'] == 'POSITIVE' else -sent['score']
+            for sent in self.sentiment_analyzer(batch, batch_size=8)
+        ])
+        logging.info(f"Sentiment cache: {self.sentiment_cache.stats()}")
+
+        # Classification
+        return self.classify_narratives(df, mode=classifier_mode)
+
+    def _get_pool(self):
+        if self._pool is None:
+            logging.info(f"Starting {self.workers} analysis workers with {self.worker_threads} threads each...")
+            # Spawned rather than forked: the parent runs threads and may hold initialized models
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.backend, self.classifier_mode, self.worker_threads)
+            )
+        return self._pool
+
+    def _annotate_parallel(self, df: pd.DataFrame, classifier_mode=None):
+        """Runs annotate_texts on chunks of the batch in the worker processes, keeping the row order."""
+        mode = classifier_mode or self.classifier_mode
+        tweet_ids = df['tweet_id'].tolist() if 'tweet_id' in df else None
+        texts = df['text'].tolist()
+        starts = range(0, len(texts), NARRATIVE_WORKER_CHUNK)
+        futures = [self._get_pool().submit(
+            _annotate_chunk,
+            texts[start:start + NARRATIVE_WORKER_CHUNK],
+            tweet_ids[start:start + NARRATIVE_WORKER_CHUNK] if tweet_ids is not None else None,
+            mode
+        ) for start in starts]
+        truncated, sentiments, narratives = [], [], []
+        # Collected in submission order, so rows line up with the DataFrame
+        for future in futures:
+            chunk_texts, chunk_sentiments, chunk_narratives = future.result()
+            truncated.extend(chunk_texts)
+            sentiments.extend(chunk_sentiments)
+            narratives.extend(chunk_narratives)
+        df['text'] = truncated
+        df['sentiment'] = sentiments
+        df['narrative_type'] = narratives
+        return df
+
+    def close_workers(self):
+        """Shuts the worker processes down; they are restarted on the next large batch."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def process_narratives(self, df: pd.DataFrame, classifier_mode=None):
+        """Process narratives through sentiment, classification, clustering, and danger scoring.
+
+        With more than one worker, sentiment analysis and classification of batches larger
+        than NARRATIVE_WORKER_CHUNK are spread over worker processes; clustering and danger
+        scoring need the whole batch and stay in the calling process.
+
+        Args:
+            df (pd.DataFrame): Tweets with 'text' and 'date' columns.
+            classifier_mode (str, optional): Narrative classifier for this run ('zero-shot' or 'prototype').
+        """
+        try:
+            start = time.perf_counter()
+            if self.workers > 1 and len(df) > NARRATIVE_WORKER_CHUNK:
+                try:
+                    df = self._annotate_parallel(df, classifier_mode)
+                except Exception as e:
+                    # A dead worker or a failing chunk: restart the pool on the next batch, finish this one here
+                    logging.error(f"Parallel analysis failed ({e}), continuing in-process.")
+                    self.close_workers()
+                    df = self.annotate_texts(df, classifier_mode)
+            else:
+                df = self.annotate_texts(df, classifier_mode)
+            duration = time.perf_counter() - start
+            logging.info(f"Sentiment and classification: {len(df)} texts in {duration:.2f}s "
+                         f"({len(df) / duration if duration else 0.0:.1f} texts/s, workers: {max(self.workers, 1)})")
 
             # Clustering
             df, local_topic_model = self.cluster_narratives(df)
 
-            # Classification
-            df = self.classify_narratives(df)
-
             # Danger score calculation
             df = self.calculate_danger_score(df)
 
@@ -184,7 +486,7 @@ class NarrativeAnalyzer:
         if topic_model is None:
             return set()
         try:
-            with sqlite3.connect(DB_NAME) as conn:
+            with read_connection(DB_NAME) as conn:
                 old_topics_df = pd.read_sql_query("SELECT DISTINCT topic FROM narratives", conn)
             old_topics = set(old_topics_df['topic'].dropna().astype(int).tolist())
             new_topics = set(df['topic'].dropna().astype(int).tolist())
@@ -195,7 +497,4 @@ class NarrativeAnalyzer:
             return unseen_topics
         except Exception as e:
             logging.error(f"Error detecting new narratives: {e}")
-            return set()
-
-# Initialize the analyzer
-analyzer = NarrativeAnalyzer()
\ No newline at end of file
+            return set()
\ No newline at end of file
@@ -1,4 +1,6 @@
 import os
+import json
+import base64
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -6,9 +8,12 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import time
 from datetime import datetime
+from pathlib import Path
 import logging
+from keyword_matcher import get_query_matcher
+from driver_pool import get_pool
+from config import CHROMIUM_EXTRACTION_MODE
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -26,11 +31,16 @@ logging.basicConfig(
 X_USERNAME = os.getenv("X_USERNAME")
 X_PASSWORD = os.getenv("X_PASSWORD")
 
-def init_driver(headless=True):
-    """Initialize the Selenium WebDriver with options to avoid bot detection."""
+# Maximum wait for new tweets after scrolling (in seconds)
+SCROLL_TIMEOUT = 5
+
+def init_driver(headless=True, capture_network=False):
+    """Initialize the Selenium WebDriver with options to avoid bot detection; ``capture_network`` enables the performance log."""
     options = Options()
     if headless:
         options.add_argument("--headless")
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -92,84 +102,290 @@ def login_to_x(driver, log_fn=None):
             log_fn(f"Login failed: {e}")
         raise
 
-def scrape_x_data(keywords, limit=10, tweet_type="latest", log_fn=None, headless=True):
-    """Scrape tweets from Twitter (X) after logging in."""
-    driver = init_driver(headless=headless)
+# Collects the fields of all tweet articles not seen before in one round-trip.
+# arguments[0]: IDs already collected. Processed articles are marked so later calls skip them.
+EXTRACT_TWEETS_JS = """
+const seen = new Set(arguments[0]);
+const results = [];
+for (const article of document.querySelectorAll("article[data-testid='tweet']:not([data-scraped])")) {
+    if (!article.getClientRects().length) continue;
+    article.setAttribute("data-scraped", "1");
+    // The timestamp links to the tweet itself; other status links may point to quoted tweets
+    const time = article.querySelector("time");
+    const link = (time && time.closest("a[href*='/status/']")) || article.querySelector("a[href*='/status/']");
+    const match = link && link.getAttribute("href").match(/\\/status\\/(\\d+)/);
+    const textNode = article.querySelector("div[data-testid='tweetText'], div[lang]");
+    if (!match || !textNode) continue;
+    if (seen.has(match[1])) continue;
+    seen.add(match[1]);
+    // The profile link carries the handle; the first link of the article is the (textless) avatar
+    const profile = article.querySelector("[data-testid='User-Name'] a[href^='/']");
+    const user = profile ? profile.getAttribute("href").slice(1) : link.getAttribute("href").split("/")[1];
+    results.push({
+        tweet_id: match[1],
+        text: textNode.innerText,
+        user: user || "",
+        date: time ? time.getAttribute("datetime") : null
+    });
+}
+return results;
+"""
+
+# Resolves as soon as unprocessed tweet articles exist, watching the DOM with a MutationObserver.
+# arguments[0]: timeout in milliseconds; resolves to false on timeout.
+WAIT_FOR_TWEETS_JS = """
+const done = arguments[arguments.length - 1];
+const selector = "article[data-testid='tweet']:not([data-scraped])";
+if (document.querySelector(selector)) { done(true); return; }
+const observer = new MutationObserver(() => {
+    if (document.querySelector(selector)) { observer.disconnect(); clearTimeout(timer); done(true); }
+});
+const timer = setTimeout(() => { observer.disconnect(); done(false); }, arguments[0]);
+observer.observe(document.body, {childList: true, subtree: true});
+"""
+
+def extract_tweets(driver, seen_ids):
+    """
+    Extracts all new tweets of the current page with a single script call.
+
+    Args:
+        driver: WebDriver with a loaded timeline or search page.
+        seen_ids (set): IDs collected so far; updated in place.
+
+    Returns:
+        list: Tweet dictionaries in page order.
+    """
+    tweets = []
+    for item in driver.execute_script(EXTRACT_TWEETS_JS, list(seen_ids)) or []:
+        seen_ids.add(item["tweet_id"])
+        tweets.append({
+            "tweet_id": item["tweet_id"],
+            "text": item["text"],
+            "user": item["user"],
+            "followers": 0,  # Not available via Selenium
+            "retweets": 0,
+            "likes": 0,
+            "date": item["date"] or datetime.now().isoformat()
+        })
+    return tweets
+
+def wait_for_new_tweets(driver, timeout=SCROLL_TIMEOUT):
+    """
+    Waits until unprocessed tweet articles appear instead of sleeping a fixed time.
+
+    Args:
+        driver: WebDriver with a loaded page.
+        timeout (float): Maximum wait in seconds.
+
+    Returns:
+        bool: True if new articles appeared, False on timeout.
+    """
+    driver.set_script_timeout(timeout + 5)
+    return bool(driver.execute_async_script(WAIT_FOR_TWEETS_JS, int(timeout * 1000)))
+
+def extract_from_html_file(driver, path):
+    """
+    Runs the extraction against a saved HTML page, e.g. a fixture captured from x.com.
+
+    Args:
+        driver: Any WebDriver (no login needed).
+        path (str): Path of the HTML file.
+
+    Returns:
+        list: Tweet dictionaries found in the file.
+    """
+    driver.get(Path(path).resolve().as_uri())
+    return extract_tweets(driver, set())
+
+# GraphQL operations whose responses contain timeline tweets
+TIMELINE_OPERATIONS = ("SearchTimeline", "HomeTimeline", "HomeLatestTimeline", "UserTweets", "TweetDetail")
+
+def _tweet_from_result(result):
+    """Converts one GraphQL tweet result into the scraper's dictionary format (None if incomplete)."""
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+    legacy = result.get("legacy")
+    tweet_id = result.get("rest_id")
+    if not legacy or not tweet_id:
+        return None
+    user = result.get("core", {}).get("user_results", {}).get("result", {})
+    user_legacy = user.get("legacy", {})
+    # Long posts carry their full text separately
+    note = result.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
     try:
-        login_to_x(driver, log_fn)
-        query = " OR ".join(keywords)
-        search_url = (
-            f"https://x.com/search?q={query}%20lang%3Ade%20-is%3Aretweet&src=typed_query&f="
-            f"{'live' if tweet_type == 'latest' else 'top'}"
-        )
-        driver.get(search_url)
-        if log_fn:
-            log_fn(f"Navigating to search URL: {search_url}")
+        date = datetime.strptime(legacy["created_at"], "%a %b %d %H:%M:%S %z %Y").isoformat()
+    except (KeyError, ValueError):
+        date = datetime.now().isoformat()
+    return {
+        "tweet_id": str(tweet_id),
+        "text": note.get("text") or legacy.get("full_text", ""),
+        "user": user_legacy.get("screen_name") or user.get("core", {}).get("screen_name", "unknown"),
+        "followers": user_legacy.get("followers_count", 0),
+        "retweets": legacy.get("retweet_count", 0),
+        "likes": legacy.get("favorite_count", 0),
+        "date": date
+    }
 
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "article[data-testid='tweet']"))
-        )
+def parse_timeline_response(payload):
+    """
+    Extracts tweets from a timeline JSON response as downloaded by the X web app.
+
+    Works offline on recorded responses. Quoted tweets nested inside a result are not
+    returned separately; promoted entries (ads) and cursor entries are skipped.
+
+    Args:
+        payload (dict or str): Parsed or raw JSON body of a GraphQL timeline request.
+
+    Returns:
+        list: Tweet dictionaries in response order.
+    """
+    if isinstance(payload, (str, bytes)):
+        payload = json.loads(payload)
+    tweets = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if str(node.get("entryId", "")).startswith("promoted") or "promotedMetadata" in node:
+                continue
+            result = node.get("tweet_results", {}).get("result") if isinstance(node.get("tweet_results"), dict) else None
+            if result:
+                tweet = _tweet_from_result(result)
+                if tweet:
+                    tweets.append(tweet)
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return tweets
+
+class NetworkCapture:
+    """
+    Reads tweets from the timeline responses the page downloads, via Chrome's performance log.
+
+    Requires a driver created with ``capture_network=True``. Create the capture before
+    navigating so the first page of results is included.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._pending = {}
+        # Drop log entries left over from earlier use of a pooled driver
+        driver.get_log("performance")
+
+    def extract(self, seen_ids):
+        """
+        Returns tweets of all timeline responses that finished loading since the last call.
+
+        Args:
+            seen_ids (set): IDs collected so far; updated in place.
+
+        Returns:
+            list: New tweet dictionaries.
+        """
+        finished = []
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            if message.get("method") == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if "/graphql/" in url and any(f"/{operation}" in url for operation in TIMELINE_OPERATIONS):
+                    self._pending[params["requestId"]] = url
+            elif message.get("method") == "Network.loadingFinished" and params.get("requestId") in self._pending:
+                finished.append(params["requestId"])
 
         tweets = []
-        scroll_attempts = 0
-        max_scrolls = 10
-        last_height = driver.execute_script("return document.body.scrollHeight")
-
-        while len(tweets) < limit and scroll_attempts < max_scrolls:
-            tweet_elements = driver.find_elements(By.CSS_SELECTOR, "article[data-testid='tweet']")
-            if not tweet_elements:
-                logging.info("No tweets found on page.")
-                break
-
-            for tweet in tweet_elements:
-                try:
-                    if not tweet.is_displayed():
-                        continue
-                    text = tweet.find_element(By.CSS_SELECTOR, "div[lang]").text
-                    user = tweet.find_element(By.CSS_SELECTOR, "a[role='link']").text
-                    timestamp = (
-                        tweet.find_element(By.CSS_SELECTOR, "time").get_attribute("datetime")
-                        if tweet.find_elements(By.CSS_SELECTOR, "time")
-                        else datetime.now().isoformat()
-                    )
-                    tweet_id = tweet.find_element(
-                        By.CSS_SELECTOR, "a[role='link'][href*='/status/']"
-                    ).get_attribute("href").split("/")[-1]
-                    keywords_found = ",".join([kw for kw in keywords if kw.lower() in text.lower()])
-
-                    tweets.append({
-                        "tweet_id": tweet_id,
-                        "text": text,
-                        "user": user,
-                        "followers": 0,  # Not available via Selenium
-                        "retweets": 0,
-                        "likes": 0,
-                        "date": timestamp,
-                        "keywords": keywords_found
-                    })
-                except Exception:
-                    continue
-
-                if len(tweets) >= limit:
-                    break
-
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                scroll_attempts += 1
-            else:
-                scroll_attempts = 0
-            last_height = new_height
-
-        logging.info(f"{len(tweets)} tweets successfully scraped with Chromium.")
-        if log_fn:
-            log_fn(f"{len(tweets)} tweets scraped.")
-        return tweets[:limit]
+        for request_id in finished:
+            url = self._pending.pop(request_id)
+            try:
+                response = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                body = response["body"]
+                if response.get("base64Encoded"):
+                    body = base64.b64decode(body)
+                parsed = parse_timeline_response(body)
+            except Exception as e:
+                logging.warning(f"Timeline response {url} could not be read: {e}")
+                continue
+            for tweet in parsed:
+                if tweet["tweet_id"] not in seen_ids:
+                    seen_ids.add(tweet["tweet_id"])
+                    tweets.append(tweet)
+        return tweets
+
+def get_driver_pool(headless=True, capture_network=False):
+    """Returns the shared pool of logged-in Chromium sessions (see driver_pool.py)."""
+    return get_pool(lambda: init_driver(headless=headless, capture_network=capture_network), login_to_x,
+                    key=("chromium", headless, capture_network))
+
+def scrape_x_data(keywords, limit=10, tweet_type="latest", log_fn=None, headless=True, since_id=None,
+                  mode=CHROMIUM_EXTRACTION_MODE):
+    """
+    Scrape tweets from Twitter (X) with a pooled, logged-in session.
+
+    Args:
+        keywords (list): Search terms.
+        limit (int): Maximum number of tweets.
+        tweet_type (str): 'latest' or 'top'.
+        log_fn (callable, optional): Receives progress messages for the UI.
+        headless (bool): Run the browser without a window.
+        since_id (str, optional): Restrict the search to tweets newer than this ID.
+        mode (str): 'dom' reads the rendered page; 'network' reads the timeline JSON responses,
+            which include follower, retweet and like counts.
+
+    Returns:
+        list: Tweet dictionaries.
+    """
+    capture_network = mode == "network"
+    try:
+        with get_driver_pool(headless, capture_network).driver(log_fn) as driver:
+            return _scrape_search(driver, keywords, limit, tweet_type, log_fn, since_id, capture_network)
     except Exception as e:
         logging.error(f"Error during Chromium scraping: {e}")
         if log_fn:
             log_fn(f"Error during Chromium scraping: {e}")
         return []
-    finally:
-        driver.quit()
\ No newline at end of file
+
+def _scrape_search(driver, keywords, limit, tweet_type, log_fn, since_id, capture_network=False):
+    """Runs one search in a leased driver and collects tweets while scrolling."""
+    capture = NetworkCapture(driver) if capture_network else None
+    query = " OR ".join(keywords)
+    if since_id:
+        query = f"({query}) since_id:{since_id}"
+    search_url = (
+        f"https://x.com/search?q={query}%20lang%3Ade%20-is%3Aretweet&src=typed_query&f="
+        f"{'live' if tweet_type == 'latest' else 'top'}"
+    )
+    driver.get(search_url)
+    if log_fn:
+        log_fn(f"Navigating to search URL: {search_url}")
+
+    WebDriverWait(driver, 30).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "article[data-testid='tweet']"))
+    )
+
+    tweets = []
+    seen_ids = set()
+    stalled_scrolls = 0
+    max_scrolls = 10
+
+    while len(tweets) < limit and stalled_scrolls < max_scrolls:
+        new_tweets = capture.extract(seen_ids) if capture else extract_tweets(driver, seen_ids)
+        tweets.extend(new_tweets[:limit - len(tweets)])
+        if len(tweets) >= limit:
+            break
+
+        if capture:
+            # Articles are not read in network mode; mark them so the wait only reacts to new ones
+            driver.execute_script(
+                "document.querySelectorAll(\"article[data-testid='tweet']\").forEach(a => a.setAttribute('data-scraped', '1'));")
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        if wait_for_new_tweets(driver):
+            stalled_scrolls = 0
+        else:
+            stalled_scrolls += 1
+
+    get_query_matcher(keywords).annotate(tweets)
+    logging.info(f"{len(tweets)} tweets successfully scraped with Chromium.")
+    if log_fn:
+        log_fn(f"{len(tweets)} tweets scraped.")
+    return tweets[:limit]
\ No newline at end of file
@@ -39,12 +39,74 @@ CONFIG = load_config()
 KEYWORDS = CONFIG["keywords"]
 DB_NAME = os.getenv("DB_NAME", "migration_narratives.db")
 
+# SQLite-Verbindungseinstellungen (siehe db_connection.py)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "30000"))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "65536"))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Komponenten, die nach dem Start im Hintergrund vorgeladen werden (kommagetrennt, siehe lazy_loader.py)
+WARM_UP_COMPONENTS = [name.strip() for name in os.getenv("WARM_UP_COMPONENTS", "").split(",") if name.strip()]
+
+# Speicherbudget für geladene Modelle in MB, 0 = unbegrenzt (siehe model_registry.py)
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+
+# Persistenter Cache für Modellergebnisse (siehe inference_cache.py)
+INFERENCE_CACHE_DB = os.getenv("INFERENCE_CACHE_DB", "inference_cache.db")
+
+# Inferenz-Backend: "auto" (ONNX auf CPU, PyTorch auf GPU), "torch" oder "onnx" (siehe inference_backend.py)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "auto")
+# Threads pro Modell, 0 = Standard der Bibliothek
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0"))
+# Dynamische int8-Quantisierung der ONNX-Modelle
+INFERENCE_QUANTIZE = os.getenv("INFERENCE_QUANTIZE", "true").lower() in ("1", "true", "yes")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join("models", "onnx"))
+# Batchgröße der Sentiment-Analyse und maximale Tokens pro Batch (lange Texte laufen in kleineren Batches)
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+SENTIMENT_TOKEN_BUDGET = int(os.getenv("SENTIMENT_TOKEN_BUDGET", "8192"))
+# Narrativ-Klassifikation: "zero-shot" (BART-MNLI) oder "prototype" (Embedding-Prototypen, siehe prototype_classifier.py)
+NARRATIVE_CLASSIFIER = os.getenv("NARRATIVE_CLASSIFIER", "zero-shot")
+# Prozesse für process_narratives (0/1 = im aufrufenden Prozess); jeder Prozess lädt die Modelle einmal
+NARRATIVE_WORKERS = int(os.getenv("NARRATIVE_WORKERS", "0"))
+# Threads pro Prozess, 0 = CPU-Kerne / Prozesse
+NARRATIVE_WORKER_THREADS = int(os.getenv("NARRATIVE_WORKER_THREADS", "0"))
+# Tweets pro Arbeitspaket; kleinere Batches (z. B. Live-Monitoring) laufen ohne Prozesse
+NARRATIVE_WORKER_CHUNK = int(os.getenv("NARRATIVE_WORKER_CHUNK", "256"))
+# Themenzuordnung: Live-Batches nutzen nur transform; Anteil der Ausreißer (Thema -1) bzw. nicht
+# zugeordneten Tweets über die letzten N Batches, ab dem ein Re-Training empfohlen wird
+TOPIC_REFIT_OUTLIER_RATE = float(os.getenv("TOPIC_REFIT_OUTLIER_RATE", "0.5"))
+TOPIC_STATS_BATCHES = int(os.getenv("TOPIC_STATS_BATCHES", "50"))
+# Mindestanzahl Tweets für das erste Training bzw. ein Re-Training; kleinere Batches bleiben ohne Thema,
+# bis genug Daten gespeichert sind (HDBSCAN bildet erst ab 10 Tweets pro Cluster ein Thema)
+TOPIC_MIN_FIT_DOCS = int(os.getenv("TOPIC_MIN_FIT_DOCS", "500"))
+
+# Chromium-Sitzungen (siehe driver_pool.py): Datei mit Cookies/Local Storage, parallele Sitzungen,
+# Neustart nach N Verwendungen bzw. ab diesem JS-Speicherverbrauch in MB (0 = aus)
+# Die Sitzungsdatei enthält Login-Cookies und steht deshalb in .gitignore
+CHROMIUM_SESSION_FILE = os.getenv("CHROMIUM_SESSION_FILE", "chromium_session.json")
+CHROMIUM_POOL_SIZE = int(os.getenv("CHROMIUM_POOL_SIZE", "2"))
+CHROMIUM_MAX_USES = int(os.getenv("CHROMIUM_MAX_USES", "50"))
+CHROMIUM_MAX_MEMORY_MB = int(os.getenv("CHROMIUM_MAX_MEMORY_MB", "1024"))
+# Auslesen der Tweets: "dom" (gerenderte Seite) oder "network" (Timeline-JSON inkl. Follower/Retweets/Likes)
+CHROMIUM_EXTRACTION_MODE = os.getenv("CHROMIUM_EXTRACTION_MODE", "dom")
+
+# Pipeline (Scrapen -> Analysieren -> Speichern)
+# Plätze je Warteschlange zwischen zwei Stufen; ist sie voll, wartet die vorherige Stufe
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
+# Sekunden zwischen zwei Abfragen im Live-Monitoring
+MONITOR_INTERVAL = int(os.getenv("MONITOR_INTERVAL", "60"))
+# Tweets pro Abfrage im Live-Monitoring
+MONITOR_LIMIT = int(os.getenv("MONITOR_LIMIT", "10"))
+
 # Twitter API-Zugangsdaten
 TWITTER_CONSUMER_KEY = os.getenv("TWITTER_CONSUMER_KEY")
 TWITTER_CONSUMER_SECRET = os.getenv("TWITTER_CONSUMER_SECRET")
 TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
 
+# Maximale Wartezeit in Sekunden auf Rate-Limits pro Ergebnisseite (ein Fenster sind 15 Minuten);
+# danach wird die Suche abgebrochen, z. B. wenn das Monatskontingent erschöpft ist
+TWITTER_RATE_LIMIT_MAX_WAIT = int(os.getenv("TWITTER_RATE_LIMIT_MAX_WAIT", "1800"))
+
 # Chromium Zugangsdaten
 X_USERNAME = os.getenv("X_USERNAME")
 X_PASSWORD = os.getenv("X_PASSWORD")
@@ -55,18 +117,21 @@ SMTP_USERNAME = os.getenv("MAILJET_API_KEY")
 SMTP_PASSWORD = os.getenv("MAILJET_SECRET_KEY")
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 
-def validate_credentials():
-    """Validiert alle Zugangsdaten."""
-    if not all([TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET]):
+def validate_credentials(*groups):
+    """
+    Validiert die Zugangsdaten der angegebenen Gruppen ("twitter", "chromium", "smtp").
+
+    Ohne Argumente werden alle Gruppen geprüft. Die Prüfung erfolgt erst, wenn eine
+    Funktion die Zugangsdaten tatsächlich benötigt, nicht mehr beim Import.
+    """
+    groups = groups or ("twitter", "chromium", "smtp")
+    if "twitter" in groups and not all([TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET]):
         logging.error("Twitter API-Zugangsdaten fehlen oder sind unvollständig.")
         raise ValueError("Twitter API-Zugangsdaten fehlen. Bitte überprüfe die .env-Datei.")
-    if not all([X_USERNAME, X_PASSWORD]):
+    if "chromium" in groups and not all([X_USERNAME, X_PASSWORD]):
         logging.error("Chromium-Zugangsdaten fehlen oder sind unvollständig.")
         raise ValueError("Chromium-Zugangsdaten fehlen. Bitte überprüfe die .env-Datei.")
-    if not all([SMTP_SERVER, SMTP_USERNAME, SMTP_PASSWORD, SENDER_EMAIL]):
+    if "smtp" in groups and not all([SMTP_SERVER, SMTP_USERNAME, SMTP_PASSWORD, SENDER_EMAIL]):
         logging.error("SMTP-Konfiguration fehlt in .env.")
         raise ValueError("SMTP-Konfiguration fehlt. Bitte überprüfe die .env-Datei.")
-    logging.info("Zugangsdaten erfolgreich validiert.")
-
-# Initiale Validierung
-validate_credentials()
\ No newline at end of file
+    logging.info(f"Zugangsdaten erfolgreich validiert: {', '.join(groups)}.")
\ No newline at end of file
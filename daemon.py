@@ -0,0 +1,190 @@
+"""
+Headless runner for continuous ingestion and analysis on servers without a display.
+
+Usage:
+    python daemon.py --method twscrape --keywords Migration,Asyl --interval 120
+"""
+import sys
+import time
+import queue
+import signal
+import argparse
+import logging
+import threading
+from collections import deque
+from lazy_loader import registry
+from db import init_db
+from scheduler import start_scheduler
+from ingestion import SCRAPING_METHODS, new_job, build_pipeline
+from config import NARRATIVE_CLASSIFIER, MONITOR_INTERVAL, MONITOR_LIMIT
+from keyword_matcher import config_keywords
+
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+class IngestionDaemon:
+    """
+    Submits a live-monitoring job every ``interval`` seconds to the scrape -> analyze -> store
+    pipeline until SIGINT or SIGTERM arrives, then lets the pipeline finish all queued jobs.
+    """
+
+    def __init__(self, keywords, method="API", tweet_type="latest", limit=MONITOR_LIMIT, interval=MONITOR_INTERVAL,
+                 classifier_mode=NARRATIVE_CLASSIFIER, summary_interval=300, scheduler=True):
+        """
+        Args:
+            keywords (list): Search terms.
+            method (str): Scraping method ('API', 'Chromium', 'twscrape').
+            tweet_type (str): 'latest' or 'popular'.
+            limit (int): Tweets per job.
+            interval (int): Seconds between two jobs.
+            classifier_mode (str): Narrative classifier ('zero-shot' or 'prototype').
+            summary_interval (int): Seconds between two throughput summaries.
+            scheduler (bool): Run the scheduled topic model retraining.
+        """
+        if method not in SCRAPING_METHODS:
+            raise ValueError(f"Invalid scraping method: {method}")
+        self.keywords = keywords
+        self.method = method
+        self.tweet_type = tweet_type
+        self.limit = limit
+        self.interval = interval
+        self.classifier_mode = classifier_mode
+        self.summary_interval = summary_interval
+        self.use_scheduler = scheduler
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._window = deque()
+        self._totals = {"jobs": 0, "tweets": 0, "inserted": 0}
+        self._window_start = time.monotonic()
+        self.pipeline = None
+
+    def request_stop(self, signum=None, frame=None):
+        """Signal handler: the first signal stops gracefully, a second one exits immediately."""
+        if self.stop_event.is_set():
+            logging.warning("Second stop signal, exiting without flushing.")
+            raise SystemExit(1)
+        logging.info(f"Stop signal {signum} received, flushing pending jobs...")
+        print("Stopping, flushing pending jobs (send the signal again to exit immediately)...", flush=True)
+        self.stop_event.set()
+
+    def _on_result(self, job):
+        with self._lock:
+            self._window.append((len(job["data"]), job["inserted"], job["latency"]))
+            self._totals["jobs"] += 1
+            self._totals["tweets"] += len(job["data"])
+            self._totals["inserted"] += job["inserted"]
+
+    def summary(self):
+        """
+        Returns a throughput and latency summary since the previous call and resets the window.
+
+        Returns:
+            str: One line for the window and one line per pipeline stage.
+        """
+        now = time.monotonic()
+        with self._lock:
+            window, self._window = list(self._window), deque()
+            elapsed, self._window_start = now - self._window_start, now
+            totals = dict(self._totals)
+        tweets = sum(item[0] for item in window)
+        latencies = [item[2] for item in window]
+        lines = [f"{len(window)} jobs, {tweets} new tweets ({tweets / elapsed if elapsed else 0.0:.2f}/s), "
+                 f"{sum(item[1] for item in window)} stored in {elapsed:.0f}s | "
+                 f"latency p50 {_percentile(latencies, 0.5):.1f}s, p95 {_percentile(latencies, 0.95):.1f}s, "
+                 f"max {max(latencies, default=0.0):.1f}s | total {totals['jobs']} jobs, {totals['tweets']} tweets, "
+                 f"{totals['inserted']} stored"]
+        if self.pipeline is not None:
+            for name, stats in self.pipeline.stats().items():
+                lines.append(f"  {name}: {stats['processed']} processed, {stats['dropped']} empty, "
+                             f"{stats['errors']} errors, {stats['busy_seconds']:.1f}s busy, queue {stats['queue_depth']}")
+        if registry.is_loaded("analyzer"):
+            topics = registry.get("analyzer").topic_stats()
+            lines.append(f"  topics: {topics['outlier_rate']:.1%} outliers, {topics['unassigned_rate']:.1%} unassigned "
+                         f"over {topics['texts']} texts" + (" - refit recommended" if topics['refit_due'] else ""))
+        return "\n".join(lines)
+
+    def _print_summary(self):
+        text = self.summary()
+        logging.info(f"Throughput summary:\n{text}")
+        print(text, flush=True)
+
+    def _submit(self, job):
+        # Wait for space in the queue, but stay responsive to stop signals
+        while not self.stop_event.is_set():
+            try:
+                self.pipeline.put(job, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        """Runs until a stop signal arrives; returns after all submitted jobs are stored."""
+        init_db()
+        scheduler = None
+        if self.use_scheduler:
+            # Also hands the retrained topic model to the loaded analyzer
+            scheduler = start_scheduler()
+        signal.signal(signal.SIGINT, self.request_stop)
+        signal.signal(signal.SIGTERM, self.request_stop)
+
+        self.pipeline = build_pipeline("daemon", lambda: registry.get("analyzer"), log_fn=logging.info,
+                                       on_result=self._on_result)
+        logging.info(f"Daemon started: method={self.method}, keywords={self.keywords}, interval={self.interval}s")
+        print(f"Daemon started ({self.method}, every {self.interval}s, {len(self.keywords)} keywords).", flush=True)
+        next_job = time.monotonic()
+        next_summary = next_job + self.summary_interval
+        try:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                if now >= next_job:
+                    self._submit(new_job(self.keywords, self.limit, tweet_type=self.tweet_type, method=self.method,
+                                         classifier_mode=self.classifier_mode, monitor=True))
+                    next_job = time.monotonic() + self.interval
+                if now >= next_summary:
+                    self._print_summary()
+                    next_summary = now + self.summary_interval
+                self.stop_event.wait(max(0.0, min(next_job, next_summary) - time.monotonic()))
+        finally:
+            self.pipeline.close()
+            self._print_summary()
+            if scheduler is not None:
+                scheduler.shutdown(wait=False)
+            if registry.is_loaded("analyzer"):
+                registry.get("analyzer").close_workers()
+            logging.info("Daemon stopped.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Continuous headless ingestion and analysis.")
+    parser.add_argument("--keywords", help="Comma-separated search terms (default: keywords from config.json)")
+    parser.add_argument("--method", choices=SCRAPING_METHODS, default="API")
+    parser.add_argument("--tweet-type", choices=("latest", "popular"), default="latest")
+    parser.add_argument("--limit", type=int, default=MONITOR_LIMIT, help="Tweets per job")
+    parser.add_argument("--interval", type=int, default=MONITOR_INTERVAL, help="Seconds between two jobs")
+    parser.add_argument("--classifier", choices=("zero-shot", "prototype"), default=NARRATIVE_CLASSIFIER)
+    parser.add_argument("--summary-interval", type=int, default=300, help="Seconds between throughput summaries")
+    parser.add_argument("--no-scheduler", action="store_true", help="Do not run the scheduled model retraining")
+    args = parser.parse_args(argv)
+
+    keywords = [kw.strip() for kw in (args.keywords or "").split(",") if kw.strip()] or config_keywords()
+    daemon = IngestionDaemon(keywords, method=args.method, tweet_type=args.tweet_type, limit=args.limit,
+                             interval=args.interval, classifier_mode=args.classifier,
+                             summary_interval=args.summary_interval, scheduler=not args.no_scheduler)
+    try:
+        daemon.run()
+    except Exception as e:
+        logging.error(f"Fehler im Daemon: {e}")
+        print(f"Ein Fehler ist aufgetreten: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,3 @@
-import sqlite3
 import pandas as pd
 import plotly.express as px
 from dash import Dash, dcc, html, Output, Input
@@ -6,6 +5,8 @@ import threading
 import webbrowser
 import time
 from config import DB_NAME
+from aggregates import keyword_time_series, sentiment_histogram
+from query_cache import cached_read
 import logging
 
 logging.basicConfig(
@@ -25,20 +26,17 @@ dash_app.layout = html.Div([
 ], style={'backgroundColor': '#F5F5F5', 'padding': '20px'})
 
 def update_time_series(n):
-    with sqlite3.connect(DB_NAME) as conn:
-        df = pd.read_sql_query("SELECT * FROM narratives", conn)
-    if df.empty or 'date' not in df or df['date'].isnull().all():
+    # Reads the daily rollup table once per data change, shared by all callbacks and tabs
+    time_series = cached_read("keyword_time_series", keyword_time_series)
+    if time_series.empty:
         return px.line(title="Keine Daten verfügbar")
-    df['date'] = pd.to_datetime(df['date'], utc=True)
-    time_series = df.groupby([pd.Grouper(key='date', freq='D'), 'keywords']).size().unstack(fill_value=0)
-    return px.line(time_series, title="Keyword-Häufigkeit über Zeit", labels={"value": "Anzahl Tweets", "date": "Datum"})
+    return px.line(time_series, title="Keyword-Häufigkeit über Zeit", labels={"value": "Anzahl Tweets", "day": "Datum"})
 
 def update_sentiment_dist(n):
-    with sqlite3.connect(DB_NAME) as conn:
-        df = pd.read_sql_query("SELECT * FROM narratives", conn)
-    if df.empty or 'sentiment' not in df:
+    histogram = cached_read("sentiment_histogram", sentiment_histogram)
+    if histogram.empty:
         return px.bar(title="Keine Sentiment-Daten verfügbar")
-    return px.histogram(df, x="sentiment", title="Sentiment-Verteilung", nbins=20)
+    return px.bar(histogram, x="sentiment", y="count", title="Sentiment-Verteilung")
 
 dash_app.callback(Output("time-series", "figure"), Input("interval-component", "n_intervals"))(update_time_series)
 dash_app.callback(Output("sentiment-dist", "figure"), Input("interval-component", "n_intervals"))(update_sentiment_dist)
@@ -1,7 +1,10 @@
-import sqlite3
-from typing import Dict
+from typing import Dict, Tuple
 import logging
 from config import DB_NAME
+from db_connection import get_connection
+from migrations import migrate, to_epoch
+from aggregates import fetch_rollup_rows, update_rollups
+from query_cache import bump_data_version
 
 # Configure logging
 logging.basicConfig(
@@ -11,28 +14,131 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-def init_db():
+def init_db(db_name: str = DB_NAME):
     """
-    Initializes the database with required tables and ensures the 'danger_score' column exists.
+    Initializes the database by running all pending schema migrations (see migrations.py).
+
+    Args:
+        db_name (str): Path of the SQLite database.
     """
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        version = migrate(db_name)
+        logging.info(f"Datenbank erfolgreich initialisiert (Schema-Version {version}).")
+    except Exception as e:
+        logging.error(f"Fehler beim Initialisieren der Datenbank: {e}")
+        raise
+
+# Default values for optional narrative columns (mirrors the former insert_tweet behaviour)
+TWEET_DEFAULTS = {
+    "sentiment": 0.0,
+    "topic": -1,
+    "narrative_type": "",
+    "danger_score": 0.0,
+}
+
+# Column names used by narrative_analyzer that map onto the unified schema
+COLUMN_ALIASES = {
+    "topic_id": "topic",
+    "toxicity": "toxicity_score",
+}
+
+def _to_records(records) -> list:
+    """Converts a DataFrame or an iterable of dicts into a list of plain dicts."""
+    if hasattr(records, "to_dict"):
+        # DataFrame.to_dict('records') already boxes numpy scalars into Python types
+        rows = records.to_dict("records")
+    else:
+        rows = [dict(record) for record in records]
+    for row in rows:
+        for alias, column in COLUMN_ALIASES.items():
+            if alias in row and column not in row:
+                row[column] = row.pop(alias)
+        if row.get("tweet_id") is not None:
+            row["tweet_id"] = str(row["tweet_id"])
+        # Partial rows without a date keep their stored created_at when upserted
+        if row.get("created_at") is None and "date" in row:
+            row["created_at"] = to_epoch(row["date"])
+    return rows
+
+def _prepare_value(value):
+    """Converts a single value into something SQLite can bind."""
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        # NaN is the only value that is not equal to itself
+        return None if isinstance(value, float) and value != value else value
+    return str(value)
+
+def insert_tweets(records, db_name: str = DB_NAME, chunk_size: int = 500, upsert: bool = False) -> Tuple[int, int]:
+    """
+    Inserts many tweets into the database using one connection and one transaction.
+
+    Only columns that exist in the ``narratives`` table are written, so the same call
+    works for every DataFrame produced by the analyzers. The daily rollup tables
+    (see aggregates.py) are updated in the same transaction.
+
+    Args:
+        records (DataFrame | Iterable[Dict]): Tweets to insert.
+        db_name (str): Path of the SQLite database.
+        chunk_size (int): Number of rows passed to a single executemany call.
+        upsert (bool): Update existing tweets instead of ignoring them.
+
+    Returns:
+        Tuple[int, int]: Number of rows inserted (or updated when upserting) and number of rows ignored.
+    """
+    records = [row for row in _to_records(records) if row.get("tweet_id") is not None]
+    if not records:
+        return 0, 0
+    # Duplicates within the batch: the first one wins when ignoring, the last one when upserting
+    unique = {}
+    for row in records:
+        if upsert or row["tweet_id"] not in unique:
+            unique[row["tweet_id"]] = row
+    rows = list(unique.values())
+
+    try:
+        with get_connection(db_name) as conn:
             c = conn.cursor()
-            # Create the table if it doesn't exist (initial schema without danger_score)
-            c.execute('''CREATE TABLE IF NOT EXISTS narratives 
-                         (tweet_id TEXT PRIMARY KEY, text TEXT, user TEXT, date TEXT, sentiment REAL, 
-                          keywords TEXT, topic INTEGER, narrative_type TEXT, 
-                          followers INTEGER, retweets INTEGER, likes INTEGER)''')
-            # Check if 'danger_score' column exists
             c.execute("PRAGMA table_info(narratives)")
-            columns = [col[1] for col in c.fetchall()]
-            if 'danger_score' not in columns:
-                c.execute("ALTER TABLE narratives ADD COLUMN danger_score REAL DEFAULT 0.0")
-                logging.info("Added 'danger_score' column to narratives table.")
+            table_columns = [col[1] for col in c.fetchall()]
+            present = set(TWEET_DEFAULTS).union(*(row.keys() for row in rows))
+            columns = [col for col in table_columns if col in present]
+
+            column_list = ", ".join(f'"{col}"' for col in columns)
+            placeholders = ", ".join("?" for _ in columns)
+            if upsert:
+                updates = ", ".join(f'"{col}" = excluded."{col}"' for col in columns if col != "tweet_id")
+                sql = (f"INSERT INTO narratives ({column_list}) VALUES ({placeholders}) "
+                       f"ON CONFLICT(tweet_id) DO UPDATE SET {updates}")
+            else:
+                sql = f"INSERT OR IGNORE INTO narratives ({column_list}) VALUES ({placeholders})"
+
+            inserted = 0
+            for start in range(0, len(rows), chunk_size):
+                batch = rows[start:start + chunk_size]
+                # When upserting, the stored values also fill columns a row does not carry
+                existing = fetch_rollup_rows(conn, [row["tweet_id"] for row in batch], columns if upsert else ())
+                chunk = [
+                    {col: _prepare_value(row[col] if col in row
+                                         else existing.get(row["tweet_id"], {}).get(col, TWEET_DEFAULTS.get(col)))
+                     for col in columns}
+                    for row in batch
+                ]
+                c.executemany(sql, [tuple(row[col] for col in columns) for row in chunk])
+                inserted += c.rowcount
+                if upsert:
+                    # Columns missing from the batch keep their stored values
+                    update_rollups(conn, [{**existing.get(row["tweet_id"], {}), **row} for row in chunk],
+                                   existing.values())
+                else:
+                    update_rollups(conn, [row for row in chunk if row["tweet_id"] not in existing])
+            if inserted:
+                # Invalidates cached dashboard queries
+                bump_data_version(conn)
             conn.commit()
-            logging.info("Datenbank erfolgreich initialisiert.")
+        ignored = len(records) - inserted
+        logging.info(f"{inserted} Tweets eingefügt, {ignored} ignoriert.")
+        return inserted, ignored
     except Exception as e:
-        logging.error(f"Fehler beim Initialisieren der Datenbank: {e}")
+        logging.error(f"Fehler beim Einfügen der Tweets: {e}")
         raise
 
 def insert_tweet(tweet: Dict):
@@ -43,18 +149,8 @@ def insert_tweet(tweet: Dict):
         tweet (Dict): Dictionary containing tweet data.
     """
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            c = conn.cursor()
-            c.execute("""INSERT OR IGNORE INTO narratives 
-                         (tweet_id, text, user, date, sentiment, keywords, topic, narrative_type, 
-                          followers, retweets, likes, danger_score)
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", (
-                tweet["tweet_id"], tweet["text"], tweet["user"], str(tweet["date"]),
-                tweet.get("sentiment", 0.0), tweet["keywords"], tweet.get("topic", -1),
-                tweet.get("narrative_type", ""), tweet["followers"], tweet["retweets"],
-                tweet["likes"], tweet.get("danger_score", 0.0)))
-            conn.commit()
-            logging.info(f"Tweet {tweet['tweet_id']} erfolgreich eingefügt.")
+        insert_tweets([tweet])
+        logging.info(f"Tweet {tweet['tweet_id']} erfolgreich eingefügt.")
     except Exception as e:
         logging.error(f"Fehler beim Einfügen des Tweets: {e}")
 
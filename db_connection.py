@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from config import DB_NAME, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# One set of connections per thread: sqlite3 connections must not be shared across threads
+_local = threading.local()
+_wal_lock = threading.Lock()
+_wal_enabled = set()
+
+def _apply_pragmas(conn: sqlite3.Connection, read_only: bool):
+    """
+    Applies the performance pragmas shared by all connections.
+
+    Args:
+        conn (sqlite3.Connection): Freshly opened connection.
+        read_only (bool): Whether the connection is used by a reader only.
+    """
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    # In WAL mode NORMAL is durable across application crashes and avoids an fsync per commit
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+
+def _enable_wal(db_path: str):
+    """
+    Switches the database file to WAL journal mode once per process.
+
+    WAL lets readers work on a snapshot while the ingest writer appends, so dashboard
+    refreshes no longer fail with "database is locked".
+
+    Args:
+        db_path (str): Absolute path of the database file.
+    """
+    with _wal_lock:
+        if db_path in _wal_enabled:
+            return
+        conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        try:
+            mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            if mode.lower() != "wal":
+                logging.warning(f"WAL-Modus für {db_path} nicht verfügbar (journal_mode={mode}).")
+        finally:
+            conn.close()
+        _wal_enabled.add(db_path)
+
+def get_connection(db_name: str = DB_NAME, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Returns the pooled connection of the calling thread for the given database.
+
+    Connections are created lazily, configured once and reused for the lifetime of the
+    thread. They can be used as a context manager exactly like ``sqlite3.connect``:
+    the block commits on success and rolls back on error, but the connection stays open.
+
+    Args:
+        db_name (str): Path of the SQLite database.
+        read_only (bool): Open the database read-only (used by dashboard readers).
+
+    Returns:
+        sqlite3.Connection: The thread-local connection.
+    """
+    db_path = os.path.abspath(db_name)
+    pool = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+
+    key = (db_path, read_only)
+    conn = pool.get(key)
+    if conn is not None:
+        return conn
+
+    # The writer creates the file and enables WAL before any reader attaches
+    _enable_wal(db_path)
+    if read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    else:
+        conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    _apply_pragmas(conn, read_only)
+    pool[key] = conn
+    logging.debug(f"Neue SQLite-Verbindung für {db_path} (read_only={read_only}) im Thread "
+                  f"{threading.current_thread().name} geöffnet.")
+    return conn
+
+@contextmanager
+def read_connection(db_name: str = DB_NAME):
+    """
+    Context manager yielding the thread's read-only connection.
+
+    Args:
+        db_name (str): Path of the SQLite database.
+
+    Yields:
+        sqlite3.Connection: Read-only connection that never blocks the writer.
+    """
+    conn = get_connection(db_name, read_only=True)
+    try:
+        yield conn
+    finally:
+        # End the implicit read transaction so the next read sees fresh data
+        if conn.in_transaction:
+            conn.rollback()
+
+def close_connections():
+    """Closes all pooled connections of the calling thread."""
+    pool = getattr(_local, "connections", None)
+    if not pool:
+        return
+    for conn in pool.values():
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logging.error(f"Fehler beim Schließen der Datenbankverbindung: {e}")
+    pool.clear()
@@ -0,0 +1,251 @@
+import os
+import json
+import time
+import atexit
+import threading
+import logging
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from config import CHROMIUM_SESSION_FILE, CHROMIUM_POOL_SIZE, CHROMIUM_MAX_USES, CHROMIUM_MAX_MEMORY_MB
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+HOME_URL = "https://x.com/home"
+# Present on every page of a logged-in session
+LOGGED_IN_SELECTOR = "[data-testid='SideNav_AccountSwitcher_Button'], a[data-testid='AppTabBar_Home_Link']"
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created = time.monotonic()
+
+class DriverPool:
+    """
+    Pool of logged-in Chromium sessions reused across scrapes.
+
+    Cookies and local storage of the X session are persisted to a file, so a fresh browser
+    restores the login instead of going through the login form. Drivers are health-checked
+    before each lease and recycled after ``max_uses`` leases or when the page's JS heap
+    exceeds ``max_memory_mb``. Up to ``size`` sessions run in parallel; Selenium executes
+    the commands of one driver sequentially, so concurrent queries each get their own session.
+    """
+
+    def __init__(self, factory, login, session_file=CHROMIUM_SESSION_FILE, size=CHROMIUM_POOL_SIZE,
+                 max_uses=CHROMIUM_MAX_USES, max_memory_mb=CHROMIUM_MAX_MEMORY_MB):
+        """
+        Args:
+            factory (callable): Creates a new WebDriver.
+            login (callable): ``login(driver, log_fn)`` performing the form login.
+            session_file (str): File holding the persisted cookies and local storage.
+            size (int): Maximum number of sessions alive at the same time.
+            max_uses (int): Leases after which a driver is replaced.
+            max_memory_mb (int): JS heap size after which a driver is replaced (0 disables the check).
+        """
+        self.factory = factory
+        self.login = login
+        self.session_file = session_file
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory = max_memory_mb * 1024 * 1024
+        self._idle = []
+        self._alive = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._session_lock = threading.Lock()
+
+    def _save_session(self, driver):
+        """Persists cookies and local storage of the X session (readable by the owner only)."""
+        state = {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+        }
+        with self._session_lock:
+            tmp_file = self.session_file + ".tmp"
+            with open(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self.session_file)
+
+    def _restore_session(self, driver):
+        """Loads the persisted session into a fresh driver; returns whether it is logged in."""
+        if not os.path.exists(self.session_file):
+            return False
+        try:
+            with self._session_lock:
+                with open(self.session_file) as f:
+                    state = json.load(f)
+        except (OSError, ValueError) as e:
+            # Truncated or corrupt file: log in through the form, which rewrites it
+            logging.warning(f"Chromium session file {self.session_file} could not be read: {e}")
+            return False
+        # Cookies and local storage can only be set on a page of the same origin
+        driver.get("https://x.com/robots.txt")
+        for cookie in state.get("cookies", []):
+            if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                cookie.pop("sameSite", None)
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logging.warning(f"Cookie {cookie.get('name')} could not be restored: {e}")
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) { window.localStorage.setItem(key, value); }",
+            state.get("local_storage", {})
+        )
+        return self._is_logged_in(driver)
+
+    @staticmethod
+    def _is_logged_in(driver, timeout=10):
+        driver.get(HOME_URL)
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR) or "login" in d.current_url
+            )
+        except Exception:
+            return False
+        return "login" not in driver.current_url and bool(driver.find_elements(By.CSS_SELECTOR, LOGGED_IN_SELECTOR))
+
+    def _create(self, log_fn=None):
+        driver = self.factory()
+        try:
+            if self._restore_session(driver):
+                logging.info("Chromium session restored from saved cookies.")
+                if log_fn:
+                    log_fn("Session restored, login skipped.")
+            else:
+                self.login(driver, log_fn)
+                self._save_session(driver)
+            return _PooledDriver(driver)
+        except Exception:
+            driver.quit()
+            raise
+
+    @staticmethod
+    def _healthy(pooled):
+        try:
+            return pooled.driver.execute_script("return 1;") == 1 and bool(pooled.driver.window_handles)
+        except Exception:
+            return False
+
+    def _memory(self, pooled):
+        try:
+            return pooled.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : 0;") or 0
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _quit(pooled, reason):
+        logging.info(f"Chromium driver recycled ({reason}) after {pooled.uses} uses.")
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _discard(self, pooled, reason):
+        """Quits a driver and frees its slot in the pool."""
+        self._quit(pooled, reason)
+        with self._condition:
+            self._alive -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def driver(self, log_fn=None):
+        """
+        Leases a logged-in driver; it returns to the pool when the block ends.
+
+        Args:
+            log_fn (callable, optional): Receives progress messages for the UI.
+
+        Yields:
+            selenium.webdriver.Chrome: The leased driver.
+        """
+        pooled = None
+        with self._condition:
+            while not self._idle and self._alive >= self.size:
+                self._condition.wait()
+            if self._idle:
+                pooled = self._idle.pop()
+            else:
+                self._alive += 1
+        if pooled is not None and not self._healthy(pooled):
+            # The replacement takes over the slot
+            self._quit(pooled, "health check failed")
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = self._create(log_fn)
+            except Exception:
+                with self._condition:
+                    self._alive -= 1
+                    self._condition.notify()
+                raise
+
+        try:
+            yield pooled.driver
+        finally:
+            pooled.uses += 1
+            self._release(pooled)
+
+    def _release(self, pooled):
+        if not self._healthy(pooled):
+            self._discard(pooled, "health check failed")
+            return
+        try:
+            # Keep the persisted session fresh (X rotates tokens)
+            self._save_session(pooled.driver)
+        except Exception as e:
+            logging.warning(f"Chromium session could not be saved: {e}")
+        memory = self._memory(pooled)
+        if pooled.uses >= self.max_uses:
+            self._discard(pooled, "use limit")
+        elif self.max_memory and memory > self.max_memory:
+            self._discard(pooled, f"memory {memory / 1024 ** 2:.0f} MB")
+        else:
+            with self._condition:
+                if not self._closed:
+                    self._idle.append(pooled)
+                    self._condition.notify()
+                    return
+            # Returned after close(), e.g. by a scrape still running at interpreter exit
+            self._discard(pooled, "pool closed")
+
+    def close(self):
+        """Quits all idle drivers (leased drivers are quit when returned)."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled, "pool closed")
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(factory, login, key=None):
+    """
+    Returns the process-wide pool for a driver configuration.
+
+    Args:
+        factory (callable): Creates a new WebDriver.
+        login (callable): Performs the form login.
+        key: Identifies the configuration (e.g. headless or not); defaults to the factory.
+
+    Returns:
+        DriverPool: The shared pool; all pools are closed at interpreter exit.
+    """
+    with _pools_lock:
+        key = key if key is not None else factory
+        if key not in _pools:
+            _pools[key] = DriverPool(factory, login)
+        return _pools[key]
+
+@atexit.register
+def _close_pools():
+    for pool in list(_pools.values()):
+        pool.close()
@@ -0,0 +1,223 @@
+import os
+import re
+import hashlib
+import threading
+import logging
+import numpy as np
+from filelock import FileLock
+from db_connection import get_connection
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def content_hash(text):
+    """Returns the hash under which the embedding of a text is stored."""
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()
+
+class EmbeddingStore:
+    """
+    Append-only on-disk store of sentence embeddings.
+
+    Vectors live in a raw, memory-mapped matrix file; a small SQLite index maps content
+    hashes to matrix rows and tweet IDs to content hashes. Texts that were embedded once
+    (in any earlier run) are never sent through the model again.
+    """
+
+    def __init__(self, embedding_model, model_name, store_dir=os.path.join('models', 'embeddings'),
+                 dtype='float16', batch_size=64):
+        """
+        Initialize the store for one embedding model.
+
+        Args:
+            embedding_model: Object with an ``encode(texts, batch_size=...)`` method (SentenceTransformer).
+            model_name (str): Model identity; each model gets its own store directory.
+            store_dir (str): Base directory for all embedding stores.
+            dtype (str): On-disk precision, 'float16' (half the size) or 'float32'.
+            batch_size (int): Batch size passed to the model for missing texts.
+        """
+        self.embedding_model = embedding_model
+        self.dtype = np.dtype(dtype)
+        self.batch_size = batch_size
+        self.store_dir = os.path.join(store_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.matrix_file = os.path.join(self.store_dir, f'embeddings.{self.dtype.name}')
+        self.index_file = os.path.join(self.store_dir, 'index.sqlite')
+        self.lock_file = os.path.join(self.store_dir, 'store.lock')
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._mmap_inode = None
+        self.dim = None
+        self.rows = 0
+        self.hits = 0
+        self.misses = 0
+        self._init_index()
+
+    def _conn(self):
+        return get_connection(self.index_file)
+
+    def _init_index(self):
+        """Creates the index tables and restores the matrix shape."""
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings (content_hash TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS embedding_ids (tweet_id TEXT PRIMARY KEY, content_hash TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+            self.dim = int(row[0]) if row else None
+            self.rows = self._committed_rows(conn)
+
+    def _committed_rows(self, conn):
+        return conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM embeddings").fetchone()[0]
+
+    def _matrix(self):
+        """Returns a read-only memory map over all committed rows."""
+        # A compaction in another process replaces the file, so the inode is part of the check
+        inode = os.stat(self.matrix_file).st_ino
+        if self._mmap is None or self._mmap.shape[0] != self.rows or self._mmap_inode != inode:
+            self._mmap = np.memmap(self.matrix_file, dtype=self.dtype, mode='r', shape=(self.rows, self.dim))
+            self._mmap_inode = inode
+        return self._mmap
+
+    def _append(self, vectors):
+        """
+        Appends vectors to the matrix file.
+
+        Args:
+            vectors (np.ndarray): Array of shape (n, dim).
+
+        Returns:
+            int: Row number of the first appended vector.
+        """
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+        first_row = self.rows
+        with open(self.matrix_file, 'ab') as f:
+            # Drop bytes of an append that crashed before its index rows were committed
+            f.truncate(first_row * self.dim * self.dtype.itemsize)
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        return first_row
+
+    def _lookup(self, conn, hashes):
+        """Returns content_hash -> row for the given hashes that are in the store."""
+        known = {}
+        for start in range(0, len(hashes), 900):
+            chunk = hashes[start:start + 900]
+            placeholders = ", ".join("?" for _ in chunk)
+            known.update(conn.execute(
+                f"SELECT content_hash, row FROM embeddings WHERE content_hash IN ({placeholders})", chunk
+            ).fetchall())
+        return known
+
+    def embed(self, texts, tweet_ids=None):
+        """
+        Returns embeddings for texts, encoding only those not yet in the store.
+
+        Args:
+            texts (list): Texts to embed.
+            tweet_ids (list, optional): Tweet IDs belonging to the texts, kept for compaction.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dim).
+        """
+        texts = [str(text) for text in texts]
+        hashes = [content_hash(text) for text in texts]
+        with self._lock:
+            conn = self._conn()
+            unique_hashes = list(dict.fromkeys(hashes))
+            # Only decides what to encode; rows are looked up again under the file lock below
+            known = self._lookup(conn, unique_hashes)
+            missing = {h: text for h, text in zip(hashes, texts) if h not in known}
+            # Duplicates within the batch are encoded once and count as hits
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+            vectors = None
+            if missing:
+                vectors = np.asarray(self.embedding_model.encode(list(missing.values()), batch_size=self.batch_size))
+
+            # Other processes (e.g. the scheduled retraining) append to and compact the same store;
+            # a compaction renumbers rows, so the lookup and the matrix read must not straddle one
+            with FileLock(self.lock_file):
+                known = self._lookup(conn, unique_hashes)
+                if vectors is not None:
+                    # Texts another process added in the meantime are not appended twice
+                    new = [i for i, h in enumerate(missing) if h not in known]
+                    if new:
+                        self.rows = self._committed_rows(conn)
+                        first_row = self._append(vectors[new])
+                        missing_hashes = list(missing)
+                        new_rows = {missing_hashes[i]: first_row + n for n, i in enumerate(new)}
+                        with conn:
+                            conn.executemany("INSERT OR IGNORE INTO embeddings (content_hash, row) VALUES (?, ?)",
+                                             new_rows.items())
+                        known.update(new_rows)
+                if tweet_ids is not None:
+                    with conn:
+                        conn.executemany("INSERT OR REPLACE INTO embedding_ids (tweet_id, content_hash) VALUES (?, ?)",
+                                         [(str(tweet_id), h) for tweet_id, h in zip(tweet_ids, hashes)])
+                if not texts:
+                    return np.zeros((0, self.dim or 0), dtype=np.float32)
+                self.rows = self._committed_rows(conn)
+                matrix = self._matrix()
+                return np.asarray(matrix[[known[h] for h in hashes]], dtype=np.float32)
+
+    def compact(self, keep_tweet_ids):
+        """
+        Rewrites the store keeping only embeddings referenced by the given tweets.
+
+        Args:
+            keep_tweet_ids (Iterable): Tweet IDs whose embeddings should survive.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        with self._lock, FileLock(self.lock_file):
+            conn = self._conn()
+            self.rows = self._committed_rows(conn)
+            keep = set(str(tweet_id) for tweet_id in keep_tweet_ids)
+            id_rows = conn.execute("SELECT tweet_id, content_hash FROM embedding_ids").fetchall()
+            keep_ids = [(tweet_id, h) for tweet_id, h in id_rows if tweet_id in keep]
+            keep_hashes = sorted({h for _, h in keep_ids})
+            old_rows = dict(conn.execute("SELECT content_hash, row FROM embeddings").fetchall())
+            keep_hashes = [h for h in keep_hashes if h in old_rows]
+            removed = self.rows - len(keep_hashes)
+            if removed <= 0:
+                return 0
+
+            tmp_file = self.matrix_file + '.tmp'
+            matrix = self._matrix()
+            with open(tmp_file, 'wb') as f:
+                for start in range(0, len(keep_hashes), 10000):
+                    chunk = keep_hashes[start:start + 10000]
+                    f.write(np.ascontiguousarray(matrix[[old_rows[h] for h in chunk]]).tobytes())
+            self._mmap = None
+            with conn:
+                conn.execute("DELETE FROM embeddings")
+                conn.executemany("INSERT INTO embeddings (content_hash, row) VALUES (?, ?)",
+                                 [(h, i) for i, h in enumerate(keep_hashes)])
+                conn.execute("DELETE FROM embedding_ids")
+                conn.executemany("INSERT INTO embedding_ids (tweet_id, content_hash) VALUES (?, ?)", keep_ids)
+                os.replace(tmp_file, self.matrix_file)
+            self.rows = len(keep_hashes)
+            logging.info(f"Embedding store compacted: {removed} rows removed, {self.rows} kept.")
+            return removed
+
+    def stats(self):
+        """
+        Returns cache statistics of this process.
+
+        Returns:
+            dict: Stored rows, hits, misses and hit rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "rows": self.rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -9,7 +9,6 @@ import tempfile
 import logging
 
 # Assuming these are part of your project; adjust imports if paths differ
-from narrative_analyzer import NarrativeAnalyzer
 from lexicon import NarrativeLexicon
 
 # Configure logging
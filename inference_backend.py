@@ -0,0 +1,239 @@
+import os
+import re
+import shutil
+import platform
+import logging
+from filelock import FileLock
+from config import INFERENCE_BACKEND, INFERENCE_THREADS, INFERENCE_QUANTIZE, ONNX_MODEL_DIR
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def resolve_device(device=None):
+    """
+    Picks the inference device.
+
+    Args:
+        device (int, optional): Explicit device index (-1 for CPU); None auto-detects.
+
+    Returns:
+        int: 0 if CUDA is available (or requested), otherwise -1.
+    """
+    if device is not None:
+        return device
+    try:
+        import torch
+        return 0 if torch.cuda.is_available() else -1
+    except ImportError:
+        return -1
+
+def resolve_backend(backend=None, device=-1):
+    """
+    Picks the inference backend.
+
+    Args:
+        backend (str, optional): 'torch', 'onnx' or 'auto'; None uses INFERENCE_BACKEND.
+        device (int): Resolved device index.
+
+    Returns:
+        str: 'onnx' for CPU inference in auto mode, otherwise 'torch'.
+    """
+    backend = (backend or INFERENCE_BACKEND).lower()
+    if backend == "auto":
+        return "onnx" if device == -1 else "torch"
+    if backend not in ("torch", "onnx"):
+        raise ValueError(f"Unknown inference backend: {backend}")
+    return backend
+
+# Thread default of this process; worker processes lower it (see set_default_threads)
+_default_threads = INFERENCE_THREADS
+
+def set_default_threads(threads):
+    """
+    Sets the intra-op threads used by models loaded afterwards in this process.
+
+    Args:
+        threads (int): Number of threads (0 keeps the library default).
+    """
+    global _default_threads
+    _default_threads = threads
+    configure_threads(threads)
+
+def configure_threads(threads=None):
+    """
+    Limits the intra-op threads of PyTorch (0 keeps the library default).
+
+    Args:
+        threads (int, optional): Number of threads; None uses the process default.
+    """
+    threads = _default_threads if threads is None else threads
+    if threads <= 0:
+        return
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def _quantization_config():
+    """Chooses the dynamic int8 quantization preset for the current CPU."""
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    flags = ""
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    if "avx512_vnni" in flags:
+        return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    if "avx512" in flags:
+        return AutoQuantizationConfig.avx512(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+def _fresh_dir(path):
+    # Leftovers of an export that crashed half-way
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+def _move_into_place(tmp_dir, final_dir):
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+
+def export_onnx(model_name, quantize=INFERENCE_QUANTIZE, model_dir=ONNX_MODEL_DIR):
+    """
+    Exports a sequence-classification model to ONNX (once) and optionally quantizes it.
+
+    Safe to call from several processes at once (e.g. freshly spawned analysis workers): one
+    exports while the others wait on a file lock, and results are written to a temporary
+    directory that is renamed into place, so no caller ever loads a half-written model.
+
+    Args:
+        model_name (str): Hugging Face model name.
+        quantize (bool): Apply dynamic int8 quantization.
+        model_dir (str): Base directory for exported models.
+
+    Returns:
+        str: Directory containing the exported model and its tokenizer.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from transformers import AutoTokenizer
+
+    export_dir = os.path.join(model_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+    target_dir = export_dir + "-int8" if quantize else export_dir
+    if os.path.exists(os.path.join(target_dir, "config.json")):
+        return target_dir
+
+    os.makedirs(model_dir, exist_ok=True)
+    with FileLock(export_dir + ".lock"):
+        # Another process may have finished the export while this one waited
+        if os.path.exists(os.path.join(target_dir, "config.json")):
+            return target_dir
+        if not os.path.exists(os.path.join(export_dir, "config.json")):
+            logging.info(f"Exporting {model_name} to ONNX...")
+            tmp_dir = _fresh_dir(export_dir + ".tmp")
+            model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            model.save_pretrained(tmp_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(tmp_dir)
+            _move_into_place(tmp_dir, export_dir)
+        if quantize:
+            logging.info(f"Quantizing {model_name} to int8...")
+            tmp_dir = _fresh_dir(target_dir + ".tmp")
+            quantizer = ORTQuantizer.from_pretrained(export_dir)
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=_quantization_config())
+            AutoTokenizer.from_pretrained(export_dir).save_pretrained(tmp_dir)
+            _move_into_place(tmp_dir, target_dir)
+    return target_dir
+
+def load_pipeline(task, model_name, device=None, backend=None, threads=None):
+    """
+    Builds a Hugging Face pipeline on the selected backend.
+
+    Args:
+        task (str): Pipeline task, e.g. 'sentiment-analysis' or 'zero-shot-classification'.
+        model_name (str): Hugging Face model name.
+        device (int, optional): Device index; None auto-detects.
+        backend (str, optional): 'torch', 'onnx' or 'auto'; None uses INFERENCE_BACKEND.
+        threads (int, optional): Intra-op threads (0 keeps the library default); None uses the process default.
+
+    Returns:
+        transformers.Pipeline: The ready-to-use pipeline.
+    """
+    from transformers import pipeline
+    device = resolve_device(device)
+    backend = resolve_backend(backend, device)
+    threads = _default_threads if threads is None else threads
+    configure_threads(threads)
+    if backend == "torch":
+        return pipeline(task, model=model_name, device=device)
+
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+    onnx_dir = export_onnx(model_name)
+    session_options = onnxruntime.SessionOptions()
+    if threads > 0:
+        session_options.intra_op_num_threads = threads
+    file_name = next(name for name in os.listdir(onnx_dir) if name.endswith(".onnx"))
+    model = ORTModelForSequenceClassification.from_pretrained(
+        onnx_dir, file_name=file_name, session_options=session_options, provider="CPUExecutionProvider"
+    )
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(onnx_dir))
+
+def _scores(result):
+    """Flattens a pipeline result into a {label: score} dict."""
+    if isinstance(result, list):
+        result = result[0]
+    if "labels" in result:
+        return dict(zip(result["labels"], result["scores"]))
+    return {result["label"]: result["score"]}
+
+def parity_check(task, model_name, texts, tolerance=0.05, **kwargs):
+    """
+    Compares the ONNX backend against the FP32 PyTorch pipeline on CPU.
+
+    Args:
+        task (str): Pipeline task.
+        model_name (str): Hugging Face model name.
+        texts (list): Sample texts.
+        tolerance (float): Maximum allowed absolute score difference.
+        **kwargs: Extra pipeline arguments (e.g. candidate_labels for zero-shot).
+
+    Returns:
+        dict: Maximum difference, label agreement and whether the check passed.
+    """
+    reference = load_pipeline(task, model_name, device=-1, backend="torch")
+    candidate = load_pipeline(task, model_name, device=-1, backend="onnx")
+    max_diff = 0.0
+    agree = 0
+    for text in texts:
+        expected = _scores(reference(text, **kwargs))
+        actual = _scores(candidate(text, **kwargs))
+        agree += max(expected, key=expected.get) == max(actual, key=actual.get)
+        for label, score in expected.items():
+            # Labels missing from the candidate output count as score 0
+            max_diff = max(max_diff, abs(score - actual.get(label, 0.0)))
+    report = {
+        "max_abs_diff": max_diff,
+        "label_agreement": agree / len(texts) if texts else 1.0,
+        "passed": max_diff <= tolerance,
+    }
+    logging.info(f"Parity check {model_name} ({task}): {report}")
+    return report
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Check ONNX/int8 scores against the FP32 PyTorch model.")
+    parser.add_argument("task")
+    parser.add_argument("model_name")
+    parser.add_argument("texts", nargs="+")
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    parser.add_argument("--labels", help="Comma-separated candidate labels for zero-shot-classification")
+    args = parser.parse_args()
+    extra = {"candidate_labels": args.labels.split(",")} if args.labels else {}
+    print(parity_check(args.task, args.model_name, args.texts, args.tolerance, **extra))
@@ -0,0 +1,156 @@
+import json
+import hashlib
+import threading
+import unicodedata
+import logging
+from collections import OrderedDict
+from config import INFERENCE_CACHE_DB
+from db_connection import get_connection
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def normalize_text(text):
+    """Normalizes unicode and whitespace so reposts with cosmetic differences share one entry."""
+    return unicodedata.normalize("NFC", " ".join(str(text).split()))
+
+def text_hash(text):
+    """Returns the cache key of a text."""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+def pipeline_identity(pipe, fallback_name):
+    """
+    Derives the model name and version of a Hugging Face pipeline.
+
+    Args:
+        pipe: transformers pipeline.
+        fallback_name (str): Name used if the pipeline does not expose one.
+
+    Returns:
+        tuple: (model_name, model_version). The version is the Hub commit hash if known.
+    """
+    config = getattr(getattr(pipe, "model", None), "config", None)
+    name = getattr(config, "_name_or_path", None) or fallback_name
+    version = getattr(config, "_commit_hash", None) or getattr(config, "transformers_version", None) or "unknown"
+    return name, str(version)
+
+class InferenceCache:
+    """
+    Memoizes per-text model outputs: an in-process LRU in front of a SQLite table.
+
+    Entries are keyed by (model name, normalized-text hash) and tagged with the model
+    version; entries of any other version are purged when the cache is opened.
+    """
+
+    def __init__(self, model_name, model_version, db_name=INFERENCE_CACHE_DB, max_entries=50000):
+        """
+        Args:
+            model_name (str): Model identity, including task-specific options such as candidate labels.
+            model_version (str): Version of the model weights; a change invalidates all entries.
+            db_name (str): SQLite file holding the persistent cache.
+            max_entries (int): Size of the in-process LRU.
+        """
+        self.model_name = model_name
+        self.model_version = model_version
+        self.db_name = db_name
+        self.max_entries = max_entries
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with get_connection(db_name) as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS inference_cache
+                            (model_name TEXT, text_hash TEXT, model_version TEXT, result TEXT,
+                             PRIMARY KEY (model_name, text_hash))''')
+            deleted = conn.execute("DELETE FROM inference_cache WHERE model_name = ? AND model_version != ?",
+                                   (model_name, model_version)).rowcount
+        if deleted:
+            logging.info(f"Inference cache for {model_name}: {deleted} entries of older model versions removed.")
+
+    def map(self, texts, infer_fn):
+        """
+        Returns one result per text, running ``infer_fn`` only on texts never seen before.
+
+        Args:
+            texts (list): Input texts.
+            infer_fn (callable): Takes a list of texts and returns a list of JSON-serializable results.
+
+        Returns:
+            list: Results in the order of ``texts``.
+        """
+        texts = list(texts)
+        hashes = [text_hash(text) for text in texts]
+        results = {}
+        with self._lock:
+            for h in hashes:
+                if h in self._lru:
+                    self._lru.move_to_end(h)
+                    results[h] = self._lru[h]
+
+        lookup = list(dict.fromkeys(h for h in hashes if h not in results))
+        conn = get_connection(self.db_name)
+        for start in range(0, len(lookup), 900):
+            chunk = lookup[start:start + 900]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT text_hash, result FROM inference_cache WHERE model_name = ? AND text_hash IN ({placeholders})",
+                [self.model_name, *chunk]
+            ).fetchall()
+            results.update((h, json.loads(result)) for h, result in rows)
+
+        # Duplicates inside the batch are inferred only once
+        missing = {h: text for h, text in zip(hashes, texts) if h not in results}
+        if missing:
+            computed = list(infer_fn(list(missing.values())))
+            new_results = dict(zip(missing, computed))
+            results.update(new_results)
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO inference_cache (model_name, text_hash, model_version, result) VALUES (?, ?, ?, ?)",
+                    [(self.model_name, h, self.model_version, json.dumps(result)) for h, result in new_results.items()]
+                )
+
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+            for h in hashes:
+                self._lru[h] = results[h]
+                self._lru.move_to_end(h)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+        return [results[h] for h in hashes]
+
+    def stats(self):
+        """
+        Returns hit/miss counters of this process.
+
+        Returns:
+            dict: Hits, misses and hit rate.
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_inference_cache(model_name, model_version):
+    """
+    Returns the process-wide cache of a model, shared by every component using it.
+
+    Args:
+        model_name (str): Model identity.
+        model_version (str): Version of the model weights.
+
+    Returns:
+        InferenceCache: The shared cache instance.
+    """
+    with _caches_lock:
+        cache = _caches.get(model_name)
+        if cache is None or cache.model_version != model_version:
+            cache = _caches[model_name] = InferenceCache(model_name, model_version)
+        return cache
@@ -0,0 +1,167 @@
+import time
+import asyncio
+import threading
+import logging
+import pandas as pd
+from lazy_loader import registry
+from db import insert_tweets
+from pipeline import Pipeline
+from scrape_cursors import get_cursor, update_cursor, filter_new, normalize_query
+from config import NARRATIVE_CLASSIFIER, PIPELINE_QUEUE_SIZE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+SCRAPING_METHODS = ("API", "Chromium", "twscrape")
+
+# Tweet IDs of monitoring jobs that are scraped but not stored yet, per (method, query). While job N
+# is analyzed the next job is already scraping; its cursor and the narratives table do not know
+# job N's tweets yet, so they are filtered against this set instead.
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def _claim_new(job, scraped, since_id):
+    """Filters scraped tweets to those neither stored nor in flight and marks them as in flight."""
+    key = (job["method"], normalize_query(job["keywords"]))
+    # Held across the database check, so a job storing its tweets cannot slip in between
+    with _in_flight_lock:
+        in_flight = _in_flight.setdefault(key, set())
+        data = [tweet for tweet in filter_new(scraped, since_id) if str(tweet.get("tweet_id")) not in in_flight]
+        if not data and not in_flight:
+            # Everything scraped is already stored, so the mark can move past it
+            update_cursor(job["method"], job["keywords"], scraped)
+        claimed = {str(tweet.get("tweet_id")) for tweet in data}
+        in_flight.update(claimed)
+    job["claimed"] = (key, claimed)
+    return data
+
+def release_job(job):
+    """Removes a job's tweets from the in-flight set once they are stored or the job failed."""
+    key, claimed = job.pop("claimed", (None, None))
+    if key is not None:
+        with _in_flight_lock:
+            _in_flight.get(key, set()).difference_update(claimed)
+
+def new_job(keywords, limit, tweet_type="latest", method="API", classifier_mode=NARRATIVE_CLASSIFIER, monitor=False):
+    """
+    Describes one scrape -> analyze -> store run.
+
+    Args:
+        keywords (list): Search terms.
+        limit (int): Maximum number of tweets to scrape.
+        tweet_type (str): 'latest' or 'popular'.
+        method (str): Scraping method ('API', 'Chromium', 'twscrape').
+        classifier_mode (str): Narrative classifier ('zero-shot' or 'prototype').
+        monitor (bool): Resume from the query's cursor and keep only tweets not stored yet.
+
+    Returns:
+        dict: The job; the stages add 'data', 'df', 'topic_model' and 'latency'.
+    """
+    return {
+        "keywords": list(keywords),
+        "limit": limit,
+        "tweet_type": tweet_type,
+        "method": method,
+        "classifier_mode": classifier_mode,
+        "monitor": monitor,
+        "submitted": time.monotonic(),
+    }
+
+def scrape_job(job, log_fn=None):
+    """
+    Scrapes the tweets of a job.
+
+    Returns:
+        dict: The job with 'data', or None if nothing (new) was found.
+    """
+    keywords, limit, tweet_type, method = job["keywords"], job["limit"], job["tweet_type"], job["method"]
+    # Live monitoring resumes from the newest tweet seen for this method and query
+    since_id = get_cursor(method, keywords)[0] if job["monitor"] else None
+
+    # Select scraping method
+    if method == "API":
+        data = registry.get("twitter_client").scrape_x_data(keywords, limit=limit, tweet_type=tweet_type, since_id=since_id)
+    elif method == "Chromium":
+        data = registry.get("chromium_scraper")(keywords, limit=limit, tweet_type=tweet_type, log_fn=log_fn, since_id=since_id)
+    elif method == "twscrape":
+        data = asyncio.run(registry.get("twscrape_scraper")(keywords, limit=limit, tweet_type=tweet_type, since_id=since_id))
+    else:
+        raise ValueError(f"Invalid scraping method: {method}")
+
+    if job["monitor"]:
+        data = _claim_new(job, data or [], since_id)
+    if not data:
+        return None
+    job["data"] = data
+    return job
+
+def analyze_job(job, analyzer, log_fn=None):
+    """
+    Runs the narrative analysis on the scraped tweets of a job.
+
+    Returns:
+        dict: The job with 'df' and 'topic_model' (None while no topic model exists yet),
+            or None if the analysis failed.
+    """
+    df = pd.DataFrame(job["data"])
+    df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce')
+    try:
+        job["df"], job["topic_model"] = analyzer.process_narratives(df, classifier_mode=job["classifier_mode"])
+    except Exception:
+        release_job(job)
+        raise
+    # The danger score is the last step; without it the analysis failed part-way
+    if 'danger_score' not in job["df"]:
+        if log_fn:
+            log_fn("⚠ Analysis failed. Check data or models.")
+        # The tweets are neither stored nor behind the cursor, so the next job may pick them up again
+        release_job(job)
+        return None
+    if job["topic_model"] is None and log_fn:
+        # Stored with topic -1, so the scheduled retraining has data for the first model
+        log_fn("⚠ No topic model yet, tweets are stored without topics.")
+    return job
+
+def store_job(job, analyzer, log_fn=None):
+    """
+    Checks a job's results for new narratives, stores them and advances the cursor.
+
+    Returns:
+        dict: The job with 'inserted', 'ignored' and 'latency' (seconds since submission).
+    """
+    try:
+        unseen_topics = analyzer.detect_new_narratives(job["df"], job["topic_model"])
+        if unseen_topics and log_fn:
+            log_fn(f"⚠ New narratives detected: {list(unseen_topics)}")
+        job["inserted"], job["ignored"] = insert_tweets(job["df"])
+        if job["monitor"]:
+            update_cursor(job["method"], job["keywords"], job["data"])
+    finally:
+        release_job(job)
+    job["latency"] = time.monotonic() - job["submitted"]
+    return job
+
+def build_pipeline(name, get_analyzer, log_fn=None, on_result=None, maxsize=PIPELINE_QUEUE_SIZE):
+    """
+    Creates and starts the scrape -> analyze -> store pipeline.
+
+    Args:
+        name (str): Pipeline name for logs.
+        get_analyzer (callable): Returns the NarrativeAnalyzer; called on first use, so models load lazily.
+        log_fn (callable, optional): Receives progress messages.
+        on_result (callable, optional): Receives each stored job.
+        maxsize (int): Capacity of the queues between the stages.
+
+    Returns:
+        Pipeline: The running pipeline.
+    """
+    return (Pipeline(name, on_result=on_result)
+            .add_stage("scrape", lambda job: scrape_job(job, log_fn), maxsize=maxsize)
+            .add_stage("analyze", lambda job: analyze_job(job, get_analyzer(), log_fn), maxsize=maxsize)
+            .add_stage("store", lambda job: store_job(job, get_analyzer(), log_fn), maxsize=maxsize)
+            .start())
@@ -0,0 +1,155 @@
+import os
+import re
+import threading
+import logging
+from collections import OrderedDict
+from config import CONFIG_FILE, load_config
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher for a fixed list of keywords, hashtags or phrases.
+
+    All terms are compiled once into a single alternation with word-boundary semantics:
+    a term only matches if it is not preceded or followed by a word character, which also
+    works for terms starting with '#'. Longer terms are tried first, so overlapping terms
+    ('EU funding' vs. 'EU') resolve to the longest one.
+    """
+
+    def __init__(self, terms):
+        """
+        Args:
+            terms (Iterable): Terms to match; duplicates (ignoring case) are dropped.
+        """
+        self.terms = list(dict.fromkeys(term for term in terms if term))
+        self._canonical = {}
+        for term in self.terms:
+            self._canonical.setdefault(term.lower(), term)
+        self._order = {term: i for i, term in enumerate(self.terms)}
+        if self._canonical:
+            alternation = "|".join(re.escape(term) for term in sorted(self._canonical, key=len, reverse=True))
+            self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+        else:
+            self._pattern = None
+
+    def find(self, text):
+        """
+        Returns the distinct terms occurring in a text and the total number of occurrences.
+
+        Args:
+            text (str): Text to search.
+
+        Returns:
+            tuple: (list of matched terms in the order of ``terms``, occurrence count).
+        """
+        if self._pattern is None or not text:
+            return [], 0
+        found = [self._canonical[match.lower()] for match in self._pattern.findall(text)]
+        return sorted(set(found), key=self._order.get), len(found)
+
+    def match_batch(self, texts):
+        """
+        Matches many texts at once.
+
+        Args:
+            texts (Iterable): Texts to search; non-strings count as empty.
+
+        Returns:
+            tuple: (list of matched-term lists, list of occurrence counts), one entry per text.
+        """
+        matches, counts = [], []
+        for text in texts:
+            terms, count = self.find(text if isinstance(text, str) else "")
+            matches.append(terms)
+            counts.append(count)
+        return matches, counts
+
+    def annotate(self, tweets, text_key="text", field="keywords"):
+        """
+        Stores the comma-separated matched terms of each tweet dict in ``field``.
+
+        Args:
+            tweets (list): Tweet dicts as produced by the scrapers.
+            text_key (str): Key holding the tweet text.
+            field (str): Key receiving the matches.
+
+        Returns:
+            list: The same tweet dicts.
+        """
+        matches, _ = self.match_batch(tweet.get(text_key) for tweet in tweets)
+        for tweet, terms in zip(tweets, matches):
+            tweet[field] = ",".join(terms)
+        return tweets
+
+_matchers = OrderedDict()
+_lock = threading.Lock()
+_MAX_MATCHERS = 32
+
+def get_matcher(terms):
+    """
+    Returns a compiled matcher for a term list; matchers are cached per list.
+
+    Args:
+        terms (Iterable): Keywords, hashtags or phrases.
+
+    Returns:
+        KeywordMatcher: The shared matcher.
+    """
+    key = tuple(terms)
+    with _lock:
+        matcher = _matchers.get(key)
+        if matcher is None:
+            matcher = _matchers[key] = KeywordMatcher(key)
+            while len(_matchers) > _MAX_MATCHERS:
+                _matchers.popitem(last=False)
+        else:
+            _matchers.move_to_end(key)
+        return matcher
+
+_config_state = {"mtime": None, "config": None}
+
+def get_config_matcher(section="keywords"):
+    """
+    Returns the matcher for a term list from config.json, rebuilt when the file changes.
+
+    Args:
+        section (str): 'keywords', 'hashtags' or 'all' for both.
+
+    Returns:
+        KeywordMatcher: Matcher for the current configuration.
+    """
+    mtime = os.path.getmtime(CONFIG_FILE) if os.path.exists(CONFIG_FILE) else None
+    with _lock:
+        if _config_state["config"] is None or mtime != _config_state["mtime"]:
+            if _config_state["config"] is not None:
+                logging.info("Konfiguration geändert, Keyword-Matcher werden neu aufgebaut.")
+            _config_state["config"] = load_config()
+            _config_state["mtime"] = mtime
+        config = _config_state["config"]
+    if section == "all":
+        return get_matcher(config.get("keywords", []) + config.get("hashtags", []))
+    return get_matcher(config.get(section, []))
+
+def get_query_matcher(keywords=()):
+    """
+    Returns the matcher used to tag scraped tweets: the query's terms plus all keywords and
+    hashtags of config.json, picking up changes to the file without a restart.
+
+    Args:
+        keywords (Iterable): Terms of the current query.
+
+    Returns:
+        KeywordMatcher: The shared matcher.
+    """
+    return get_matcher(list(keywords) + get_config_matcher("all").terms)
+
+def config_keywords():
+    """Returns the keywords of the current config.json (the default query)."""
+    return list(get_config_matcher("keywords").terms)
@@ -0,0 +1,160 @@
+import threading
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Process start, used as reference for the startup report
+_PROCESS_START = time.perf_counter()
+
+class LazyRegistry:
+    """
+    Registry of expensive components (models, scrapers, API clients, dashboards) that are
+    only imported and constructed on first use.
+
+    Factories should import their heavy dependencies themselves so that merely importing
+    a module that uses the registry stays cheap.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._locks = {}
+        self._timings = {}
+        self._lock = threading.Lock()
+        self._events = []
+
+    def register(self, name, factory):
+        """
+        Register a factory for a component.
+
+        Args:
+            name (str): Component name.
+            factory (callable): Zero-argument callable building the component.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name):
+        """
+        Return the component, building it on first access.
+
+        Concurrent callers wait for a single construction.
+
+        Args:
+            name (str): Component name.
+
+        Returns:
+            The component instance.
+        """
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._factories:
+            raise KeyError(f"Unknown component: {name}")
+        with self._locks[name]:
+            if name not in self._instances:
+                start = time.perf_counter()
+                logging.info(f"Loading component '{name}'...")
+                self._instances[name] = self._factories[name]()
+                duration = time.perf_counter() - start
+                self._timings[name] = duration
+                logging.info(f"Component '{name}' loaded in {duration:.2f}s.")
+        return self._instances[name]
+
+    def is_loaded(self, name):
+        """Return whether a component has already been built."""
+        return name in self._instances
+
+    def warm_up(self, names, background=True):
+        """
+        Build components ahead of their first use.
+
+        Args:
+            names (list): Component names in loading order.
+            background (bool): Load in a daemon thread instead of blocking the caller.
+
+        Returns:
+            threading.Thread or None: The warm-up thread if running in the background.
+        """
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    logging.error(f"Warm-up of component '{name}' failed: {e}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def mark(self, event):
+        """
+        Record a startup milestone (e.g. 'window ready') relative to process start.
+
+        Args:
+            event (str): Description of the milestone.
+        """
+        self._events.append((event, time.perf_counter() - _PROCESS_START))
+
+    def startup_report(self):
+        """
+        Summarize startup milestones and component load times.
+
+        Returns:
+            str: Human-readable report, one line per entry.
+        """
+        lines = [f"{event}: {elapsed:.2f}s after start" for event, elapsed in self._events]
+        for name in self._factories:
+            if name in self._timings:
+                lines.append(f"{name}: loaded in {self._timings[name]:.2f}s")
+            else:
+                lines.append(f"{name}: not loaded")
+        return "\n".join(lines)
+
+def _load_analyzer():
+    from analyzer_refactored import NarrativeAnalyzer
+    return NarrativeAnalyzer()
+
+def _load_narrative_analyzer():
+    from narrative_analyzer import NarrativeAnalyzer
+    return NarrativeAnalyzer()
+
+def _load_twitter_client():
+    from scraper import TwitterAPIClient
+    return TwitterAPIClient()
+
+def _load_chromium_scraper():
+    from chromium_scraper import scrape_x_data
+    return scrape_x_data
+
+def _load_twscrape_scraper():
+    from twscrape_scraper import scrape_x_data
+    return scrape_x_data
+
+def _load_dashboard():
+    from dashboard import launch_dashboard
+    return launch_dashboard
+
+def _load_report_generator():
+    from generate_pdf_report import generate_pdf_report
+    return generate_pdf_report
+
+# Process-wide registry
+registry = LazyRegistry()
+registry.register("analyzer", _load_analyzer)
+registry.register("narrative_analyzer", _load_narrative_analyzer)
+registry.register("twitter_client", _load_twitter_client)
+registry.register("chromium_scraper", _load_chromium_scraper)
+registry.register("twscrape_scraper", _load_twscrape_scraper)
+registry.register("dashboard", _load_dashboard)
+registry.register("report_generator", _load_report_generator)
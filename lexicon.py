@@ -1,5 +1,5 @@
-import sqlite3
 from config import DB_NAME  # Assuming a config file exists
+from db_connection import get_connection, read_connection
 
 class NarrativeLexicon:
     """Manage the narrative lexicon stored in the database."""
@@ -8,7 +8,7 @@ class NarrativeLexicon:
 
     def update_lexicon(self, topic_id, description):
         """Update the lexicon with new or updated cluster descriptions."""
-        with sqlite3.connect(self.db_name) as conn:
+        with get_connection(self.db_name) as conn:
             c = conn.cursor()
             c.execute("INSERT OR REPLACE INTO known_topics (topic_id, description) VALUES (?, ?)", 
                       (topic_id, description))
@@ -16,7 +16,7 @@ class NarrativeLexicon:
 
     def get_lexicon(self):
         """Retrieve the current lexicon."""
-        with sqlite3.connect(self.db_name) as conn:
+        with read_connection(self.db_name) as conn:
             c = conn.cursor()
             c.execute("SELECT topic_id, description FROM known_topics")
             return {row[0]: row[1] for row in c.fetchall()}
\ No newline at end of file
@@ -1,9 +1,9 @@
 import tkinter as tk
-from analyzer_refactored import NarrativeAnalyzer
+from lazy_loader import registry
 from ui import MigrationAnalyzerApp
 from db import init_db
-from apscheduler.schedulers.background import BackgroundScheduler
-from update_models import update_topic_model
+from config import WARM_UP_COMPONENTS
+from scheduler import start_scheduler
 import logging
 
 logging.basicConfig(
@@ -13,21 +13,18 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-def start_scheduler():
-    """Startet den Scheduler für automatisches Re-Training alle 3 Tage."""
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(update_topic_model, 'interval', days=3)
-    scheduler.start()
-    logging.info("Scheduler für Modell-Updates gestartet.")
-
 def main():
     try:
         logging.info("Starte Anwendung...")
         init_db()
         start_scheduler()  # Scheduler starten
-        analyzer = NarrativeAnalyzer()
+        # Modelle werden erst bei Bedarf geladen; optional im Hintergrund vorladen
+        if WARM_UP_COMPONENTS:
+            registry.warm_up(WARM_UP_COMPONENTS)
         root = tk.Tk()
-        app = MigrationAnalyzerApp(root, analyzer)
+        app = MigrationAnalyzerApp(root)
+        registry.mark("Fenster bereit")
+        logging.info(f"Startzeit-Bericht:\n{registry.startup_report()}")
         root.mainloop()
     except Exception as e:
         logging.error(f"Fehler im Hauptprogramm: {e}")
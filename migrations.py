@@ -0,0 +1,157 @@
+import logging
+from datetime import datetime, timezone
+from config import DB_NAME
+from db_connection import get_connection
+from scrape_cursors import create_cursor_table
+from aggregates import create_rollup_tables, rebuild_rollups
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Unified narratives schema shared by analyzer_refactored (topic/danger_score) and
+# narrative_analyzer (language/toxicity_score/risk_score)
+NARRATIVE_COLUMNS = [
+    ("tweet_id", "TEXT PRIMARY KEY"),
+    ("text", "TEXT"),
+    ("user", "TEXT"),
+    ("date", "TEXT"),
+    ("created_at", "INTEGER"),
+    ("language", "TEXT"),
+    ("sentiment", "REAL"),
+    ("keywords", "TEXT"),
+    ("topic", "INTEGER"),
+    ("narrative_type", "TEXT"),
+    ("followers", "INTEGER"),
+    ("retweets", "INTEGER"),
+    ("likes", "INTEGER"),
+    ("danger_score", "REAL DEFAULT 0.0"),
+    ("toxicity_score", "REAL"),
+    ("risk_score", "REAL"),
+]
+
+def to_epoch(value):
+    """
+    Converts a tweet date into seconds since the epoch (UTC).
+
+    Args:
+        value: ISO string, datetime/pandas Timestamp or number.
+
+    Returns:
+        int or None: Epoch seconds, or None if the value cannot be parsed.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return int(value)
+        if not isinstance(value, datetime):
+            value = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    except (ValueError, TypeError, OverflowError):
+        # Unparseable strings, NaN and NaT end up here
+        return None
+
+def _table_columns(conn, table):
+    return [col[1] for col in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+def _create_unified_schema(conn, batch_size):
+    """Creates the unified narratives/known_topics tables or adds missing columns to legacy ones."""
+    column_sql = ", ".join(f'"{name}" {col_type}' for name, col_type in NARRATIVE_COLUMNS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS narratives ({column_sql})")
+    existing = _table_columns(conn, "narratives")
+    for name, col_type in NARRATIVE_COLUMNS:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE narratives ADD COLUMN "{name}" {col_type}')
+            logging.info(f"Spalte '{name}' zur Tabelle narratives hinzugefügt.")
+    # The db_utils schema stored the cluster in topic_id
+    if "topic_id" in existing:
+        conn.execute("UPDATE narratives SET topic = topic_id WHERE topic IS NULL")
+    conn.execute('''CREATE TABLE IF NOT EXISTS known_topics
+                    (topic_id INTEGER PRIMARY KEY, description TEXT, first_seen TEXT)''')
+
+def _backfill_created_at(conn, batch_size):
+    """Parses the free-form date strings into created_at, one rowid range per transaction."""
+    max_rowid = conn.execute("SELECT MAX(rowid) FROM narratives").fetchone()[0] or 0
+    updated = 0
+    for start in range(0, max_rowid + 1, batch_size):
+        rows = conn.execute(
+            "SELECT rowid, date FROM narratives WHERE rowid >= ? AND rowid < ? AND created_at IS NULL",
+            (start, start + batch_size)
+        ).fetchall()
+        params = [(to_epoch(date), rowid) for rowid, date in rows]
+        conn.executemany("UPDATE narratives SET created_at = ? WHERE rowid = ?", params)
+        conn.commit()
+        updated += len(params)
+    logging.info(f"created_at für {updated} Zeilen nachgetragen.")
+
+def _create_indexes(conn, batch_size):
+    """Adds the secondary indexes used by time-window, topic, user and risk queries."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_narratives_created_at ON narratives(created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_narratives_topic ON narratives(topic)")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_narratives_user ON narratives("user")')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_narratives_danger_score ON narratives(danger_score)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_narratives_risk_score ON narratives(risk_score)")
+
+def _create_rollups(conn, batch_size):
+    """Creates the daily rollup tables used by the dashboards and fills them from existing rows."""
+    create_rollup_tables(conn)
+    rebuild_rollups(conn, batch_size)
+
+def _create_change_counters(conn, batch_size):
+    """Creates the per-table change counters used as cache keys by query_cache.py."""
+    conn.execute("CREATE TABLE IF NOT EXISTS change_counters (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+def _create_scrape_cursors(conn, batch_size):
+    """Creates the per-query high-water marks used by live monitoring (see scrape_cursors.py)."""
+    create_cursor_table(conn)
+
+# Ordered list of (version, description, step). Never edit a released step, append a new one.
+MIGRATIONS = [
+    (1, "unified narratives schema", _create_unified_schema),
+    (2, "backfill created_at epoch timestamps", _backfill_created_at),
+    (3, "secondary indexes", _create_indexes),
+    (4, "daily rollup tables", _create_rollups),
+    (5, "change counters", _create_change_counters),
+    (6, "scrape cursors", _create_scrape_cursors),
+]
+
+def migrate(db_name=DB_NAME, batch_size=5000):
+    """
+    Upgrades the database in place to the latest schema version.
+
+    The applied version is tracked in ``PRAGMA user_version``; every step is idempotent
+    so an interrupted migration can simply be run again.
+
+    Args:
+        db_name (str): Path of the SQLite database.
+        batch_size (int): Rows per transaction for data backfills.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    conn = get_connection(db_name)
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            logging.info(f"Migration {version} ({description}) wird angewendet...")
+            step(conn, batch_size)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+            current = version
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Migration {version} fehlgeschlagen: {e}")
+            raise
+    return current
+
+if __name__ == "__main__":
+    print(f"Schema-Version: {migrate()}")
@@ -1,45 +1,140 @@
+import time
 import logging
-from transformers import pipeline
+from config import SENTIMENT_BATCH_SIZE, SENTIMENT_TOKEN_BUDGET
+from model_registry import model_registry
+from text_preprocessing import truncate_texts
+from inference_cache import get_inference_cache, pipeline_identity
 
 class ToxicityDetector:
     """Detect toxicity using a pre-trained multilingual model."""
-    def __init__(self, model_name='unitary/multilingual-toxic-xlm-roberta'):
-        self.model = pipeline("text-classification", model=model_name, device=0)  # Use GPU if available
+    def __init__(self, model_name='unitary/multilingual-toxic-xlm-roberta', backend=None):
+        # Shared instance from the model registry; uses the GPU if available, else ONNX on CPU
+        self.model = model_registry.handle("text-classification", model_name, backend=backend)
+        with self.model as pipe:
+            self.cache = get_inference_cache(*pipeline_identity(pipe, model_name))
         logging.info(f"Toxicity model {model_name} loaded.")
 
     def detect_toxicity(self, texts):
-        """Detect toxicity in a list of texts."""
+        """Detect toxicity in a list of texts, reusing cached scores for known texts."""
+        return self.cache.map(truncate_texts(texts), self._detect_toxicity)
+
+    def _detect_toxicity(self, texts):
         results = self.model(texts)
         # Map model output (e.g., 'toxic'/'non-toxic') to a score between 0 and 1
         return [result['score'] if result['label'] == 'toxic' else 1 - result['score'] for result in results]
 
 class SentimentAnalyzer:
     """Analyze sentiment using language-specific or multilingual models."""
-    def __init__(self):
+    def __init__(self, backend=None, batch_size=SENTIMENT_BATCH_SIZE, token_budget=SENTIMENT_TOKEN_BUDGET):
+        self.batch_size = batch_size
+        self.token_budget = token_budget
+        # Inferred tweets and seconds per model, for throughput reporting
+        self.throughput = {}
         # Multilingual fallback model
-        self.multilingual_model = pipeline("sentiment-analysis", model="nlptown/bert-base-multilingual-uncased-sentiment", device=0)
-        # Language-specific models
+        self.multilingual_model = model_registry.handle("sentiment-analysis", "nlptown/bert-base-multilingual-uncased-sentiment", backend=backend)
+        # Language-specific models (shared with analyzer_refactored through the registry)
         self.language_models = {
-            'en': pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english", device=0),
+            'en': model_registry.handle("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english", backend=backend),
             # Add more language-specific models as needed
         }
+        self.multilingual_cache = self._cache_for(self.multilingual_model)
+        self.language_caches = {lang: self._cache_for(model) for lang, model in self.language_models.items()}
         logging.info("Sentiment models loaded.")
 
+    @staticmethod
+    def _cache_for(model):
+        with model as pipe:
+            return get_inference_cache(*pipeline_identity(pipe, model.model_name))
+
+    @staticmethod
+    def _to_score(result):
+        """Map a pipeline result to a sentiment score between -1 and 1."""
+        if 'label' in result:
+            if result['label'] == 'POSITIVE':
+                return result['score']
+            elif result['label'] == 'NEGATIVE':
+                return -result['score']
+            else:
+                return 0.0
+        else:
+            # For multilingual model with star ratings
+            star_to_score = {'1 star': -1.0, '2 stars': -0.5, '3 stars': 0.0, '4 stars': 0.5, '5 stars': 1.0}
+            return star_to_score.get(result['label'], 0.0)
+
+    def _buckets(self, tokenizer, texts):
+        """
+        Split texts into batches of similar token length.
+
+        Args:
+            tokenizer: Tokenizer of the pipeline (None falls back to word counts).
+            texts (list): Texts to split.
+
+        Returns:
+            list: Lists of indices into ``texts``; each batch holds at most ``batch_size`` texts
+                and roughly ``token_budget`` padded tokens.
+        """
+        if tokenizer is not None:
+            lengths = [len(ids) for ids in tokenizer(texts, truncation=True)['input_ids']]
+        else:
+            lengths = [len(text.split()) for text in texts]
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        buckets, current = [], []
+        for i in order:
+            # Sorted ascending, so the newest text determines the padded length of the batch
+            if current and (len(current) >= self.batch_size or (len(current) + 1) * lengths[i] > self.token_budget):
+                buckets.append(current)
+                current = []
+            current.append(i)
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def _infer_batched(self, model, texts):
+        """Run a sentiment model over texts in length-sorted batches, keeping the input order."""
+        scores = [0.0] * len(texts)
+        start = time.perf_counter()
+        with model as pipe:
+            for bucket in self._buckets(getattr(pipe, 'tokenizer', None), texts):
+                results = pipe([texts[i] for i in bucket], batch_size=len(bucket), truncation=True)
+                for i, result in zip(bucket, results):
+                    scores[i] = self._to_score(result)
+        duration = time.perf_counter() - start
+        count, seconds = self.throughput.get(model.model_name, (0, 0.0))
+        self.throughput[model.model_name] = (count + len(texts), seconds + duration)
+        logging.info(f"Sentiment {model.model_name}: {len(texts)} tweets in {duration:.2f}s "
+                     f"({len(texts) / duration if duration else 0:.1f} tweets/s).")
+        return scores
+
+    def throughput_stats(self):
+        """
+        Report the inference throughput of each sentiment model in this process.
+
+        Returns:
+            dict: model name -> {'tweets', 'seconds', 'tweets_per_sec'}; cache hits are not counted.
+        """
+        return {
+            name: {"tweets": count, "seconds": seconds, "tweets_per_sec": count / seconds if seconds else 0.0}
+            for name, (count, seconds) in self.throughput.items()
+        }
+
     def analyze_sentiment(self, texts, languages):
-        """Analyze sentiment for texts based on their languages."""
-        sentiments = []
-        for text, lang in zip(texts, languages):
+        """
+        Analyze sentiment for texts based on their languages, reusing cached scores for known texts.
+
+        Texts are grouped by language to pick the model, then inferred in batches of similar
+        token length; the scores are returned in the order of ``texts``.
+        """
+        texts = truncate_texts(texts)
+        groups = {}
+        for i, lang in enumerate(languages):
+            groups.setdefault(lang if lang in self.language_models else None, []).append(i)
+
+        sentiments = [0.0] * len(texts)
+        for lang, indices in groups.items():
             model = self.language_models.get(lang, self.multilingual_model)
-            result = model(text)[0]
-            if 'label' in result:
-                if result['label'] == 'POSITIVE':
-                    sentiments.append(result['score'])
-                elif result['label'] == 'NEGATIVE':
-                    sentiments.append(-result['score'])
-                else:
-                    sentiments.append(0.0)
-            else:
-                # For multilingual model with star ratings
-                star_to_score = {'1 star': -1.0, '2 stars': -0.5, '3 stars': 0.0, '4 stars': 0.5, '5 stars': 1.0}
-                sentiments.append(star_to_score.get(result['label'], 0.0))
+            cache = self.language_caches.get(lang, self.multilingual_cache)
+            scores = cache.map([texts[i] for i in indices],
+                               lambda batch, model=model: self._infer_batched(model, batch))
+            for i, score in zip(indices, scores):
+                sentiments[i] = score
         return sentiments
\ No newline at end of file
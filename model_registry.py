@@ -0,0 +1,246 @@
+import os
+import gc
+import threading
+import time
+import logging
+from config import MODEL_MEMORY_BUDGET_MB
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def _load_pipeline(task, model_name, device, backend):
+    from inference_backend import load_pipeline
+    return load_pipeline(task, model_name, device=device, backend=backend)
+
+def _load_sentence_transformer(task, model_name, device, backend):
+    from sentence_transformers import SentenceTransformer
+    from inference_backend import configure_threads
+    configure_threads()
+    if device is not None:
+        device = "cpu" if device == -1 else f"cuda:{device}"
+    return SentenceTransformer(model_name, device=device)
+
+# Loaders per task; every other task is built as a Hugging Face pipeline
+LOADERS = {
+    "sentence-embedding": _load_sentence_transformer,
+}
+
+def estimate_size(model):
+    """
+    Estimates the resident size of a model from its parameters.
+
+    Args:
+        model: A pipeline, SentenceTransformer, torch module or ONNX Runtime model.
+
+    Returns:
+        int: Size in bytes (0 if it cannot be determined).
+    """
+    module = getattr(model, "model", model)
+    # ONNX Runtime models have no torch parameters; the weights file size is a close proxy
+    model_path = getattr(module, "model_path", None)
+    if model_path is not None:
+        try:
+            return os.path.getsize(model_path)
+        except OSError:
+            return 0
+    parameters = getattr(module, "parameters", None)
+    if parameters is None:
+        return 0
+    try:
+        return sum(p.numel() * p.element_size() for p in parameters())
+    except Exception:
+        return 0
+
+class _Entry:
+    def __init__(self, model, size):
+        self.model = model
+        self.size = size
+        self.active = 0
+        self.last_used = time.monotonic()
+
+class ModelRegistry:
+    """
+    Process-wide registry sharing one instance per (task, model name, device, backend).
+
+    Components hold lightweight ModelHandles and acquire the model for the duration of
+    a call. Models that are not in use are unloaded least-recently-used first whenever
+    the total estimated size exceeds the memory budget, and reloaded on next use.
+    """
+
+    def __init__(self, memory_budget_mb=MODEL_MEMORY_BUDGET_MB):
+        """
+        Args:
+            memory_budget_mb (int): Budget for all loaded models in MB; 0 disables unloading.
+        """
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._entries = {}
+        self._load_locks = {}
+        self._lock = threading.RLock()
+
+    def acquire(self, key):
+        """
+        Returns the model for ``key`` and marks it as in use until ``release`` is called.
+
+        Args:
+            key (tuple): (task, model_name, device, backend).
+
+        Returns:
+            The shared model instance.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.active += 1
+                entry.last_used = time.monotonic()
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay usable meanwhile
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                task, model_name, device, backend = key
+                start = time.perf_counter()
+                model = LOADERS.get(task, _load_pipeline)(task, model_name, device, backend)
+                entry = _Entry(model, estimate_size(model))
+                logging.info(f"Model {model_name} ({task}, device={device}, backend={backend}) loaded in "
+                             f"{time.perf_counter() - start:.1f}s, ~{entry.size / 1024 ** 2:.0f} MB.")
+            with self._lock:
+                self._entries[key] = entry
+                entry.active += 1
+                entry.last_used = time.monotonic()
+                self._enforce_budget()
+                return entry.model
+
+    def release(self, key):
+        """
+        Marks one use of the model as finished.
+
+        Args:
+            key (tuple): (task, model_name, device, backend).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.active = max(entry.active - 1, 0)
+                entry.last_used = time.monotonic()
+                self._enforce_budget()
+
+    def _enforce_budget(self):
+        """Unloads idle models, least recently used first, until the budget is met."""
+        if not self.memory_budget:
+            return
+        total = sum(entry.size for entry in self._entries.values())
+        idle = sorted(((entry.last_used, key) for key, entry in self._entries.items() if entry.active == 0),
+                      key=lambda item: item[0])
+        for _, key in idle:
+            if total <= self.memory_budget:
+                break
+            total -= self._entries[key].size
+            self._unload(key)
+
+    def _unload(self, key):
+        entry = self._entries.pop(key)
+        logging.info(f"Model {key[1]} ({key[0]}) unloaded, ~{entry.size / 1024 ** 2:.0f} MB freed.")
+        del entry
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    def unload_idle(self, max_idle_seconds=0):
+        """
+        Unloads every model that has not been used for the given time.
+
+        Args:
+            max_idle_seconds (float): Minimum idle time before a model is unloaded.
+
+        Returns:
+            int: Number of unloaded models.
+        """
+        with self._lock:
+            now = time.monotonic()
+            keys = [key for key, entry in self._entries.items()
+                    if entry.active == 0 and now - entry.last_used >= max_idle_seconds]
+            for key in keys:
+                self._unload(key)
+            return len(keys)
+
+    def handle(self, task, model_name, device=None, backend=None):
+        """
+        Returns a handle for a model; handles for the same key share one instance.
+
+        Args:
+            task (str): Pipeline task or 'sentence-embedding'.
+            model_name (str): Hugging Face model name.
+            device (int, optional): Device index as used by transformers (-1 for CPU); None auto-detects.
+            backend (str, optional): 'torch', 'onnx' or 'auto'; None uses INFERENCE_BACKEND.
+                Sentence embeddings always run on PyTorch.
+
+        Returns:
+            ModelHandle: Handle that loads the model lazily.
+        """
+        from inference_backend import resolve_device, resolve_backend
+        device = resolve_device(device)
+        backend = "torch" if task in LOADERS else resolve_backend(backend, device)
+        return ModelHandle(self, (task, model_name, device, backend))
+
+    def stats(self):
+        """
+        Returns the loaded models with their size and number of active uses.
+
+        Returns:
+            dict: key -> info dict, plus the total size in MB under 'total_mb'.
+        """
+        with self._lock:
+            info = {
+                key: {"size_mb": entry.size / 1024 ** 2, "active": entry.active}
+                for key, entry in self._entries.items()
+            }
+            info["total_mb"] = sum(entry.size for entry in self._entries.values()) / 1024 ** 2
+            return info
+
+class ModelHandle:
+    """
+    Lightweight reference to a registry model.
+
+    Calling the handle (or any method on it, e.g. ``encode``) acquires the model for the
+    duration of the call. Use ``with handle as model:`` for several calls in a row.
+    """
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+        self.model_name = key[1]
+
+    def __enter__(self):
+        return self.registry.acquire(self.key)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.release(self.key)
+        return False
+
+    def __call__(self, *args, **kwargs):
+        with self as model:
+            return model(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            with self as model:
+                return getattr(model, name)(*args, **kwargs)
+        return method
+
+# Shared by every analyzer, detector and topic modeler in the process
+model_registry = ModelRegistry()
@@ -1,16 +1,19 @@
-import sqlite3
 import logging
 from datetime import datetime
 from ml_components import ToxicityDetector, SentimentAnalyzer
 from topic_modeler import TopicModeler
 from lexicon import NarrativeLexicon
 from utils import send_alert_email
+from db import insert_tweets
+from db_connection import get_connection
+from migrations import migrate
 
 DB_NAME = "narrative_db.sqlite"
 
 class NarrativeAnalyzer:
     def __init__(self, db_name=DB_NAME):
         self.db_name = db_name
+        migrate(db_name)
         self.toxicity_detector = ToxicityDetector()
         self.sentiment_analyzer = SentimentAnalyzer()
         self.topic_modeler = TopicModeler()
@@ -22,7 +25,7 @@ class NarrativeAnalyzer:
         languages = df['language'].tolist()
         df['toxicity_score'] = self.toxicity_detector.detect_toxicity(texts)
         df['sentiment'] = self.sentiment_analyzer.analyze_sentiment(texts, languages)
-        topics = self.topic_modeler.fit_transform(df['text'])
+        topics = self.topic_modeler.assign_topics(texts, tweet_ids=df['tweet_id'].tolist())
         df['topic_id'] = topics
         df = self.calculate_risk_score(df)
         self.detect_new_narratives(topics, df)
@@ -39,7 +42,7 @@ class NarrativeAnalyzer:
         return df
 
     def detect_new_narratives(self, topics, df):
-        with sqlite3.connect(self.db_name) as conn:
+        with get_connection(self.db_name) as conn:
             c = conn.cursor()
             c.execute("SELECT topic_id FROM known_topics")
             known_topics = set(row[0] for row in c.fetchall())
@@ -66,5 +69,5 @@ class NarrativeAnalyzer:
                 logging.info(f"New topics detected: {new_topics}")
 
     def save_to_db(self, df):
-        with sqlite3.connect(self.db_name) as conn:
-            df.to_sql('narratives', conn, if_exists='append', index=False)
\ No newline at end of file
+        inserted, ignored = insert_tweets(df, db_name=self.db_name)
+        logging.info(f"Saved {inserted} narratives ({ignored} duplicates ignored).")
\ No newline at end of file
@@ -0,0 +1,171 @@
+import queue
+import threading
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Passed down the stages to shut the workers down once all earlier items are processed
+_STOP = object()
+
+class Stage:
+    """One processing step of a Pipeline with its input queue, workers and counters."""
+
+    def __init__(self, name, fn, workers=1, maxsize=2):
+        """
+        Args:
+            name (str): Stage name used in logs and statistics.
+            fn (callable): Takes one item and returns the item for the next stage, or None to drop it.
+            workers (int): Number of worker threads.
+            maxsize (int): Capacity of the input queue; a full queue blocks the previous stage.
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.finished_workers = 0
+        self.lock = threading.Lock()
+
+    def stats(self, elapsed):
+        """Returns the counters of the stage; rates refer to busy time and to wall time."""
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "busy_seconds": self.busy_seconds,
+                "items_per_busy_sec": self.processed / self.busy_seconds if self.busy_seconds else 0.0,
+                "items_per_sec": self.processed / elapsed if elapsed else 0.0,
+            }
+
+class Pipeline:
+    """
+    Runs stages such as scrape -> analyze -> store in their own threads.
+
+    Stages are connected by bounded queues, so network I/O of one item overlaps with
+    model inference on the previous one, while a slow stage throttles the faster ones
+    instead of letting work pile up in memory.
+    """
+
+    def __init__(self, name="pipeline", on_result=None):
+        """
+        Args:
+            name (str): Pipeline name used in logs and thread names.
+            on_result (callable, optional): Receives the output of the last stage.
+        """
+        self.name = name
+        self.on_result = on_result
+        self.stages = []
+        self._threads = []
+        self._started = None
+
+    def add_stage(self, name, fn, workers=1, maxsize=2):
+        """
+        Appends a stage; see Stage for the arguments.
+
+        Returns:
+            Pipeline: self, for chaining.
+        """
+        if self._started is not None:
+            raise RuntimeError("Stages must be added before the pipeline is started.")
+        self.stages.append(Stage(name, fn, workers, maxsize))
+        return self
+
+    def start(self):
+        """Starts the worker threads of all stages."""
+        self._started = time.perf_counter()
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(index,),
+                                          name=f"{self.name}-{stage.name}-{worker}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def put(self, item, timeout=None):
+        """
+        Feeds an item into the first stage, blocking while its queue is full.
+
+        Args:
+            item: Input of the first stage.
+            timeout (float, optional): Maximum wait; raises queue.Full when exceeded.
+        """
+        self.stages[0].queue.put(item, timeout=timeout)
+
+    def close(self, wait=True):
+        """
+        Lets the stages finish all queued items and stops the workers.
+
+        Args:
+            wait (bool): Block until every worker has exited.
+        """
+        for _ in range(self.stages[0].workers):
+            self.stages[0].queue.put(_STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+            logging.info(f"Pipeline {self.name} finished: {self.stats()}")
+
+    def _work(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                break
+            start = time.perf_counter()
+            try:
+                result = stage.fn(item)
+                failed = False
+            except Exception as e:
+                logging.error(f"Pipeline {self.name}, stage {stage.name}: {e}")
+                result, failed = None, True
+            with stage.lock:
+                stage.busy_seconds += time.perf_counter() - start
+                if failed:
+                    stage.errors += 1
+                elif result is None:
+                    stage.dropped += 1
+                else:
+                    stage.processed += 1
+            if result is None:
+                continue
+            # A failing hand-off must not kill the worker, or close() would wait forever
+            try:
+                if next_stage is not None:
+                    next_stage.queue.put(result)
+                elif self.on_result is not None:
+                    self.on_result(result)
+            except Exception as e:
+                logging.error(f"Pipeline {self.name}, stage {stage.name}, hand-off: {e}")
+                with stage.lock:
+                    stage.errors += 1
+
+        with stage.lock:
+            stage.finished_workers += 1
+            last = stage.finished_workers == stage.workers
+        # The last worker of a stage hands the shutdown on once nothing is in flight anymore
+        if last and next_stage is not None:
+            for _ in range(next_stage.workers):
+                next_stage.queue.put(_STOP)
+
+    def stats(self):
+        """
+        Returns queue depths and throughput counters of all stages.
+
+        Returns:
+            dict: stage name -> counters (see Stage.stats).
+        """
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        return {stage.name: stage.stats(elapsed) for stage in self.stages}
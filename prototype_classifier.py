@@ -0,0 +1,178 @@
+import os
+import time
+import logging
+import numpy as np
+from model_registry import model_registry
+from embedding_store import EmbeddingStore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Example sentences per narrative label; their mean embedding is the label prototype
+LABEL_PROTOTYPES = {
+    "positive": [
+        "Migration bereichert unsere Gesellschaft.",
+        "Geflüchtete sind hier willkommen.",
+        "Integration gelingt, wenn wir zusammenhalten.",
+        "Immigrants make our country stronger.",
+    ],
+    "negative": [
+        "Die Migranten sind eine Bedrohung für unser Land.",
+        "Die Grenzen müssen sofort geschlossen werden.",
+        "Flüchtlinge bringen Kriminalität und Gewalt.",
+        "Immigration is destroying our country.",
+    ],
+    "neutral": [
+        "Der Bundestag berät heute über das neue Asylgesetz.",
+        "Im letzten Monat wurden 20.000 Asylanträge gestellt.",
+        "Die Konferenz zur Migrationspolitik findet in Berlin statt.",
+        "The report presents new statistics on migration.",
+    ],
+}
+
+class PrototypeClassifier:
+    """
+    Fast narrative classifier based on sentence embeddings.
+
+    Each label is represented by a prototype vector; texts get the label with the highest
+    cosine similarity. Prototypes start from LABEL_PROTOTYPES and can be refitted on labelled
+    tweets (e.g. zero-shot output), which turns them into a nearest-centroid head.
+    Embeddings come from the store shared with the topic modeler, so texts encoded there
+    are not encoded again.
+    """
+
+    def __init__(self, embedding_model_name='paraphrase-multilingual-MiniLM-L12-v2', model_dir='models',
+                 prototypes=LABEL_PROTOTYPES):
+        """
+        Args:
+            embedding_model_name (str): SentenceTransformer model (the topic modeler's by default).
+            model_dir (str): Directory holding the embedding store and fitted prototypes.
+            prototypes (dict): label -> example sentences, used until prototypes are fitted.
+        """
+        self.embedding_model = model_registry.handle("sentence-embedding", embedding_model_name)
+        self.embedding_store = EmbeddingStore(self.embedding_model, embedding_model_name,
+                                              store_dir=os.path.join(model_dir, 'embeddings'))
+        self.prototype_file = os.path.join(model_dir, 'narrative_prototypes.npz')
+        self.labels = list(prototypes)
+        self.prototypes = None
+        if os.path.exists(self.prototype_file):
+            data = np.load(self.prototype_file)
+            self.labels = [str(label) for label in data['labels']]
+            self.prototypes = data['prototypes']
+            logging.info(f"Narrative prototypes loaded from {self.prototype_file}.")
+        else:
+            self.prototypes = np.stack([self._centroid(self._embed(prototypes[label])) for label in self.labels])
+
+    def _embed(self, texts, tweet_ids=None, use_store=True):
+        if use_store:
+            vectors = self.embedding_store.embed(texts, tweet_ids=tweet_ids)
+        else:
+            vectors = np.asarray(self.embedding_model.encode(texts, batch_size=self.embedding_store.batch_size))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    @staticmethod
+    def _centroid(vectors):
+        centroid = vectors.mean(axis=0)
+        return centroid / max(np.linalg.norm(centroid), 1e-12)
+
+    def classify(self, texts, tweet_ids=None, use_store=True):
+        """
+        Assign a narrative label to each text.
+
+        Args:
+            texts (list): Texts to classify.
+            tweet_ids (list, optional): Tweet IDs, stored with the embeddings for compaction.
+            use_store (bool): Reuse stored embeddings; False always encodes (for benchmarking).
+
+        Returns:
+            list: One label per text.
+        """
+        if not len(texts):
+            return []
+        similarities = self._embed(list(texts), tweet_ids, use_store) @ self.prototypes.T
+        return [self.labels[i] for i in similarities.argmax(axis=1)]
+
+    def fit(self, texts, labels, save=True):
+        """
+        Recompute the prototypes as centroids of labelled texts.
+
+        Labels without examples keep their previous prototype.
+
+        Args:
+            texts (list): Training texts.
+            labels (list): Label per text.
+            save (bool): Persist the prototypes for later runs.
+        """
+        vectors = self._embed(list(texts))
+        labels = np.asarray(labels)
+        for i, label in enumerate(self.labels):
+            mask = labels == label
+            if mask.any():
+                self.prototypes[i] = self._centroid(vectors[mask])
+        if save:
+            np.savez(self.prototype_file, labels=np.asarray(self.labels), prototypes=self.prototypes)
+            logging.info(f"Narrative prototypes fitted on {len(labels)} texts and saved to {self.prototype_file}.")
+
+def evaluate(texts, fit_fraction=0.0):
+    """
+    Compare the prototype classifier with the zero-shot BART classifier.
+
+    Both classifiers run without the inference cache so the timings reflect real inference.
+
+    Args:
+        texts (list): Sample texts.
+        fit_fraction (float): Share of the texts used to fit the prototypes on BART labels
+            before evaluating on the rest (0 evaluates the example-sentence prototypes).
+
+    Returns:
+        dict: Agreement with BART, timings of both classifiers and the speedup.
+    """
+    from analyzer_refactored import NarrativeAnalyzer
+    analyzer = NarrativeAnalyzer(classifier_mode="zero-shot")
+    prototype_classifier = PrototypeClassifier()
+
+    start = time.perf_counter()
+    reference = analyzer._classify_batch(texts)
+    bart_seconds = time.perf_counter() - start
+
+    split = int(len(texts) * fit_fraction)
+    if split:
+        prototype_classifier.fit(texts[:split], reference[:split])
+    texts, reference = texts[split:], reference[split:]
+    start = time.perf_counter()
+    # Encoding is what the fast mode costs on new tweets, so stored embeddings are not used
+    predicted = prototype_classifier.classify(texts, use_store=False)
+    prototype_seconds = time.perf_counter() - start
+
+    bart_per_text = bart_seconds / (len(texts) + split) if texts else 0.0
+    report = {
+        "texts": len(texts),
+        "agreement": float(np.mean([a == b for a, b in zip(predicted, reference)])) if texts else 0.0,
+        "bart_sec_per_1k": bart_per_text * 1000,
+        "prototype_sec_per_1k": prototype_seconds / len(texts) * 1000 if texts else 0.0,
+        "speedup": bart_per_text * len(texts) / prototype_seconds if prototype_seconds else 0.0,
+    }
+    logging.info(f"Prototype classifier evaluation: {report}")
+    return report
+
+if __name__ == "__main__":
+    import argparse
+    from config import DB_NAME
+    from db_connection import read_connection
+
+    parser = argparse.ArgumentParser(description="Compare the prototype classifier with zero-shot BART.")
+    parser.add_argument("--limit", type=int, default=500, help="Number of recent tweets to evaluate")
+    parser.add_argument("--fit-fraction", type=float, default=0.0,
+                        help="Share of tweets used to fit the prototypes on BART labels")
+    args = parser.parse_args()
+    with read_connection(DB_NAME) as conn:
+        rows = conn.execute("SELECT text FROM narratives WHERE text IS NOT NULL ORDER BY created_at DESC LIMIT ?",
+                            (args.limit,)).fetchall()
+    for key, value in evaluate([row[0] for row in rows], args.fit_fraction).items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
@@ -0,0 +1,144 @@
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from config import DB_NAME
+from db_connection import read_connection
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def data_version(conn, name="narratives"):
+    """
+    Returns the change counter of a table (0 if the counter table does not exist yet).
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+        name (str): Name of the tracked table.
+
+    Returns:
+        int: Monotonically increasing version, bumped on every committed write.
+    """
+    try:
+        row = conn.execute("SELECT version FROM change_counters WHERE name = ?", (name,)).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
+
+def bump_data_version(conn, name="narratives"):
+    """
+    Increments the change counter of a table. Call inside the writing transaction.
+
+    Args:
+        conn (sqlite3.Connection): Open connection.
+        name (str): Name of the tracked table.
+    """
+    conn.execute('''INSERT INTO change_counters (name, version) VALUES (?, 1)
+                    ON CONFLICT(name) DO UPDATE SET version = version + 1''', (name,))
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with TTL for query results shared by all Dash callbacks.
+
+    Keys include the data version, so a write invalidates the cache implicitly. Concurrent
+    callers asking for the same key wait for a single load instead of all hitting SQLite.
+    """
+
+    def __init__(self, max_entries=64, ttl=300):
+        """
+        Args:
+            max_entries (int): Number of results kept before the least recently used is evicted.
+            ttl (float): Seconds after which a result is reloaded even without a version change.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key, loader):
+        """
+        Returns the cached value for ``key`` or computes it with ``loader``.
+
+        Args:
+            key (tuple): Hashable cache key.
+            loader (callable): Zero-argument function producing the value.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = self._loading[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another callback is already running this query; reuse its result
+            pending.wait()
+
+        try:
+            value = loader()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._loading[key]
+            pending.set()
+
+    def clear(self):
+        """Drops all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns hit/miss counters.
+
+        Returns:
+            dict: Entries, hits, misses and hit rate.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+# Process-wide cache used by dashboard.py and visualizer.py
+query_cache = QueryCache()
+
+def cached_read(name, loader, db_name=DB_NAME):
+    """
+    Runs ``loader(conn)`` on a read-only connection, at most once per data version.
+
+    Args:
+        name (str): Identifier of the query, e.g. the loader function name.
+        loader (callable): Function taking a connection and returning the result.
+        db_name (str): Path of the SQLite database.
+
+    Returns:
+        The (possibly cached) result. Treat it as read-only, it is shared between callers.
+    """
+    with read_connection(db_name) as conn:
+        key = (db_name, name, data_version(conn))
+        return query_cache.get_or_load(key, lambda: loader(conn))
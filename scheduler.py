@@ -0,0 +1,40 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.events import EVENT_JOB_EXECUTED
+from lazy_loader import registry
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def run_scheduled_update():
+    """Führt das Re-Training aus; BERTopic & Co. werden erst hier importiert."""
+    from update_models import update_topic_model
+    update_topic_model()
+
+def reload_topic_model(event=None):
+    """Übergibt das neu veröffentlichte Themenmodell an einen bereits geladenen Analyzer."""
+    # Live-Batches nutzen nur transform und sähen das neue Modell sonst erst nach einem Neustart
+    if registry.is_loaded("analyzer"):
+        from analyzer_refactored import load_latest_topic_model
+        registry.get("analyzer").topic_model = load_latest_topic_model()
+        logging.info("Themenmodell nach dem geplanten Re-Training neu geladen.")
+
+def start_scheduler():
+    """
+    Startet den Scheduler für automatisches Re-Training alle 3 Tage.
+
+    Nach jedem Lauf wird das neue Modell in den geladenen Analyzer übernommen (GUI und Daemon).
+
+    Returns:
+        BackgroundScheduler: Der laufende Scheduler (zum Beenden via shutdown()).
+    """
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(run_scheduled_update, 'interval', days=3)
+    scheduler.add_listener(reload_topic_model, EVENT_JOB_EXECUTED)
+    scheduler.start()
+    logging.info("Scheduler für Modell-Updates gestartet.")
+    return scheduler
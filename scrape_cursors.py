@@ -0,0 +1,118 @@
+import time
+import logging
+from config import DB_NAME
+from db_connection import get_connection
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def create_cursor_table(conn):
+    """Creates the table holding the newest seen tweet per scraping method and query."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS scrape_cursors
+                    (method TEXT, query TEXT, newest_id TEXT, newest_at INTEGER, updated_at INTEGER,
+                     PRIMARY KEY (method, query))''')
+
+def normalize_query(keywords):
+    """
+    Builds the cursor key of a keyword list; order, case and duplicates do not matter.
+
+    Args:
+        keywords (list): Search terms.
+
+    Returns:
+        str: Comma-separated, sorted, lower-cased terms.
+    """
+    return ",".join(sorted({str(keyword).strip().lower() for keyword in keywords if str(keyword).strip()}))
+
+def _id_value(tweet_id):
+    # Tweet IDs are snowflakes, so numeric order is chronological order
+    return int(tweet_id) if str(tweet_id).isdigit() else -1
+
+def get_cursor(method, keywords, db_name=DB_NAME):
+    """
+    Returns the high-water mark of a query.
+
+    Args:
+        method (str): Scraping method ('API', 'Chromium', 'twscrape').
+        keywords (list): Search terms of the query.
+        db_name (str): Path of the SQLite database.
+
+    Returns:
+        tuple: (newest tweet ID, its epoch timestamp), both None if the query was never run.
+    """
+    row = get_connection(db_name).execute(
+        "SELECT newest_id, newest_at FROM scrape_cursors WHERE method = ? AND query = ?",
+        (method, normalize_query(keywords))
+    ).fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+def update_cursor(method, keywords, tweets, db_name=DB_NAME):
+    """
+    Advances the high-water mark of a query to the newest of the given tweets.
+
+    The mark never moves backwards, so out-of-order batches are harmless.
+
+    Args:
+        method (str): Scraping method.
+        keywords (list): Search terms of the query.
+        tweets (list): Tweet dicts with 'tweet_id' and 'date'.
+        db_name (str): Path of the SQLite database.
+    """
+    # Imported here because migrations.py itself depends on this module
+    from migrations import to_epoch
+    candidates = [tweet for tweet in tweets if _id_value(tweet.get("tweet_id")) >= 0]
+    if not candidates:
+        return
+    newest = max(candidates, key=lambda tweet: _id_value(tweet["tweet_id"]))
+    query = normalize_query(keywords)
+    conn = get_connection(db_name)
+    with conn:
+        current = conn.execute("SELECT newest_id FROM scrape_cursors WHERE method = ? AND query = ?",
+                               (method, query)).fetchone()
+        if current and _id_value(current[0]) >= _id_value(newest["tweet_id"]):
+            return
+        conn.execute('''INSERT INTO scrape_cursors (method, query, newest_id, newest_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(method, query) DO UPDATE SET
+                            newest_id = excluded.newest_id,
+                            newest_at = excluded.newest_at,
+                            updated_at = excluded.updated_at''',
+                     (method, query, str(newest["tweet_id"]), to_epoch(newest.get("date")), int(time.time())))
+
+def filter_new(tweets, since_id=None, db_name=DB_NAME):
+    """
+    Drops tweets that are not newer than the cursor or are already stored.
+
+    Backends that cannot filter by ID on the server side still return only new content
+    to the caller, so nothing already known reaches the analyzer.
+
+    Args:
+        tweets (list): Tweet dicts with 'tweet_id'.
+        since_id (str, optional): Cursor ID; tweets with an ID at or below it are dropped.
+        db_name (str): Path of the SQLite database.
+
+    Returns:
+        list: Tweets that are new, in their original order, without duplicates.
+    """
+    cutoff = _id_value(since_id) if since_id is not None else -1
+    unique = {}
+    for tweet in tweets:
+        tweet_id = str(tweet.get("tweet_id"))
+        if tweet_id not in unique and (cutoff < 0 or _id_value(tweet_id) > cutoff):
+            unique[tweet_id] = tweet
+    ids = list(unique)
+    conn = get_connection(db_name)
+    known = set()
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        placeholders = ", ".join("?" for _ in chunk)
+        known.update(row[0] for row in conn.execute(
+            f"SELECT tweet_id FROM narratives WHERE tweet_id IN ({placeholders})", chunk).fetchall())
+    new_tweets = [tweet for tweet_id, tweet in unique.items() if tweet_id not in known]
+    logging.info(f"{len(tweets) - len(new_tweets)} of {len(tweets)} scraped tweets already known.")
+    return new_tweets
@@ -1,5 +1,7 @@
 import tweepy
-from config import TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET
+from config import TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET, validate_credentials
+from config import TWITTER_RATE_LIMIT_MAX_WAIT
+from keyword_matcher import get_query_matcher
 import logging
 import time
 
@@ -13,10 +15,13 @@ logging.basicConfig(
 class TwitterAPIClient:
     def __init__(self):
         self.client = None
+        # Newest tweet ID of the last search, for since_id polling
+        self.newest_id = None
         self._authenticate()
 
     def _authenticate(self):
         """Authenticate with Twitter API v2."""
+        validate_credentials("twitter")
         try:
             self.client = tweepy.Client(
                 consumer_key=TWITTER_CONSUMER_KEY,
@@ -29,61 +34,132 @@ class TwitterAPIClient:
             logging.error(f"Failed to authenticate Twitter API: {e}")
             raise
 
-    def scrape_x_data(self, keywords, limit=100, tweet_type="recent", retries=3):
-        """Scrape tweets using Twitter API v2 with error handling."""
+    def scrape_x_data(self, keywords, limit=100, tweet_type="recent", retries=3, since_id=None, start_time=None):
+        """
+        Scrape tweets using Twitter API v2 with error handling.
+
+        Args:
+            keywords (list): Search terms, OR-ed into one query.
+            limit (int): Maximum number of tweets; larger limits are fetched over several pages.
+            tweet_type (str): 'recent' (newest first) or 'popular' (most relevant first).
+            retries (int): Attempts per page on API errors other than rate limits.
+            since_id (str, optional): Only return tweets newer than this ID.
+            start_time (datetime or str, optional): Only return tweets created after this time.
+
+        Returns:
+            list: Tweet dictionaries.
+        """
+        tweet_list = []
+        for page in self.iter_pages(keywords, limit, tweet_type, retries, since_id, start_time):
+            tweet_list.extend(page)
+        if not tweet_list:
+            logging.warning(f"No tweets found for keywords {keywords}.")
+        else:
+            logging.info(f"{len(tweet_list)} tweets successfully scraped.")
+        return tweet_list
+
+    def iter_pages(self, keywords, limit=100, tweet_type="recent", retries=3, since_id=None, start_time=None):
+        """
+        Stream search results page by page, following next_token up to the limit.
+
+        After the first page, ``self.newest_id`` holds the newest tweet ID of the result
+        set, to be passed as ``since_id`` on the next poll.
+
+        Args:
+            keywords (list): Search terms, OR-ed into one query.
+            limit (int): Maximum number of tweets over all pages.
+            tweet_type (str): 'recent' (newest first) or 'popular' (most relevant first).
+            retries (int): Attempts per page on API errors other than rate limits.
+            since_id (str, optional): Only return tweets newer than this ID.
+            start_time (datetime or str, optional): Only return tweets created after this time.
+
+        Yields:
+            list: Tweet dictionaries of one page.
+        """
         query = " OR ".join(keywords) + " -is:retweet lang:de"
-        logging.info(f"Starting tweet search with query: {query}, limit: {limit}, type: {tweet_type}")
+        logging.info(f"Starting tweet search with query: {query}, limit: {limit}, type: {tweet_type}, "
+                     f"since_id: {since_id}, start_time: {start_time}")
+        matcher = get_query_matcher(keywords)
+        self.newest_id = None
+        next_token = None
+        fetched = 0
+        while fetched < limit:
+            tweets = self._search_page(query, limit - fetched, tweet_type, retries, since_id, start_time, next_token)
+            if tweets is None or not tweets.data:
+                return
+            meta = tweets.meta or {}
+            if self.newest_id is None:
+                self.newest_id = meta.get("newest_id")
 
+            users = {user.id: user for user in (tweets.includes or {}).get("users", [])}
+            page = []
+            for tweet in tweets.data[:limit - fetched]:
+                user = users.get(tweet.author_id)
+                page.append({
+                    "tweet_id": str(tweet.id),
+                    "text": tweet.text,
+                    "user": user.username if user else "unknown",
+                    "followers": user.public_metrics["followers_count"] if user else 0,
+                    "retweets": tweet.public_metrics["retweet_count"],
+                    "likes": tweet.public_metrics["like_count"],
+                    "date": tweet.created_at.isoformat()
+                })
+            matcher.annotate(page)
+            fetched += len(page)
+            yield page
+
+            next_token = meta.get("next_token")
+            if not next_token:
+                return
+
+    def _search_page(self, query, remaining, tweet_type, retries, since_id, start_time, next_token):
+        """
+        Fetch one result page, waiting for the rate-limit reset if needed.
+
+        Rate limits do not count as failed attempts, but all waits of one page together are capped
+        at TWITTER_RATE_LIMIT_MAX_WAIT seconds, so an exhausted quota cannot block the caller forever.
+
+        Returns:
+            tweepy.Response: The page, or None if all attempts failed or the wait budget is used up.
+        """
         attempt = 0
+        waited = 0.0
         while attempt < retries:
             try:
-                tweets = self.client.search_recent_tweets(
+                return self.client.search_recent_tweets(
                     query=query,
-                    max_results=min(limit, 100),  # API max is 100 per request
+                    max_results=min(max(remaining, 10), 100),  # API allows 10-100 per request
+                    sort_order="relevancy" if tweet_type == "popular" else "recency",
+                    since_id=since_id,
+                    start_time=start_time,
+                    next_token=next_token,
                     tweet_fields=["created_at", "public_metrics", "author_id"],
                     user_fields=["username", "public_metrics"],
                     expansions=["author_id"]
                 )
-                if not tweets.data:
-                    logging.warning(f"No tweets found for query '{query}'. Attempt {attempt + 1}/{retries}.")
-                    if attempt + 1 < retries:
-                        time.sleep(5)
-                    attempt += 1
-                    continue
-
-                tweet_list = []
-                users = {user.id: user for user in tweets.includes.get("users", [])}
-                for tweet in tweets.data:
-                    user = users.get(tweet.author_id)
-                    tweet_data = {
-                        "tweet_id": str(tweet.id),
-                        "text": tweet.text,
-                        "user": user.username if user else "unknown",
-                        "followers": user.public_metrics["followers_count"] if user else 0,
-                        "retweets": tweet.public_metrics["retweet_count"],
-                        "likes": tweet.public_metrics["like_count"],
-                        "date": tweet.created_at.isoformat(),
-                        "keywords": ",".join([kw for kw in keywords if kw.lower() in tweet.text.lower()])
-                    }
-                    tweet_list.append(tweet_data)
-
-                logging.info(f"{len(tweet_list)} tweets successfully scraped.")
-                return tweet_list[:limit]
+            except tweepy.TooManyRequests as e:
+                wait = self._rate_limit_wait(e)
+                if waited + wait > TWITTER_RATE_LIMIT_MAX_WAIT:
+                    logging.error(f"Rate limit reached: {e}. Reset in {wait:.0f} seconds exceeds the remaining "
+                                  f"wait budget, giving up on query '{query}'.")
+                    return None
+                logging.error(f"Rate limit reached: {e}. Waiting {wait:.0f} seconds...")
+                time.sleep(wait)
+                waited += wait
             except tweepy.TweepyException as e:
-                if "rate limit" in str(e).lower():
-                    logging.error(f"Rate limit reached: {e}. Waiting 15 minutes...")
-                    time.sleep(900)  # 15 minutes
-                else:
-                    logging.error(f"Twitter API error: {e}")
+                logging.error(f"Twitter API error: {e}")
                 attempt += 1
                 time.sleep(5)
             except Exception as e:
                 logging.error(f"Unexpected error during scraping: {e}")
                 attempt += 1
                 time.sleep(5)
+        logging.error(f"All {retries} attempts failed for query '{query}'.")
+        return None
 
-        logging.error(f"All {retries} attempts failed. No tweets found.")
-        return []
-
-# Initialize the client
-twitter_client = TwitterAPIClient()
\ No newline at end of file
+    @staticmethod
+    def _rate_limit_wait(error):
+        """Returns the seconds until the rate-limit window given by the x-rate-limit-reset header has passed."""
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        reset = headers.get("x-rate-limit-reset")
+        return max(int(reset) - time.time(), 0) + 1 if reset else 900  # Full window if the header is missing
@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# Modules write app.log and config.json to the working directory and read DB_NAME at import,
+# so tests run in a scratch directory with their own database
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+sys.path.insert(0, ROOT)
+_workdir = tempfile.mkdtemp(prefix="narratives-tests-")
+os.environ.setdefault("DB_NAME", os.path.join(_workdir, "test.db"))
+os.environ.setdefault("INFERENCE_CACHE_DB", os.path.join(_workdir, "inference_cache.db"))
+os.chdir(_workdir)
+
+@pytest.fixture
+def db_name(tmp_path):
+    """A fully migrated, empty database."""
+    from migrations import migrate
+    path = str(tmp_path / "narratives.db")
+    migrate(path)
+    return path
@@ -0,0 +1,89 @@
+import pytest
+from db import insert_tweets
+from db_connection import get_connection
+from migrations import to_epoch
+from aggregates import rebuild_rollups, daily_means, keyword_time_series, sentiment_histogram, toxicity_escalation
+
+def _tweet(tweet_id, date, keywords="migration", sentiment=0.5, toxicity=0.2, danger=0.1):
+    return {"tweet_id": tweet_id, "text": "text", "date": date, "keywords": keywords,
+            "sentiment": sentiment, "toxicity_score": toxicity, "danger_score": danger}
+
+def _rollups(conn):
+    return (
+        conn.execute("SELECT * FROM daily_keyword_counts ORDER BY day, keyword").fetchall(),
+        conn.execute("SELECT * FROM daily_sentiment_buckets ORDER BY day, bucket").fetchall(),
+        conn.execute("SELECT * FROM daily_stats ORDER BY day").fetchall(),
+    )
+
+def test_inserts_update_the_rollups(db_name):
+    insert_tweets([
+        _tweet("1", "2024-05-13T08:00:00Z", "migration,asyl", 0.5, 0.2, 0.1),
+        _tweet("2", "2024-05-13T20:00:00Z", "migration", -1.0, 0.4, 0.3),
+        _tweet("3", "2024-05-14T08:00:00Z", "grenzen", 1.0, None, None),
+    ], db_name=db_name)
+    # Already stored tweets are not counted twice
+    insert_tweets([_tweet("1", "2024-05-13T08:00:00Z")], db_name=db_name)
+    keywords, buckets, stats = _rollups(get_connection(db_name))
+    assert keywords == [("2024-05-13", "asyl", 1), ("2024-05-13", "migration", 2), ("2024-05-14", "grenzen", 1)]
+    # 20 buckets over [-1, 1]; the bounds fall into the outermost buckets
+    assert buckets == [("2024-05-13", 0, 1), ("2024-05-13", 15, 1), ("2024-05-14", 19, 1)]
+    assert stats == [
+        ("2024-05-13", 2, -0.5, 2, pytest.approx(0.6), 2, pytest.approx(0.4), 2),
+        ("2024-05-14", 1, 1.0, 1, 0.0, 0, 0.0, 0),
+    ]
+
+def test_upsert_moves_the_contribution(db_name):
+    insert_tweets([_tweet("1", "2024-05-13T08:00:00Z", "migration", 0.5)], db_name=db_name)
+    insert_tweets([_tweet("1", "2024-05-14T08:00:00Z", "asyl", -0.5)], db_name=db_name, upsert=True)
+    keywords, buckets, stats = _rollups(get_connection(db_name))
+    assert keywords == [("2024-05-14", "asyl", 1)]
+    assert buckets == [("2024-05-14", 5, 1)]
+    assert [row[:2] for row in stats] == [("2024-05-14", 1)]
+
+def test_rebuild_matches_incremental_rollups(db_name):
+    insert_tweets([_tweet(str(i), f"2024-05-{10 + i % 3}T08:00:00Z", "migration,asyl" if i % 2 else "grenzen",
+                          i / 10 - 0.5, i / 20, i / 30) for i in range(10)], db_name=db_name)
+    conn = get_connection(db_name)
+    incremental = _rollups(conn)
+    rebuild_rollups(conn, batch_size=3)
+    assert _rollups(conn) == incremental
+
+def test_dashboard_queries(db_name):
+    insert_tweets([
+        _tweet("1", "2024-05-13T08:00:00Z", "migration", 0.5, 0.2, 0.1),
+        _tweet("2", "2024-05-13T20:00:00Z", "migration", -0.5, 0.4, 0.3),
+    ], db_name=db_name)
+    conn = get_connection(db_name)
+    means = daily_means(conn)
+    assert means['day'].tolist() == ["2024-05-13"]
+    assert means['tweet_count'].tolist() == [2]
+    assert means['sentiment'].tolist() == [0.0]
+    assert means['toxicity'].iloc[0] == pytest.approx(0.3)
+    assert keyword_time_series(conn)['migration'].tolist() == [2]
+    assert sentiment_histogram(conn)['count'].sum() == 2
+
+def test_toxicity_escalation_against_persisted_days(db_name):
+    insert_tweets([
+        _tweet("1", "2024-05-12T08:00:00Z", toxicity=0.2),
+        _tweet("2", "2024-05-13T08:00:00Z", toxicity=0.4),
+    ], db_name=db_name)
+    conn = get_connection(db_name)
+    rows = [
+        {"tweet_id": "3", "created_at": to_epoch("2024-05-13T12:00:00Z"), "toxicity_score": 0.6},
+        # Stored already, so it is not counted a second time
+        {"tweet_id": "2", "created_at": to_epoch("2024-05-13T08:00:00Z"), "toxicity_score": 0.4},
+        {"tweet_id": "4", "created_at": None, "toxicity_score": 0.9},
+    ]
+    results = toxicity_escalation(conn, rows)
+    assert results[0] == results[1] == (pytest.approx(0.5), pytest.approx(0.3))
+    assert results[2] == (0.9, 0.0)
+
+def test_toxicity_escalation_does_not_depend_on_batching(db_name):
+    conn = get_connection(db_name)
+    tweets = [_tweet(str(i), f"2024-05-{10 + i // 2}T0{i % 2}:00:00Z", toxicity=i / 10) for i in range(6)]
+    rows = [{"tweet_id": t["tweet_id"], "created_at": to_epoch(t["date"]), "toxicity_score": t["toxicity_score"]}
+            for t in tweets]
+    whole = toxicity_escalation(conn, rows)
+    # Store the first half, then score the second half against it
+    insert_tweets(tweets[:3], db_name=db_name)
+    assert toxicity_escalation(conn, rows[3:]) == pytest.approx(whole[3:])
@@ -0,0 +1,68 @@
+import pandas as pd
+import analyzer_refactored
+from analyzer_refactored import NarrativeAnalyzer
+
+class FakePool:
+    def __init__(self):
+        self.shut_down = False
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+def test_failed_parallel_analysis_falls_back_in_process(monkeypatch):
+    monkeypatch.setattr(NarrativeAnalyzer, "_load_models", lambda self: None)
+    monkeypatch.setattr(analyzer_refactored, "NARRATIVE_WORKER_CHUNK", 1)
+    analyzer = NarrativeAnalyzer(workers=2, load_topic_model=False)
+    pool = analyzer._pool = FakePool()
+
+    def fail(df, classifier_mode=None):
+        raise RuntimeError("worker crashed")
+
+    def annotate(df, classifier_mode=None):
+        df['sentiment'] = 0.0
+        df['narrative_type'] = "neutral"
+        return df
+
+    monkeypatch.setattr(analyzer, "_annotate_parallel", fail)
+    monkeypatch.setattr(analyzer, "annotate_texts", annotate)
+    monkeypatch.setattr(analyzer, "cluster_narratives", lambda df: (df, "model"))
+    monkeypatch.setattr(analyzer, "calculate_danger_score", lambda df: df)
+
+    df = pd.DataFrame({'text': ["a", "b"], 'date': pd.to_datetime(["2024-05-13", "2024-05-13"], utc=True)})
+    df, topic_model = analyzer.process_narratives(df)
+    assert topic_model == "model"
+    assert df['narrative_type'].tolist() == ["neutral", "neutral"]
+    assert pool.shut_down and analyzer._pool is None
+
+class FakeTopicModel:
+    def __init__(self):
+        self.fitted = False
+
+    def transform(self, texts):
+        return [0] * len(texts), None
+
+    def fit_transform(self, texts):
+        self.fitted = True
+        return [1] * len(texts), None
+
+def _analyzer(monkeypatch):
+    monkeypatch.setattr(NarrativeAnalyzer, "_load_models", lambda self: None)
+    return NarrativeAnalyzer(load_topic_model=False)
+
+def test_small_batch_without_model_stays_unassigned(monkeypatch, caplog):
+    monkeypatch.setattr(analyzer_refactored, "TOPIC_MIN_FIT_DOCS", 50)
+    analyzer = _analyzer(monkeypatch)
+    df, topic_model = analyzer.cluster_narratives(pd.DataFrame({'text': [f"tweet {i}" for i in range(10)]}))
+    assert topic_model is None and analyzer.topic_model is None
+    assert df['topic'].tolist() == [-1] * 10
+    assert analyzer.topic_stats()['unassigned_rate'] == 1.0
+    # No fit was attempted (and so nothing published)
+    assert "Error during clustering" not in caplog.text
+
+def test_refit_of_a_small_batch_keeps_the_current_model(monkeypatch):
+    monkeypatch.setattr(analyzer_refactored, "TOPIC_MIN_FIT_DOCS", 50)
+    analyzer = _analyzer(monkeypatch)
+    model = analyzer.topic_model = FakeTopicModel()
+    df, topic_model = analyzer.cluster_narratives(pd.DataFrame({'text': ["a", "b"]}), refit=True)
+    assert topic_model is model and not model.fitted
+    assert df['topic'].tolist() == [0, 0]
@@ -0,0 +1,71 @@
+import os
+import json
+import pytest
+
+pytest.importorskip("selenium")
+from conftest import FIXTURES
+from chromium_scraper import init_driver, extract_tweets, extract_from_html_file, parse_timeline_response
+
+@pytest.fixture(scope="module")
+def driver():
+    # Needs a local Chrome and CHROMEDRIVER_PATH, like the scraper itself
+    try:
+        driver = init_driver(headless=True)
+    except Exception as e:
+        pytest.skip(f"Chromium not available: {e}")
+    yield driver
+    driver.quit()
+
+class FakeDriver:
+    def __init__(self, items):
+        self.items = items
+        self.seen = None
+
+    def execute_script(self, script, seen_ids):
+        self.seen = seen_ids
+        return [item for item in self.items if item["tweet_id"] not in seen_ids]
+
+def test_extract_tweets_fills_defaults_and_seen_ids():
+    fake = FakeDriver([
+        {"tweet_id": "1", "text": "a", "user": "u1", "date": "2024-05-13T08:15:00.000Z"},
+        {"tweet_id": "2", "text": "b", "user": "u2", "date": None},
+    ])
+    seen = {"1"}
+    tweets = extract_tweets(fake, seen)
+    assert fake.seen == ["1"]
+    assert [tweet["tweet_id"] for tweet in tweets] == ["2"]
+    assert tweets[0]["date"]
+    assert (tweets[0]["followers"], tweets[0]["retweets"], tweets[0]["likes"]) == (0, 0, 0)
+    assert seen == {"1", "2"}
+
+def test_extract_from_saved_timeline(driver):
+    tweets = extract_from_html_file(driver, os.path.join(FIXTURES, "search_timeline.html"))
+    # The quoted tweet, the media-only tweet, the hidden article and the duplicate are skipped
+    assert tweets == [
+        {"tweet_id": "1790000000000000001", "text": "Neue Zahlen zur Migration an der Grenze #grenzenzu",
+         "user": "grenzbeobachter", "followers": 0, "retweets": 0, "likes": 0, "date": "2024-05-13T08:15:00.000Z"},
+        {"tweet_id": "1790000000000000002", "text": "Kommentar zur Asylpolitik",
+         "user": "asyl_debatte", "followers": 0, "retweets": 0, "likes": 0, "date": "2024-05-13T09:30:00.000Z"},
+    ]
+
+def test_parse_recorded_search_timeline():
+    with open(os.path.join(FIXTURES, "search_timeline.json"), encoding="utf-8") as f:
+        tweets = parse_timeline_response(f.read())
+    # The promoted entry, the quoted tweet and the cursors yield no tweets
+    assert tweets == [
+        {"tweet_id": "1790000000000000011", "text": "Neue Zahlen zur Migration an der Grenze #grenzenzu",
+         "user": "grenzbeobachter", "followers": 1520, "retweets": 12, "likes": 48,
+         "date": "2024-05-13T08:15:00+00:00"},
+        {"tweet_id": "1790000000000000013",
+         "text": "Kommentar zur Asylpolitik, Teil 1 von 2: ein langer Beitrag mit allen Details.",
+         "user": "asyl_debatte", "followers": 310, "retweets": 2, "likes": 7,
+         "date": "2024-05-13T09:30:00+00:00"},
+    ]
+
+def test_parse_skips_promoted_items_without_promoted_entry_id():
+    with open(os.path.join(FIXTURES, "search_timeline.json"), encoding="utf-8") as f:
+        payload = json.load(f)
+    entries = payload["data"]["search_by_raw_query"]["search_timeline"]["timeline"]["instructions"][0]["entries"]
+    entries[1]["entryId"] = "tweet-1790000000000000012"
+    assert [tweet["tweet_id"] for tweet in parse_timeline_response(payload)] == [
+        "1790000000000000011", "1790000000000000013"]
@@ -0,0 +1,48 @@
+import pytest
+import pandas as pd
+from db import insert_tweets
+from db_connection import get_connection
+
+def _tweet(tweet_id, text="text", **extra):
+    return {"tweet_id": tweet_id, "text": text, "user": "user", "date": "2024-05-13T08:15:00+00:00", **extra}
+
+def test_insert_tweets_counts_inserted_and_ignored(db_name):
+    assert insert_tweets([_tweet("1"), _tweet("2")], db_name=db_name) == (2, 0)
+    # One known tweet, one new one and a duplicate within the batch
+    assert insert_tweets([_tweet("2"), _tweet("3"), _tweet("3")], db_name=db_name) == (1, 2)
+    assert get_connection(db_name).execute("SELECT COUNT(*) FROM narratives").fetchone()[0] == 3
+
+def test_insert_tweets_ignores_rows_without_id(db_name):
+    assert insert_tweets([{"text": "no id"}], db_name=db_name) == (0, 0)
+    assert insert_tweets([], db_name=db_name) == (0, 0)
+
+def test_insert_tweets_keeps_first_version_unless_upserting(db_name):
+    insert_tweets([_tweet("1", "first")], db_name=db_name)
+    insert_tweets([_tweet("1", "second")], db_name=db_name)
+    conn = get_connection(db_name)
+    assert conn.execute("SELECT text FROM narratives WHERE tweet_id = '1'").fetchone()[0] == "first"
+    assert insert_tweets([_tweet("1", "third")], db_name=db_name, upsert=True) == (1, 0)
+    assert conn.execute("SELECT text FROM narratives WHERE tweet_id = '1'").fetchone()[0] == "third"
+
+def test_insert_tweets_from_dataframe(db_name):
+    df = pd.DataFrame([_tweet(101, toxicity=0.4, topic_id=3), _tweet(102, sentiment=float("nan"))])
+    assert insert_tweets(df, db_name=db_name) == (2, 0)
+    rows = get_connection(db_name).execute(
+        "SELECT tweet_id, toxicity_score, topic, sentiment, created_at FROM narratives ORDER BY tweet_id").fetchall()
+    # Aliased columns are mapped, NaN is stored as NULL and the date is converted to epoch seconds
+    assert rows[0][:3] == ("101", 0.4, 3)
+    assert rows[1][3] is None
+    assert rows[0][4] == 1715588100
+
+def test_upsert_of_partial_rows_keeps_stored_columns(db_name):
+    insert_tweets([_tweet("1", sentiment=0.7, topic=4, narrative_type="negative", danger_score=0.3)],
+                  db_name=db_name)
+    insert_tweets([_tweet("2")], db_name=db_name)
+    assert insert_tweets([{"tweet_id": "1", "danger_score": 0.9}, {"tweet_id": "3", "text": "neu"}],
+                         db_name=db_name, upsert=True) == (2, 0)
+    conn = get_connection(db_name)
+    assert conn.execute("SELECT text, sentiment, topic, narrative_type, danger_score, created_at FROM narratives "
+                        "WHERE tweet_id = '1'").fetchone() == ("text", 0.7, 4, "negative", 0.9, 1715588100)
+    # New rows still get the defaults
+    assert conn.execute("SELECT sentiment, topic FROM narratives WHERE tweet_id = '3'").fetchone() == (0.0, -1)
+    assert conn.execute("SELECT tweet_count, danger_sum FROM daily_stats").fetchone() == (2, pytest.approx(0.9))
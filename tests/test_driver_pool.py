@@ -0,0 +1,78 @@
+import json
+import pytest
+
+pytest.importorskip("selenium")
+from driver_pool import DriverPool
+
+class FakeDriver:
+    # Restored sessions are never logged in, so every new driver goes through the form login
+    current_url = "https://x.com/i/flow/login"
+
+    def __init__(self):
+        self.quit_called = False
+        self.cookies = []
+
+    def get(self, url):
+        pass
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def find_elements(self, by, selector):
+        return []
+
+    def execute_script(self, script, *args):
+        if "localStorage" in script and "return" in script:
+            return {"token": "abc"}
+        return 1
+
+    @property
+    def window_handles(self):
+        return ["main"]
+
+    def get_cookies(self):
+        return [{"name": "auth_token", "value": "secret"}]
+
+    def quit(self):
+        self.quit_called = True
+
+def _pool(tmp_path, logins):
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    pool = DriverPool(factory, lambda driver, log_fn: logins.append(driver),
+                      session_file=str(tmp_path / "session.json"), size=2, max_uses=10, max_memory_mb=0)
+    return pool, drivers
+
+def test_drivers_returned_after_close_are_quit(tmp_path):
+    pool, drivers = _pool(tmp_path, [])
+    with pool.driver() as leased:
+        with pool.driver() as idle:
+            pass
+        pool.close()
+        assert idle.quit_called and not leased.quit_called
+    assert leased.quit_called
+    assert pool._idle == [] and pool._alive == 0
+
+def test_drivers_are_reused_while_open(tmp_path):
+    pool, drivers = _pool(tmp_path, [])
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+    assert first is second and len(drivers) == 1
+    pool.close()
+    assert first.quit_called
+
+def test_corrupt_session_file_falls_back_to_login(tmp_path):
+    logins = []
+    pool, drivers = _pool(tmp_path, logins)
+    (tmp_path / "session.json").write_text('{"cookies": [')
+    with pool.driver() as driver:
+        assert logins == [driver]
+    with open(tmp_path / "session.json") as f:
+        assert json.load(f)["cookies"] == [{"name": "auth_token", "value": "secret"}]
+    pool.close()
@@ -0,0 +1,63 @@
+import numpy as np
+from embedding_store import EmbeddingStore
+
+class FakeEncoder:
+    """Deterministic 4-dimensional embeddings; counts the encoded texts."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, batch_size=64):
+        self.encoded += len(texts)
+        return np.array([[len(text), text.count("a"), text.count("e"), 1.0] for text in texts])
+
+def test_embed_encodes_each_text_once(tmp_path):
+    encoder = FakeEncoder()
+    store = EmbeddingStore(encoder, "fake", store_dir=str(tmp_path))
+    first = store.embed(["haus", "baum", "haus"], tweet_ids=["1", "2", "3"])
+    second = store.embed(["baum", "haus"])
+    assert encoder.encoded == 2
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second, first[[1, 0]])
+
+def test_hits_after_compaction_by_another_instance(tmp_path):
+    live = EmbeddingStore(FakeEncoder(), "fake", store_dir=str(tmp_path))
+    texts = ["eins", "zwei", "drei", "vier"]
+    expected = live.embed(texts, tweet_ids=["1", "2", "3", "4"])
+
+    # The scheduled retraining compacts through its own instance
+    retraining = EmbeddingStore(FakeEncoder(), "fake", store_dir=str(tmp_path))
+    assert retraining.compact(["3", "4"]) == 2
+
+    encoder = live.embedding_model
+    encoded_before = encoder.encoded
+    result = live.embed(["vier", "drei"])
+    assert encoder.encoded == encoded_before
+    np.testing.assert_array_equal(result, expected[[3, 2]])
+
+def test_hits_after_append_by_another_instance(tmp_path):
+    live = EmbeddingStore(FakeEncoder(), "fake", store_dir=str(tmp_path))
+    live.embed(["eins"])
+    other = EmbeddingStore(FakeEncoder(), "fake", store_dir=str(tmp_path))
+    appended = other.embed(["zwei", "drei"])
+    np.testing.assert_array_equal(live.embed(["drei", "zwei"]), appended[[1, 0]])
+
+class CompactingEncoder(FakeEncoder):
+    """Lets another instance compact the store while this one is encoding."""
+
+    def __init__(self, on_encode):
+        super().__init__()
+        self.on_encode = on_encode
+
+    def encode(self, texts, batch_size=64):
+        self.on_encode()
+        return super().encode(texts, batch_size)
+
+def test_compaction_during_encoding(tmp_path):
+    retraining = EmbeddingStore(FakeEncoder(), "fake", store_dir=str(tmp_path))
+    live = EmbeddingStore(CompactingEncoder(lambda: retraining.compact(["3"])), "fake", store_dir=str(tmp_path))
+    retraining.embed(["eins", "zwei", "drei"], tweet_ids=["1", "2", "3"])
+    # "drei" moves from row 2 to row 0 between the first lookup and the matrix read
+    result = live.embed(["drei", "neu"])
+    np.testing.assert_array_equal(result, FakeEncoder().encode(["drei", "neu"]).astype(np.float32))
+    np.testing.assert_array_equal(live.embed(["neu"]), result[[1]])
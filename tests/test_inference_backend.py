@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import types
+import threading
+import inference_backend
+
+class FakeModel:
+    exports = 0
+
+    @classmethod
+    def from_pretrained(cls, name, export=False):
+        cls.exports += 1
+        return cls()
+
+    def save_pretrained(self, path):
+        # Slow enough for concurrent callers to overlap
+        with open(os.path.join(path, "model.onnx"), "w") as f:
+            f.write("onnx")
+        time.sleep(0.2)
+        with open(os.path.join(path, "config.json"), "w") as f:
+            f.write("{}")
+
+class FakeTokenizer:
+    @classmethod
+    def from_pretrained(cls, name):
+        return cls()
+
+    def save_pretrained(self, path):
+        with open(os.path.join(path, "tokenizer.json"), "w") as f:
+            f.write("{}")
+
+def test_concurrent_exports_run_once_and_never_expose_partial_models(tmp_path, monkeypatch):
+    optimum = types.ModuleType("optimum")
+    onnxruntime = types.ModuleType("optimum.onnxruntime")
+    onnxruntime.ORTModelForSequenceClassification = FakeModel
+    onnxruntime.ORTQuantizer = None
+    transformers = types.ModuleType("transformers")
+    transformers.AutoTokenizer = FakeTokenizer
+    monkeypatch.setitem(sys.modules, "optimum", optimum)
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", onnxruntime)
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+
+    results = []
+
+    def export():
+        target = inference_backend.export_onnx("org/model", quantize=False, model_dir=str(tmp_path))
+        results.append(sorted(os.listdir(target)))
+
+    threads = [threading.Thread(target=export) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeModel.exports == 1
+    assert results == [["config.json", "model.onnx", "tokenizer.json"]] * 4
+    assert not os.path.exists(tmp_path / "org_model.tmp")
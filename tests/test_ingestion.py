@@ -0,0 +1,75 @@
+import ingestion
+from db import insert_tweets
+from lazy_loader import registry
+from scrape_cursors import get_cursor, update_cursor, filter_new
+from ingestion import new_job, scrape_job, analyze_job, store_job
+
+class FakeAnalyzer:
+    def __init__(self, topic_model=None, fail=False):
+        self.topic_model = topic_model
+        self.fail = fail
+
+    def process_narratives(self, df, classifier_mode=None):
+        if self.fail:
+            return df, None
+        df['topic'] = -1
+        df['danger_score'] = 0.0
+        return df, self.topic_model
+
+def _job():
+    job = new_job(["migration"], 10)
+    job["data"] = [{"tweet_id": "1", "text": "text", "date": "2024-05-13T08:15:00Z"}]
+    return job
+
+def test_analyze_job_keeps_batches_without_topic_model():
+    messages = []
+    job = analyze_job(_job(), FakeAnalyzer(), log_fn=messages.append)
+    assert job is not None and job["topic_model"] is None
+    assert job["df"]['topic'].tolist() == [-1]
+    assert len(messages) == 1
+
+def test_analyze_job_drops_failed_batches():
+    assert analyze_job(_job(), FakeAnalyzer(fail=True)) is None
+
+class FakeTwitterClient:
+    def __init__(self, tweets):
+        self.tweets = tweets
+
+    def scrape_x_data(self, keywords, limit=10, tweet_type="latest", since_id=None):
+        return [dict(tweet) for tweet in self.tweets]
+
+def _tweet(tweet_id):
+    return {"tweet_id": tweet_id, "text": "text", "user": "user", "date": "2024-05-13T08:15:00Z"}
+
+def test_overlapping_monitor_jobs_do_not_scrape_the_same_tweets(db_name, monkeypatch):
+    monkeypatch.setattr(ingestion, "insert_tweets", lambda df: insert_tweets(df, db_name=db_name))
+    monkeypatch.setattr(ingestion, "get_cursor", lambda method, keywords: get_cursor(method, keywords, db_name))
+    monkeypatch.setattr(ingestion, "filter_new", lambda tweets, since_id: filter_new(tweets, since_id, db_name))
+    monkeypatch.setattr(ingestion, "update_cursor",
+                        lambda method, keywords, tweets: update_cursor(method, keywords, tweets, db_name))
+    client = FakeTwitterClient([_tweet("100"), _tweet("101")])
+    monkeypatch.setattr(registry, "get", lambda name: client)
+
+    first = scrape_job(new_job(["migration"], 10, monitor=True))
+    assert [tweet["tweet_id"] for tweet in first["data"]] == ["100", "101"]
+    # Job 1 is still being analyzed while job 2 scrapes the same and one newer tweet
+    client.tweets.append(_tweet("102"))
+    second = scrape_job(new_job(["migration"], 10, monitor=True))
+    assert [tweet["tweet_id"] for tweet in second["data"]] == ["102"]
+
+    analyzer = FakeAnalyzer()
+    analyzer.detect_new_narratives = lambda df, topic_model: set()
+    for job in (first, second):
+        store_job(analyze_job(job, analyzer), analyzer)
+    assert get_cursor("API", ["migration"], db_name)[0] == "102"
+    assert scrape_job(new_job(["migration"], 10, monitor=True)) is None
+
+def test_failed_jobs_release_their_tweets(db_name, monkeypatch):
+    monkeypatch.setattr(ingestion, "get_cursor", lambda method, keywords: (None, None))
+    monkeypatch.setattr(ingestion, "filter_new", lambda tweets, since_id: filter_new(tweets, since_id, db_name))
+    monkeypatch.setattr(registry, "get", lambda name: FakeTwitterClient([_tweet("200")]))
+
+    job = scrape_job(new_job(["asyl"], 10, monitor=True))
+    assert analyze_job(job, FakeAnalyzer(fail=True)) is None
+    # The analysis failed, so the next job picks the tweet up again
+    assert [tweet["tweet_id"] for tweet in scrape_job(new_job(["asyl"], 10, monitor=True))["data"]] == ["200"]
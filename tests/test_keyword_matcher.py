@@ -0,0 +1,49 @@
+import json
+import os
+import pytest
+import config
+import keyword_matcher
+from keyword_matcher import KeywordMatcher, get_matcher, get_config_matcher, get_query_matcher
+
+def test_find_respects_word_boundaries_and_case():
+    matcher = KeywordMatcher(["Migration", "EU", "#grenzenzu"])
+    terms, count = matcher.find("MIGRATION und Migrationspolitik in der eu #GrenzenZu #grenzenzuu")
+    assert terms == ["Migration", "EU", "#grenzenzu"]
+    assert count == 3
+
+def test_longest_overlapping_term_wins():
+    matcher = KeywordMatcher(["EU", "EU funding"])
+    assert matcher.find("Kritik an EU funding") == (["EU funding"], 1)
+
+def test_annotate_and_empty_matcher():
+    tweets = [{"text": "Asyl und Grenzen"}, {"text": None}]
+    KeywordMatcher(["grenzen", "asyl"]).annotate(tweets)
+    assert [tweet["keywords"] for tweet in tweets] == ["grenzen,asyl", ""]
+    assert KeywordMatcher([]).find("Asyl") == ([], 0)
+
+def test_get_matcher_is_cached_per_term_list():
+    assert get_matcher(["a", "b"]) is get_matcher(["a", "b"])
+    assert get_matcher(["a", "b"]) is not get_matcher(["b", "a"])
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(config, "CONFIG_FILE", str(path))
+    monkeypatch.setattr(keyword_matcher, "CONFIG_FILE", str(path))
+    monkeypatch.setattr(keyword_matcher, "_config_state", {"mtime": None, "config": None})
+
+    def write(keywords, hashtags, mtime):
+        path.write_text(json.dumps({"keywords": keywords, "hashtags": hashtags}))
+        os.utime(path, (mtime, mtime))
+    return write
+
+def test_config_matcher_rebuilds_when_the_file_changes(config_file):
+    config_file(["asyl"], ["#remigration"], mtime=1000)
+    assert get_config_matcher("all").terms == ["asyl", "#remigration"]
+    config_file(["grenzen"], [], mtime=2000)
+    assert get_config_matcher("keywords").terms == ["grenzen"]
+
+def test_query_matcher_includes_config_hashtags(config_file):
+    config_file(["asyl"], ["#remigration"], mtime=1000)
+    terms, _ = get_query_matcher(["Migration"]).find("Migration #remigration jetzt")
+    assert terms == ["Migration", "#remigration"]
@@ -0,0 +1,43 @@
+import sqlite3
+from migrations import MIGRATIONS, migrate, to_epoch
+from db_connection import get_connection
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def test_migrate_creates_the_latest_schema(tmp_path):
+    db_name = str(tmp_path / "new.db")
+    assert migrate(db_name) == 6 == MIGRATIONS[-1][0]
+    conn = get_connection(db_name)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 6
+    assert {"narratives", "known_topics", "daily_keyword_counts", "daily_sentiment_buckets", "daily_stats",
+            "change_counters", "scrape_cursors"} <= _tables(conn)
+    # Running it again is a no-op
+    assert migrate(db_name) == 6
+
+def test_migrate_upgrades_a_legacy_database(tmp_path):
+    db_name = str(tmp_path / "legacy.db")
+    # Schema of the former db_utils.py, without created_at and with topic_id
+    legacy = sqlite3.connect(db_name)
+    legacy.execute("CREATE TABLE narratives (tweet_id TEXT PRIMARY KEY, text TEXT, date TEXT, topic_id INTEGER, "
+                   "keywords TEXT, sentiment REAL)")
+    legacy.executemany("INSERT INTO narratives VALUES (?, ?, ?, ?, ?, ?)", [
+        ("1", "a", "2024-05-13T08:15:00Z", 4, "migration", 0.5),
+        ("2", "b", "kein Datum", 7, "asyl", -0.5),
+    ])
+    legacy.commit()
+    legacy.close()
+
+    assert migrate(db_name, batch_size=1) == 6
+    conn = get_connection(db_name)
+    rows = conn.execute("SELECT tweet_id, topic, created_at FROM narratives ORDER BY tweet_id").fetchall()
+    assert rows == [("1", 4, to_epoch("2024-05-13T08:15:00Z")), ("2", 7, None)]
+    # The rollups are filled from the existing rows
+    assert conn.execute("SELECT day, tweet_count FROM daily_stats").fetchall() == [("2024-05-13", 1)]
+
+def test_to_epoch():
+    assert to_epoch("2024-05-13T08:15:00Z") == 1715588100
+    assert to_epoch("2024-05-13T08:15:00") == 1715588100
+    assert to_epoch(1715588100.7) == 1715588100
+    assert to_epoch("") is None
+    assert to_epoch(float("nan")) is None
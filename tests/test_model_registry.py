@@ -0,0 +1,50 @@
+import model_registry
+from model_registry import ModelRegistry
+
+class FakeModel:
+    """Stands in for an ONNX model: its size is the size of the weights file."""
+
+    def __init__(self, path):
+        self.model_path = path
+
+    def encode(self, texts):
+        return [len(text) for text in texts]
+
+def _registry(monkeypatch, tmp_path, budget_mb):
+    loads = []
+
+    def load(task, model_name, device, backend):
+        path = tmp_path / f"{model_name}.onnx"
+        path.write_bytes(b"\0" * 1024 * 1024)
+        loads.append(model_name)
+        return FakeModel(str(path))
+
+    monkeypatch.setitem(model_registry.LOADERS, "fake", load)
+    return ModelRegistry(memory_budget_mb=budget_mb), loads
+
+def test_handles_share_one_instance(monkeypatch, tmp_path):
+    registry, loads = _registry(monkeypatch, tmp_path, budget_mb=0)
+    first = registry.handle("fake", "a", device=-1)
+    second = registry.handle("fake", "a", device=-1)
+    with first as model_1, second as model_2:
+        assert model_1 is model_2
+        assert registry.stats()[first.key]["active"] == 2
+    assert loads == ["a"]
+    assert registry.stats()[first.key]["active"] == 0
+
+def test_idle_models_are_unloaded_over_budget(monkeypatch, tmp_path):
+    registry, loads = _registry(monkeypatch, tmp_path, budget_mb=1)
+    a = registry.handle("fake", "a", device=-1)
+    b = registry.handle("fake", "b", device=-1)
+    assert a.encode(["xy"]) == [2]
+    with a:
+        # "a" is in use, so loading "b" cannot evict it yet
+        b.encode(["x"])
+        assert a.key in registry.stats()
+    # "b" became idle first and is evicted on release; "a" fits the budget again
+    assert b.key not in registry.stats()
+    assert a.key in registry.stats()
+    assert registry.stats()["total_mb"] <= 1
+    a.encode(["x"])
+    b.encode(["x"])
+    assert loads == ["a", "b", "b"]
@@ -0,0 +1,87 @@
+import queue
+import threading
+import pytest
+from pipeline import Pipeline
+
+def test_close_finishes_queued_items_in_order():
+    results, order = [], []
+    lock = threading.Lock()
+
+    def step(name):
+        def fn(item):
+            with lock:
+                order.append((name, item))
+            return item
+        return fn
+
+    pipeline = (Pipeline("test", on_result=results.append)
+                .add_stage("first", step("first"))
+                .add_stage("second", step("second"))
+                .start())
+    for item in range(5):
+        pipeline.put(item)
+    pipeline.close()
+    assert results == list(range(5))
+    # Every item passed the first stage before the second one
+    for item in range(5):
+        assert order.index(("first", item)) < order.index(("second", item))
+    assert all(not thread.is_alive() for thread in pipeline._threads)
+
+def test_close_waits_for_all_workers_of_a_stage():
+    results = []
+    pipeline = (Pipeline("test", on_result=results.append)
+                .add_stage("parallel", lambda item: item * 2, workers=3)
+                .add_stage("store", lambda item: item)
+                .start())
+    for item in range(20):
+        pipeline.put(item)
+    pipeline.close()
+    assert sorted(results) == [item * 2 for item in range(20)]
+    assert pipeline.stats()["store"]["processed"] == 20
+
+def test_errors_and_dropped_items_are_counted():
+    def fn(item):
+        if item == "fail":
+            raise ValueError(item)
+        return None if item == "drop" else item
+
+    results = []
+    pipeline = Pipeline("test", on_result=results.append).add_stage("only", fn).start()
+    for item in ("ok", "drop", "fail", "ok"):
+        pipeline.put(item)
+    pipeline.close()
+    stats = pipeline.stats()["only"]
+    assert (stats["processed"], stats["dropped"], stats["errors"]) == (2, 1, 1)
+    assert results == ["ok", "ok"]
+
+def test_failing_on_result_does_not_hang_close():
+    def on_result(item):
+        if item == 1:
+            raise RuntimeError("callback failed")
+
+    pipeline = Pipeline("test", on_result=on_result).add_stage("only", lambda item: item).start()
+    for item in range(3):
+        pipeline.put(item)
+    closer = threading.Thread(target=pipeline.close)
+    closer.start()
+    closer.join(timeout=5)
+    assert not closer.is_alive()
+    assert pipeline.stats()["only"]["errors"] == 1
+
+def test_full_queue_blocks_the_producer():
+    release = threading.Event()
+    pipeline = (Pipeline("test")
+                .add_stage("slow", lambda item: release.wait(5) and item, maxsize=1)
+                .start())
+    pipeline.put(1)  # Taken by the worker, which then blocks
+    pipeline.put(2, timeout=1)  # Fills the queue
+    with pytest.raises(queue.Full):
+        pipeline.put(3, timeout=0.2)
+    release.set()
+    pipeline.close()
+
+def test_stages_cannot_be_added_after_start():
+    pipeline = Pipeline("test").add_stage("only", lambda item: item).start()
+    with pytest.raises(RuntimeError):
+        pipeline.add_stage("late", lambda item: item)
+    pipeline.close()
@@ -0,0 +1,27 @@
+import analyzer_refactored
+import scheduler
+from lazy_loader import registry
+
+class FakeAnalyzer:
+    topic_model = "old"
+
+def test_reload_topic_model_updates_a_loaded_analyzer(monkeypatch):
+    analyzer = FakeAnalyzer()
+    monkeypatch.setattr(registry, "is_loaded", lambda name: name == "analyzer")
+    monkeypatch.setattr(registry, "get", lambda name: analyzer)
+    monkeypatch.setattr(analyzer_refactored, "load_latest_topic_model", lambda: "new")
+    scheduler.reload_topic_model()
+    assert analyzer.topic_model == "new"
+
+def test_reload_topic_model_does_not_load_the_analyzer(monkeypatch):
+    monkeypatch.setattr(registry, "is_loaded", lambda name: False)
+    monkeypatch.setattr(registry, "get", lambda name: (_ for _ in ()).throw(AssertionError(name)))
+    scheduler.reload_topic_model()
+
+def test_start_scheduler_reloads_after_each_run():
+    running = scheduler.start_scheduler()
+    try:
+        assert [job.func for job in running.get_jobs()] == [scheduler.run_scheduled_update]
+        assert scheduler.reload_topic_model in [listener for listener, mask in running._listeners]
+    finally:
+        running.shutdown(wait=False)
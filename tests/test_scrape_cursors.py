@@ -0,0 +1,37 @@
+from db import insert_tweets
+from scrape_cursors import normalize_query, get_cursor, update_cursor, filter_new
+
+def _tweet(tweet_id, date="2024-05-13T08:15:00Z"):
+    return {"tweet_id": tweet_id, "text": "text", "date": date}
+
+def test_normalize_query_ignores_order_case_and_duplicates():
+    assert normalize_query(["Migration", " asyl", "migration", ""]) == "asyl,migration"
+
+def test_update_cursor_only_moves_forward(db_name):
+    assert get_cursor("API", ["migration"], db_name=db_name) == (None, None)
+    update_cursor("API", ["migration"], [_tweet("100"), _tweet("205", "2024-05-13T09:00:00Z"), _tweet("99")],
+                  db_name=db_name)
+    assert get_cursor("API", ["Migration"], db_name=db_name) == ("205", 1715590800)
+    # An older batch arriving late leaves the mark alone
+    update_cursor("API", ["migration"], [_tweet("150")], db_name=db_name)
+    assert get_cursor("API", ["migration"], db_name=db_name)[0] == "205"
+    # IDs compare numerically, not as strings
+    update_cursor("API", ["migration"], [_tweet("1000")], db_name=db_name)
+    assert get_cursor("API", ["migration"], db_name=db_name)[0] == "1000"
+
+def test_cursors_are_kept_per_method_and_query(db_name):
+    update_cursor("API", ["migration"], [_tweet("300")], db_name=db_name)
+    assert get_cursor("twscrape", ["migration"], db_name=db_name) == (None, None)
+    assert get_cursor("API", ["migration", "asyl"], db_name=db_name) == (None, None)
+
+def test_update_cursor_without_numeric_ids_is_a_no_op(db_name):
+    update_cursor("Chromium", ["migration"], [_tweet("abc"), {"text": "no id"}], db_name=db_name)
+    assert get_cursor("Chromium", ["migration"], db_name=db_name) == (None, None)
+
+def test_filter_new_drops_old_stored_and_duplicate_tweets(db_name):
+    insert_tweets([_tweet("120")], db_name=db_name)
+    scraped = [_tweet("90"), _tweet("130"), _tweet("120"), _tweet("100"), _tweet("130"), _tweet("140")]
+    assert [t["tweet_id"] for t in filter_new(scraped, since_id="100", db_name=db_name)] == ["130", "140"]
+    # Without a cursor only stored tweets and duplicates are dropped
+    assert [t["tweet_id"] for t in filter_new(scraped, db_name=db_name)] == ["90", "130", "100", "140"]
+    assert filter_new([], since_id="100", db_name=db_name) == []
@@ -0,0 +1,45 @@
+import pytest
+
+tweepy = pytest.importorskip("tweepy")
+import scraper
+from scraper import TwitterAPIClient
+
+class FakeResponse:
+    def __init__(self, reset):
+        self.headers = {"x-rate-limit-reset": str(reset)}
+        self.status_code = 429
+        self.reason = "Too Many Requests"
+        self.text = ""
+
+    def json(self):
+        return {}
+
+class RateLimitedClient:
+    def __init__(self, errors):
+        self.errors = errors
+        self.calls = 0
+
+    def search_recent_tweets(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.errors:
+            raise tweepy.TooManyRequests(FakeResponse(int(scraper.time.time()) + 600))
+        return "page"
+
+def _client(errors, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(scraper.time, "sleep", sleeps.append)
+    monkeypatch.setattr(scraper, "TWITTER_RATE_LIMIT_MAX_WAIT", 1800)
+    client = TwitterAPIClient.__new__(TwitterAPIClient)
+    client.client = RateLimitedClient(errors)
+    return client, sleeps
+
+def test_rate_limits_are_waited_out(monkeypatch):
+    client, sleeps = _client(2, monkeypatch)
+    assert client._search_page("q", 10, "latest", 3, None, None, None) == "page"
+    assert len(sleeps) == 2
+
+def test_persistent_rate_limit_gives_up(monkeypatch):
+    client, sleeps = _client(100, monkeypatch)
+    assert client._search_page("q", 10, "latest", 3, None, None, None) is None
+    # Two waits of ~600 s fit into the budget, the third does not
+    assert len(sleeps) == 2 and client.client.calls == 3
@@ -0,0 +1,47 @@
+import pytest
+import text_preprocessing
+from text_preprocessing import truncate_texts
+
+class FakeTokenizer:
+    """Fast-tokenizer stand-in: one token per whitespace-separated word, with character offsets."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, add_special_tokens=False, return_offsets_mapping=False, return_attention_mask=True):
+        self.calls.append(list(texts))
+        offsets = []
+        for text in texts:
+            spans, position = [], 0
+            for word in text.split():
+                start = text.index(word, position)
+                position = start + len(word)
+                spans.append((start, position))
+            offsets.append(spans)
+        return {"offset_mapping": offsets}
+
+@pytest.fixture
+def tokenizer(monkeypatch):
+    tokenizer = FakeTokenizer()
+    monkeypatch.setitem(text_preprocessing._tokenizers, "fake", tokenizer)
+    return tokenizer
+
+def test_truncate_texts_cuts_at_the_token_offset(tokenizer):
+    texts = ["eins zwei drei vier fünf", "ja", "a b c"]
+    assert truncate_texts(texts, max_tokens=3, tokenizer_name="fake") == ["eins zwei drei", "ja", "a b c"]
+    # Texts with at most max_tokens characters are never tokenized
+    assert tokenizer.calls == [["eins zwei drei vier fünf", "a b c"]]
+
+def test_truncate_texts_keeps_long_texts_within_the_limit(tokenizer):
+    text = "Migration " * 3
+    assert truncate_texts([text], max_tokens=3, tokenizer_name="fake") == [text]
+
+def test_truncate_texts_batches_and_keeps_order(tokenizer):
+    texts = [f"w{i} x y z" if i % 2 else str(i) for i in range(7)]
+    result = truncate_texts(texts, max_tokens=2, tokenizer_name="fake", batch_size=2)
+    assert result == [f"w{i} x" if i % 2 else str(i) for i in range(7)]
+    assert [len(call) for call in tokenizer.calls] == [2, 1]
+
+def test_truncate_texts_converts_non_strings(tokenizer):
+    assert truncate_texts([12, None], max_tokens=5, tokenizer_name="fake") == ["12", "None"]
+    assert tokenizer.calls == []
@@ -0,0 +1,31 @@
+import pickle
+import joblib
+import pytest
+
+pytest.importorskip("bertopic")
+import model_registry
+from topic_modeler import RegistryEmbedder, publish_model
+
+class FakeSentenceTransformer:
+    def encode(self, texts, show_progress_bar=False):
+        return [[float(len(text))] for text in texts]
+
+def test_registry_embedder_borrows_the_shared_model(monkeypatch):
+    monkeypatch.setitem(model_registry.LOADERS, "sentence-embedding",
+                        lambda task, model_name, device, backend: FakeSentenceTransformer())
+    registry = model_registry.ModelRegistry(memory_budget_mb=0)
+    monkeypatch.setattr(model_registry, "model_registry", registry)
+    monkeypatch.setattr("topic_modeler.model_registry", registry)
+
+    embedder = RegistryEmbedder("fake-model")
+    assert embedder.embed(["ab", "abc"]) == [[2.0], [3.0]]
+    # Nothing but the name ends up in a published model
+    restored = pickle.loads(pickle.dumps(embedder))
+    assert restored.model_name == "fake-model"
+    assert "FakeSentenceTransformer" not in repr(vars(restored))
+    assert all(entry["active"] == 0 for key, entry in registry.stats().items() if key != "total_mb")
+
+def test_publish_model_makes_the_new_version_latest(tmp_path):
+    version = publish_model({"topics": [0, 1]}, str(tmp_path))
+    assert (tmp_path / "latest_version.txt").read_text() == version
+    assert joblib.load(tmp_path / "versions" / f"model_{version}.pkl") == {"topics": [0, 1]}
@@ -0,0 +1,67 @@
+import threading
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename="app.log",
+    filemode="a",
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+DEFAULT_TOKENIZER = "bert-base-multilingual-cased"
+
+_tokenizers = {}
+_tokenizers_lock = threading.Lock()
+
+def get_tokenizer(name=DEFAULT_TOKENIZER):
+    """
+    Returns the process-wide fast (Rust) tokenizer of a model, loading it on first use.
+
+    Args:
+        name (str): Hugging Face model name.
+
+    Returns:
+        transformers.PreTrainedTokenizerFast: The shared tokenizer.
+    """
+    with _tokenizers_lock:
+        if name not in _tokenizers:
+            from transformers import AutoTokenizer
+            _tokenizers[name] = AutoTokenizer.from_pretrained(name, use_fast=True)
+        return _tokenizers[name]
+
+def truncate_texts(texts, max_tokens=510, tokenizer_name=DEFAULT_TOKENIZER, batch_size=256):
+    """
+    Truncates texts to a maximum number of tokens without altering the kept text.
+
+    Every token spans at least one character, so texts with at most ``max_tokens`` characters
+    are returned unchanged without tokenizing. The rest is tokenized in batches and cut at the
+    character offset where token ``max_tokens`` ends, so no detokenization is involved.
+
+    Args:
+        texts (Iterable): Input texts; non-strings are converted with ``str``.
+        max_tokens (int): Maximum number of tokens (without special tokens).
+        tokenizer_name (str): Model whose fast tokenizer defines the token count.
+        batch_size (int): Number of texts tokenized per call.
+
+    Returns:
+        list: Texts in the original order, long ones cut to ``max_tokens`` tokens.
+    """
+    texts = [text if isinstance(text, str) else str(text) for text in texts]
+    long_indices = [i for i, text in enumerate(texts) if len(text) > max_tokens]
+    if not long_indices:
+        return texts
+
+    tokenizer = get_tokenizer(tokenizer_name)
+    truncated = 0
+    for start in range(0, len(long_indices), batch_size):
+        chunk = long_indices[start:start + batch_size]
+        encoded = tokenizer([texts[i] for i in chunk], add_special_tokens=False,
+                            return_offsets_mapping=True, return_attention_mask=False)
+        for i, offsets in zip(chunk, encoded['offset_mapping']):
+            if len(offsets) > max_tokens:
+                texts[i] = texts[i][:offsets[max_tokens - 1][1]]
+                truncated += 1
+    if truncated:
+        logging.info(f"{truncated} of {len(texts)} texts truncated to {max_tokens} tokens.")
+    return texts
@@ -1,8 +1,10 @@
 import os
 import joblib
 from bertopic import BERTopic
-from sentence_transformers import SentenceTransformer
+from bertopic.backend import BaseEmbedder
+from model_registry import model_registry
 from filelock import FileLock
+from embedding_store import EmbeddingStore
 import logging
 import time
 
@@ -14,6 +16,64 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Sentence embedding model for topic modelling
+EMBEDDING_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+class RegistryEmbedder(BaseEmbedder):
+    """
+    BERTopic embedding backend that borrows the shared SentenceTransformer for each call.
+
+    Only the model name is kept, so published model pickles do not contain the transformer
+    and the model registry can still unload it between calls.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME):
+        """
+        Args:
+            model_name (str): Sentence embedding model acquired through the model registry.
+        """
+        super().__init__()
+        self.model_name = model_name
+
+    def embed(self, documents, verbose=False):
+        """
+        Encodes documents with the registry model.
+
+        Args:
+            documents (list): Texts to embed.
+            verbose (bool): Show a progress bar.
+
+        Returns:
+            np.ndarray: One embedding per document.
+        """
+        handle = model_registry.handle("sentence-embedding", self.model_name, device=None)
+        return handle.encode(list(documents), show_progress_bar=verbose)
+
+def publish_model(model, model_dir='models'):
+    """
+    Save a model as a new version and make it the latest one.
+
+    Needs no embedding model or store, so fitted models can be published from anywhere.
+
+    Args:
+        model (BERTopic): The fitted BERTopic model.
+        model_dir (str): Directory where model versions are saved. Defaults to 'models'.
+
+    Returns:
+        str: The new version identifier.
+    """
+    versions_dir = os.path.join(model_dir, 'versions')
+    os.makedirs(versions_dir, exist_ok=True)
+    version = str(int(time.time()))
+    with FileLock(os.path.join(model_dir, 'model.lock')):
+        model_path = os.path.join(versions_dir, f'model_{version}.pkl')
+        joblib.dump(model, model_path)
+        logging.info(f"Saved model version {version} to {model_path}")
+        with open(os.path.join(model_dir, 'latest_version.txt'), 'w') as f:
+            f.write(version)
+        logging.info(f"Updated latest model version to {version}")
+    return version
+
 class TopicModeler:
     """
     A class to handle topic modeling using BERTopic, with support for multilingual data,
@@ -36,7 +96,13 @@ class TopicModeler:
         os.makedirs(self.versions_dir, exist_ok=True)
 
         # Use a multilingual embedding model for sentence transformation
-        self.embedding_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+        self.embedding_model_name = EMBEDDING_MODEL_NAME
+        # Shared SentenceTransformer instance; loaded on first encode, device chosen automatically
+        self.embedding_model = model_registry.handle("sentence-embedding", self.embedding_model_name, device=None)
+
+        # Embeddings are cached on disk so retraining only encodes new texts
+        self.embedding_store = EmbeddingStore(self.embedding_model, self.embedding_model_name,
+                                              store_dir=os.path.join(model_dir, 'embeddings'))
 
         # Load the latest model version
         self.topic_model = self._load_latest_model()
@@ -71,74 +137,82 @@ class TopicModeler:
                 logging.error(f"Error loading model version {latest_version}: {e}")
         return None
 
-    def _save_model(self, model, version):
+    def publish(self, model):
         """
-        Save the model with a specific version identifier.
+        Save a model as a new version of this modeler's directory (see publish_model).
 
         Args:
-            model (BERTopic): The BERTopic model to save.
-            version (str): The version identifier.
+            model (BERTopic): The fitted BERTopic model.
+
+        Returns:
+            str: The new version identifier.
         """
-        model_path = os.path.join(self.versions_dir, f'model_{version}.pkl')
-        joblib.dump(model, model_path)
-        logging.info(f"Saved model version {version} to {model_path}")
+        return publish_model(model, self.model_dir)
 
-    def _update_latest_version(self, version):
+    def embed(self, texts, tweet_ids=None):
         """
-        Update the tracking file with the latest model version.
+        Retrieve embeddings for texts from the embedding store, encoding only unseen texts.
 
         Args:
-            version (str): The version identifier to set as latest.
+            texts (list): List of text strings.
+            tweet_ids (list, optional): Tweet IDs belonging to the texts.
+
+        Returns:
+            np.ndarray: Embedding matrix with one row per text.
         """
-        with open(self.latest_version_file, 'w') as f:
-            f.write(version)
-        logging.info(f"Updated latest model version to {version}")
+        embeddings = self.embedding_store.embed(texts, tweet_ids)
+        stats = self.embedding_store.stats()
+        logging.info(f"Embedding store hit rate: {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)")
+        return embeddings
 
-    def assign_topics(self, texts):
+    def assign_topics(self, texts, tweet_ids=None):
         """
         Assign topics to a list of texts using the current topic model.
         If no model exists, initialize and fit a new one.
 
         Args:
             texts (list): List of text strings to assign topics to.
+            tweet_ids (list, optional): Tweet IDs belonging to the texts.
 
         Returns:
             list: Topic IDs assigned to each text.
         """
+        texts = list(texts)
+        embeddings = self.embed(texts, tweet_ids)
         if self.topic_model is None:
-            # Initialize a new BERTopic model with multilingual support
+            # Initialize a new BERTopic model with multilingual support; embeddings come from the
+            # store, the embedder is only needed for texts transformed without precomputed embeddings
             self.topic_model = BERTopic(
-                embedding_model=self.embedding_model,
+                embedding_model=RegistryEmbedder(self.embedding_model_name),
                 language="multilingual",
                 verbose=True
             )
-            topics, _ = self.topic_model.fit_transform(texts)
-            version = str(int(time.time()))
-            with FileLock(self.lock_file):
-                self._save_model(self.topic_model, version)
-                self._update_latest_version(version)
+            topics, _ = self.topic_model.fit_transform(texts, embeddings=embeddings)
+            self.publish(self.topic_model)
         else:
             # Use the existing model to assign topics without retraining
-            topics, _ = self.topic_model.transform(texts)
+            topics, _ = self.topic_model.transform(texts, embeddings=embeddings)
         return topics
 
-    def update_model(self, texts):
+    def update_model(self, texts, tweet_ids=None):
         """
-        Update the topic model incrementally with new texts.
+        Refit the topic model on new texts and publish it as the latest version.
+
+        Besides the initial fit this is the only place where topics are refitted; live
+        batches are only transformed (see NarrativeAnalyzer.cluster_narratives).
 
         Args:
             texts (list): List of text strings to update the model with.
+            tweet_ids (list, optional): Tweet IDs belonging to the texts.
         """
         if self.topic_model is None:
             # If no model exists, assign topics (which initializes the model)
-            self.assign_topics(texts)
+            self.assign_topics(texts, tweet_ids)
         else:
-            # Update the existing model with new data
-            self.topic_model.partial_fit(texts)
-            version = str(int(time.time()))
-            with FileLock(self.lock_file):
-                self._save_model(self.topic_model, version)
-                self._update_latest_version(version)
+            # Refit with the model's own components; the default UMAP/HDBSCAN models do not support partial_fit
+            texts = list(texts)
+            self.topic_model.fit_transform(texts, embeddings=self.embed(texts, tweet_ids))
+            self.publish(self.topic_model)
 
     def get_topic(self, topic_id):
         """
@@ -1,10 +1,11 @@
 # twscrape_scraper.py
 import os
-from twscrape import API, gather
+import weakref
+from twscrape import API
 import logging
+from keyword_matcher import get_query_matcher
 from dotenv import load_dotenv
 import asyncio
-import time
 
 # Load environment variables from .env file
 load_dotenv()
@@ -25,15 +26,29 @@ logging.basicConfig(
 # Initialize the API pool once (reused across multiple scrapes)
 api = API()
 
-# Delay between requests (in seconds)
+# Delay between result pages of one query (in seconds); other queries keep running meanwhile
 REQUEST_DELAY = 10  # Adjust this value based on observations
+# Tweets per search result page
+PAGE_SIZE = 20
+# Queries running at the same time (roughly the number of accounts in the pool)
+MAX_CONCURRENT_QUERIES = 2
+# Keywords/hashtags OR-ed into one query
+TERMS_PER_QUERY = 5
 
-async def scrape_x_data(keywords, limit=100, tweet_type="latest"):
-    """Scrape tweets using twscrape with error handling and rate limit management."""
-    if not all([TWITTER_USERNAME, TWITTER_PASSWORD, TWITTER_EMAIL]):
-        raise ValueError("Twitter credentials for twscrape are missing in .env file.")
+# Accounts are added and logged in once per process, not on every scrape
+_session_ready = False
+_session_locks = weakref.WeakKeyDictionary()
 
-    try:
+async def ensure_session():
+    """Adds the configured account to the pool and logs in, once per process."""
+    global _session_ready
+    loop = asyncio.get_running_loop()
+    lock = _session_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        if _session_ready:
+            return
+        if not all([TWITTER_USERNAME, TWITTER_PASSWORD, TWITTER_EMAIL]):
+            raise ValueError("Twitter credentials for twscrape are missing in .env file.")
         # Attempt to add the account; handle case where it already exists
         try:
             await api.pool.add_account(TWITTER_USERNAME, TWITTER_PASSWORD, TWITTER_EMAIL, TWITTER_PASSWORD)
@@ -47,36 +62,106 @@ async def scrape_x_data(keywords, limit=100, tweet_type="latest"):
 
         # Log in to all accounts (refreshes sessions if needed)
         await api.pool.login_all()
+        _session_ready = True
         logging.info("Logged in to all accounts successfully.")
 
-        # Construct query: keywords OR-ed, German language, no retweets
-        query = " OR ".join(keywords) + " lang:de -is:retweet"
-        logging.info(f"Scraping tweets with query: {query}, limit: {limit}")
-
-        # Scrape tweets with a delay between requests
-        tweets = []
-        batch_size = 10  # Number of tweets per request
-        for _ in range((limit + batch_size - 1) // batch_size):  # Ceiling division
-            batch = await gather(api.search(query, limit=batch_size))
-            tweets.extend(batch)
-            if len(tweets) >= limit:
-                break
-            time.sleep(REQUEST_DELAY)  # Delay between requests
-
-        # Process tweets into the expected dictionary format
+def build_queries(terms, terms_per_query=TERMS_PER_QUERY, since_id=None):
+    """
+    Splits keywords and hashtags into several search queries.
+
+    Args:
+        terms (list): Keywords and hashtags.
+        terms_per_query (int): Terms OR-ed into one query.
+        since_id (str, optional): Only search tweets newer than this ID.
+
+    Returns:
+        list: Queries restricted to German tweets without retweets.
+    """
+    terms = list(dict.fromkeys(term for term in terms if term))
+    suffix = " lang:de -is:retweet" + (f" since_id:{since_id}" if since_id else "")
+    return ["(" + " OR ".join(terms[i:i + terms_per_query]) + ")" + suffix
+            for i in range(0, len(terms), terms_per_query)]
+
+def tweet_to_dict(tweet):
+    """Converts a twscrape tweet into the dictionary format shared by all scrapers."""
+    return {
+        "tweet_id": str(tweet.id),
+        "text": tweet.rawContent,
+        "user": tweet.user.username,
+        "followers": tweet.user.followersCount,
+        "retweets": tweet.retweetCount,
+        "likes": tweet.likeCount,
+        "date": tweet.date.isoformat()
+    }
+
+async def iter_tweets(queries, limit=100, tweet_type="latest", concurrency=MAX_CONCURRENT_QUERIES):
+    """
+    Streams tweets of several queries, following the search pagination of each.
+
+    Queries run concurrently (bounded by a semaphore) and pause between result pages
+    without blocking the event loop. Tweets matching several queries are yielded once.
+
+    Args:
+        queries (list): Search queries, e.g. from build_queries.
+        limit (int): Maximum number of distinct tweets in total.
+        tweet_type (str): 'latest'/'recent' for the live timeline, 'top'/'popular' for top tweets.
+        concurrency (int): Maximum number of queries running at the same time.
+
+    Yields:
+        twscrape.models.Tweet: Each distinct tweet as soon as it arrives.
+    """
+    await ensure_session()
+    product = "Top" if tweet_type in ("top", "popular") else "Latest"
+    queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+    finished = object()
+
+    async def run_query(query):
+        fetched = 0
+        try:
+            async with semaphore:
+                async for tweet in api.search(query, limit=limit, kv={"product": product}):
+                    queue.put_nowait(tweet)
+                    fetched += 1
+                    if fetched % PAGE_SIZE == 0:
+                        await asyncio.sleep(REQUEST_DELAY)  # Delay between pages
+            logging.info(f"Query '{query}' finished with {fetched} tweets.")
+        except Exception as e:
+            logging.error(f"Error during twscrape query '{query}': {e}")
+        finally:
+            queue.put_nowait(finished)
+
+    tasks = [asyncio.create_task(run_query(query)) for query in queries]
+    running = len(tasks)
+    seen = set()
+    try:
+        while running and len(seen) < limit:
+            item = await queue.get()
+            if item is finished:
+                running -= 1
+            elif item.id not in seen:
+                seen.add(item.id)
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def scrape_x_data(keywords, limit=100, tweet_type="latest", hashtags=(), since_id=None):
+    """Scrape tweets using twscrape with error handling and rate limit management."""
+    await ensure_session()
+    try:
+        queries = build_queries(list(keywords) + list(hashtags), since_id=since_id)
+        logging.info(f"Scraping tweets with {len(queries)} queries: {queries}, limit: {limit}")
+
         tweet_list = []
-        for tweet in tweets[:limit]:
-            tweet_data = {
-                "tweet_id": str(tweet.id),
-                "text": tweet.rawContent,
-                "user": tweet.user.username,
-                "followers": tweet.user.followersCount,
-                "retweets": tweet.retweetCount,
-                "likes": tweet.likeCount,
-                "date": tweet.date.isoformat(),
-                "keywords": ",".join([kw for kw in keywords if kw.lower() in tweet.rawContent.lower()])
-            }
-            tweet_list.append(tweet_data)
+        stream = iter_tweets(queries, limit=limit, tweet_type=tweet_type)
+        try:
+            async for tweet in stream:
+                tweet_list.append(tweet_to_dict(tweet))
+        finally:
+            await stream.aclose()
+        get_query_matcher(list(keywords) + list(hashtags)).annotate(tweet_list)
 
         logging.info(f"Scraped {len(tweet_list)} tweets successfully.")
         return tweet_list
@@ -3,18 +3,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
 import time
-from scraper import TwitterAPIClient
-from chromium_scraper import scrape_x_data as chromium_scrape
-from twscrape_scraper import scrape_x_data as twscrape_scrape
-from analyzer_refactored import NarrativeAnalyzer, load_latest_topic_model
-from narrative_analyzer import NarrativeAnalyzer
-from db import insert_tweet
-from config import KEYWORDS
-import pandas as pd
-from dashboard import launch_dashboard
-from generate_pdf_report import generate_pdf_report
+from lazy_loader import registry
+from ingestion import SCRAPING_METHODS, new_job, build_pipeline
+from config import NARRATIVE_CLASSIFIER, MONITOR_INTERVAL, MONITOR_LIMIT
+from keyword_matcher import config_keywords
 import logging
-import asyncio
 import json
 import os
 
@@ -29,7 +22,8 @@ logging.basicConfig(
 class MigrationAnalyzerApp:
     def __init__(self, root, analyzer=None):
         self.root = root
-        self.analyzer = NarrativeAnalyzer() if analyzer is None else analyzer
+        # Models are loaded on first use (see lazy_loader.py), not when the window opens
+        self._analyzer = analyzer
         self.root.title("Migration Narrative Analyzer")
         self.root.geometry("1000x700")
         self.root.configure(bg="#1E1E1E")
@@ -61,7 +55,7 @@ class MigrationAnalyzerApp:
         # Keyword input
         ttk.Label(main_frame, text="🔍 Keywords (comma-separated):").pack(pady=5)
         self.keyword_entry = ttk.Entry(main_frame, width=70, font=("Arial", 11))
-        self.keyword_entry.insert(0, ",".join(KEYWORDS))
+        self.keyword_entry.insert(0, ",".join(config_keywords()))
         self.keyword_entry.pack()
 
         # Tweet type selection
@@ -82,6 +76,12 @@ class MigrationAnalyzerApp:
         self.scraping_method.set("API")
         self.scraping_method.pack()
 
+        # Narrative classifier selection
+        ttk.Label(main_frame, text="🧠 Classifier:").pack(pady=5)
+        self.classifier_mode = ttk.Combobox(main_frame, values=["zero-shot", "prototype"], state="readonly", width=20)
+        self.classifier_mode.set(NARRATIVE_CLASSIFIER)
+        self.classifier_mode.pack()
+
         # Label für letzte Aktualisierung
         self.last_update_label = ttk.Label(main_frame, text="Modell zuletzt aktualisiert am: N/A")
         self.last_update_label.pack(pady=5)
@@ -118,6 +118,17 @@ class MigrationAnalyzerApp:
         # Initial log message
         self.result_text.insert("end", "🚀 Application initialized. Ready for your input!\n")
 
+    @property
+    def analyzer(self):
+        """Returns the analyzer, loading its models on first access."""
+        if self._analyzer is None:
+            self._analyzer = registry.get("analyzer")
+        return self._analyzer
+
+    @analyzer.setter
+    def analyzer(self, value):
+        self._analyzer = value
+
     def log(self, message):
         """Log messages to the UI."""
         self.result_text.insert("end", f"{message}\n")
@@ -132,10 +143,12 @@ class MigrationAnalyzerApp:
     def _run_retrain(self):
         """Führt das Re-Training im Hintergrund aus."""
         from update_models import update_topic_model
+        from analyzer_refactored import load_latest_topic_model
         update_topic_model()
         self.update_last_update_label()
         self.log("✅ Modell-Retraining abgeschlossen.")
-        self.analyzer.topic_model = load_latest_topic_model()  # Neuestes Modell laden
+        if self._analyzer is not None:
+            self._analyzer.topic_model = load_latest_topic_model()  # Neuestes Modell laden
 
     def update_last_update_label(self):
         """Aktualisiert das Label mit dem letzten Trainingsdatum."""
@@ -149,44 +162,50 @@ class MigrationAnalyzerApp:
 
     # Restliche Methoden bleiben unverändert...
 
+    def _build_pipeline(self, name):
+        """Creates the scrape -> analyze -> store pipeline shared by historical analysis and monitoring."""
+        return build_pipeline(name, lambda: self.analyzer, log_fn=self.log, on_result=self._on_job_stored)
+
+    def _new_job(self, limit, monitor=False):
+        """Captures the current UI inputs, so later changes do not affect queued jobs."""
+        keywords = [kw.strip() for kw in self.keyword_entry.get().split(",") if kw.strip()] or config_keywords()
+        return new_job(keywords, limit, tweet_type=self.tweet_type.get(), method=self.scraping_method.get(),
+                       classifier_mode=self.classifier_mode.get(), monitor=monitor)
+
+    def _on_job_stored(self, job):
+        self.df, self.topic_model = job["df"], job["topic_model"]
+        if job["monitor"]:
+            self.log(f"✅ Processed {len(job['data'])} new tweets ({job['inserted']} stored).")
+        else:
+            self.log(f"💾 {job['inserted']} tweets stored, {job['ignored']} already known.")
+
+    def _log_pipeline_stats(self, pipeline):
+        for name, stats in pipeline.stats().items():
+            self.log(f"⏱ {name}: {stats['processed']} jobs, {stats['busy_seconds']:.1f}s busy, "
+                     f"queue {stats['queue_depth']}, {stats['errors']} errors")
+
     def run_historical_analysis(self):
         def thread_task():
             try:
                 self.start_analysis_button.config(state=tk.DISABLED)
-                self.log("📥 Starting historical analysis...")
-                keywords = [kw.strip() for kw in self.keyword_entry.get().split(",") if kw.strip()] or KEYWORDS
-                limit = int(self.limit_entry.get()) if self.limit_entry.get().isdigit() else 100
-                tweet_type = self.tweet_type.get()
-                method = self.scraping_method.get()
-
-                # Select scraping method
-                if method == "API":
-                    data = TwitterAPIClient().scrape_x_data(keywords, limit=limit, tweet_type=tweet_type)
-                elif method == "Chromium":
-                    data = chromium_scrape(keywords, limit=limit, tweet_type=tweet_type, log_fn=self.log)
-                elif method == "twscrape":
-                    data = asyncio.run(twscrape_scrape(keywords, limit=limit, tweet_type=tweet_type))
-                else:
+                if self.scraping_method.get() not in SCRAPING_METHODS:
                     self.log("❌ Invalid scraping method selected.")
                     return
-
-                if not data:
+                self.log("📥 Starting historical analysis...")
+                limit = int(self.limit_entry.get()) if self.limit_entry.get().isdigit() else 100
+                pipeline = self._build_pipeline("historical")
+                pipeline.put(self._new_job(limit))
+                pipeline.close()
+                self._log_pipeline_stats(pipeline)
+                stats = pipeline.stats()
+                if stats["store"]["processed"]:
+                    self.log("✅ Historical analysis completed.")
+                elif stats["scrape"]["dropped"]:
                     self.log("⚠ No tweets found. Try broader keywords or check configuration.")
                     messagebox.showwarning("Warning", "No tweets found. Please check inputs.")
-                    return
-
-                df = pd.DataFrame(data)
-                df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce')
-                self.df, self.topic_model = self.analyzer.process_narratives(df)
-                if self.topic_model is None:
-                    self.log("⚠ Topic model creation failed. Check data or models.")
-                    return
-                unseen_topics = self.analyzer.detect_new_narratives(self.df, self.topic_model)
-                if unseen_topics:
-                    self.log(f"⚠ New narratives detected: {list(unseen_topics)}")
-                for _, tweet in self.df.iterrows():
-                    insert_tweet(tweet.to_dict())
-                self.log("✅ Historical analysis completed.")
+                elif any(stage["errors"] for stage in stats.values()):
+                    self.log("❌ Historical analysis failed, see app.log.")
+                    messagebox.showerror("Error", "Historical analysis failed, see app.log.")
             except Exception as e:
                 logging.error(f"Error in historical analysis: {e}")
                 self.log(f"❌ Error: {e}")
@@ -204,39 +223,20 @@ class MigrationAnalyzerApp:
         self.log("📡 Live monitoring started...")
 
         def monitor():
-            while self.monitoring_active:
-                try:
-                    keywords = [kw.strip() for kw in self.keyword_entry.get().split(",") if kw.strip()] or KEYWORDS
-                    limit = 10
-                    tweet_type = self.tweet_type.get()
-                    method = self.scraping_method.get()
-
-                    # Select scraping method
-                    if method == "API":
-                        data = TwitterAPIClient().scrape_x_data(keywords, limit=limit, tweet_type=tweet_type)
-                    elif method == "Chromium":
-                        data = chromium_scrape(keywords, limit=limit, tweet_type=tweet_type, log_fn=self.log)
-                    elif method == "twscrape":
-                        data = asyncio.run(twscrape_scrape(keywords, limit=limit, tweet_type=tweet_type))
-                    else:
-                        self.log("❌ Invalid scraping method selected.")
-                        return
-
-                    if data:
-                        df = pd.DataFrame(data)
-                        df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce')
-                        self.df, self.topic_model = self.analyzer.process_new_data()
-                        if self.topic_model:
-                            unseen_topics = self.analyzer.detect_new_narratives(self.df, self.topic_model)
-                            if unseen_topics:
-                                self.log(f"⚠ New narratives detected: {list(unseen_topics)}")
-                            for _, tweet in self.df.iterrows():
-                                insert_tweet(tweet.to_dict())
-                            self.log(f"✅ Processed {len(data)} new tweets.")
-                except Exception as e:
-                    self.log(f"❌ Monitoring error: {e}")
-                    logging.error(f"Monitoring error: {e}")
-                time.sleep(60)  # Configurable interval
+            # The next scrape runs while the previous batch is analyzed; a full queue delays it
+            pipeline = self._build_pipeline("monitor")
+            try:
+                while self.monitoring_active:
+                    pipeline.put(self._new_job(MONITOR_LIMIT, monitor=True))
+                    deadline = time.monotonic() + MONITOR_INTERVAL
+                    while self.monitoring_active and time.monotonic() < deadline:
+                        time.sleep(1)
+            except Exception as e:
+                self.log(f"❌ Monitoring error: {e}")
+                logging.error(f"Monitoring error: {e}")
+            finally:
+                pipeline.close()
+                self._log_pipeline_stats(pipeline)
 
         threading.Thread(target=monitor, daemon=True).start()
 
@@ -248,7 +248,7 @@ class MigrationAnalyzerApp:
 
     def run_visualization(self):
         self.log("📊 Starting dashboard...")
-        threading.Thread(target=launch_dashboard, daemon=True).start()
+        threading.Thread(target=lambda: registry.get("dashboard")(), daemon=True).start()
 
     def generate_report(self):
         if self.df is None or self.topic_model is None:
@@ -256,10 +256,9 @@ class MigrationAnalyzerApp:
             messagebox.showwarning("Warning", "No data or model available. Please run an analysis first.")
             return
         self.log("📄 Generating report...")
-        threading.Thread(target=generate_pdf_report, args=(self.df, self.topic_model), daemon=True).start()
+        threading.Thread(target=lambda: registry.get("report_generator")(self.df, self.topic_model), daemon=True).start()
 
 if __name__ == "__main__":
     root = tk.Tk()
-    analyzer = NarrativeAnalyzer()
-    app = MigrationAnalyzerApp(root, analyzer)
+    app = MigrationAnalyzerApp(root)
     root.mainloop()
\ No newline at end of file
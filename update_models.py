@@ -1,8 +1,8 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import pandas as pd
-import sqlite3
-from ml_components import EmbeddingGenerator, TopicModeler
-from config import DB_NAME
+from topic_modeler import TopicModeler
+from config import DB_NAME, TOPIC_MIN_FIT_DOCS
+from db_connection import read_connection
 import logging
 
 logging.basicConfig(
@@ -14,20 +14,26 @@ logging.basicConfig(
 
 def update_topic_model():
     """Update the topic model with data from the last 7 days."""
-    embedding_generator = EmbeddingGenerator()
-    topic_modeler = TopicModeler(embedding_generator)
+    topic_modeler = TopicModeler()
 
-    with sqlite3.connect(DB_NAME) as conn:
-        seven_days_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-        df = pd.read_sql_query(f"SELECT text FROM narratives WHERE date >= '{seven_days_ago}'", conn)
+    with read_connection(DB_NAME) as conn:
+        seven_days_ago = int((datetime.now(timezone.utc) - timedelta(days=7)).timestamp())
+        # Served by idx_narratives_created_at instead of a string comparison over every row
+        df = pd.read_sql_query("SELECT tweet_id, text FROM narratives WHERE created_at >= ?", conn,
+                               params=(seven_days_ago,))
 
     if df.empty:
         logging.info("No new data from the last 7 days. Skipping update.")
         return
+    if len(df) < TOPIC_MIN_FIT_DOCS:
+        logging.info(f"Only {len(df)} tweets from the last 7 days, at least {TOPIC_MIN_FIT_DOCS} needed. Skipping update.")
+        return
 
-    texts = df['text'].tolist()
-    topic_modeler.partial_fit(texts)
-    logging.info("Weekly topic model update completed.")
+    # Only texts that are not yet in the embedding store are encoded
+    topic_modeler.update_model(df['text'].tolist(), tweet_ids=df['tweet_id'].tolist())
+    # Embeddings outside the training window are no longer needed
+    topic_modeler.embedding_store.compact(df['tweet_id'].tolist())
+    logging.info(f"Weekly topic model update completed. Embedding store: {topic_modeler.embedding_store.stats()}")
 
 if __name__ == "__main__":
     update_topic_model()
\ No newline at end of file
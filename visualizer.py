@@ -1,5 +1,4 @@
 import pandas as pd
-import sqlite3
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
@@ -10,6 +9,9 @@ import threading
 import webbrowser
 import time
 from config import DB_NAME
+from db_connection import read_connection
+from aggregates import keyword_time_series
+from query_cache import cached_read
 from generate_pdf_report import generate_pdf_report
 
 import os
@@ -38,8 +40,8 @@ def launch_dashboard(result_text, root):
 ")
 
     result_text.insert("end", "📦 Lade Dashboard...")
-    conn = sqlite3.connect(DB_NAME)
-    df = pd.read_sql_query("SELECT * FROM narratives", conn)
+    with read_connection(DB_NAME) as conn:
+        df = pd.read_sql_query("SELECT * FROM narratives", conn)
     result_text.insert("end", f"
 📊 Gelesene Datensätze: {len(df)}
 ")
@@ -47,7 +49,6 @@ def launch_dashboard(result_text, root):
 ")
     result_text.insert("end", f"🧪 NaN-Zeilen: {df.isnull().sum().to_dict()}
 ")
-    conn.close()
 
     if df.empty or 'date' not in df or df['date'].isnull().all():
         result_text.insert("end", "Keine Daten für Dashboard verfügbar.
@@ -61,7 +62,8 @@ def launch_dashboard(result_text, root):
         return
 
     try:
-        time_series = df.groupby([pd.Grouper(key='date', freq='D'), 'keywords']).size().unstack(fill_value=0)
+        with read_connection(DB_NAME) as conn:
+            time_series = keyword_time_series(conn)
         fig1 = px.line(time_series, title="Keyword Frequency Over Time")
     except Exception as e:
         result_text.insert("end", f"Fehler beim Plotten: {e}
@@ -81,11 +83,8 @@ def launch_dashboard(result_text, root):
         Input("interval-component", "n_intervals")
     )
     def update_fig(n):
-        conn = sqlite3.connect(DB_NAME)
-        df = pd.read_sql_query("SELECT * FROM narratives", conn)
-        conn.close()
-        df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce')
-        time_series = df.groupby([pd.Grouper(key='date', freq='D'), 'keywords']).size().unstack(fill_value=0)
+        # Reads the daily rollup table once per data change, shared by all viewers
+        time_series = cached_read("keyword_time_series", keyword_time_series)
         return px.line(time_series, title="Keyword Frequency Over Time")
 
     @dash_app.callback(
@@ -94,9 +93,8 @@ def launch_dashboard(result_text, root):
         prevent_initial_call=True
     )
     def generate_pdf(n):
-        conn = sqlite3.connect(DB_NAME)
-        df = pd.read_sql_query("SELECT * FROM narratives", conn)
-        conn.close()
+        with read_connection(DB_NAME) as conn:
+            df = pd.read_sql_query("SELECT * FROM narratives", conn)
         df['date'] = pd.to_datetime(df['date'], utc=True, errors='coerce')
         try:
             from bertopic import BERTopic